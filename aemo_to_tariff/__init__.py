@@ -1,3 +1,33 @@
 # aemo_to_tariff/__init__.py
 
-from .convert import spot_to_tariff, get_daily_fee, calculate_demand_fee, get_periods  # noqa: F401
+from .convert import (  # noqa: F401
+    spot_to_tariff, spot_to_tariff_many, spot_to_tariff_import_export, tariff_to_spot_threshold,
+    get_daily_fee, calculate_demand_fee, get_periods,
+)
+from .registry import get_network, register_network, network_names  # noqa: F401
+
+# Exports that need numpy are imported on first use, so pricing a single interval stays light
+_LAZY_EXPORTS = {
+    'get_converter': 'aemo_to_tariff.converter',
+    'TariffConverter': 'aemo_to_tariff.converter',
+    'next_transition': 'aemo_to_tariff.schedule',
+    'day_profile': 'aemo_to_tariff.schedule',
+}
+
+__all__ = [
+    'spot_to_tariff', 'spot_to_tariff_many', 'spot_to_tariff_import_export', 'tariff_to_spot_threshold',
+    'get_daily_fee', 'calculate_demand_fee', 'get_periods',
+    'get_network', 'register_network', 'network_names',
+    *_LAZY_EXPORTS,
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
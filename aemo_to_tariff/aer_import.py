@@ -0,0 +1,230 @@
+# aemo_to_tariff/aer_import.py
+"""
+Compile the AER approved-price workbooks into a tariff store.
+
+Run with: python -m aemo_to_tariff.aer_import [workbook directory] [store file]
+
+Needs openpyxl (pip install aemo_to_tariff[aer]); reading the store doesn't.
+"""
+import glob
+import hashlib
+import os
+import re
+import sys
+from datetime import date
+
+from aemo_to_tariff.tariff_store import (
+    DEFAULT_STORE, FORMAT_VERSION, Source, Charge, StoredTariff, TariffStore, write_store,
+)
+
+# Bump when reading or normalising workbooks changes; stores written by another version
+# are re-read in full on import
+IMPORTER_VERSION = 1
+
+DEFAULT_WORKBOOKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'aer_approved_prices')
+
+# Workbook names as the AER writes them -> network names used in the store
+NETWORK_NAMES = {
+    'AusNet Services': 'ausnet',
+    'CitiPower': 'citipower',
+    'Energex': 'energex',
+    'Jemena': 'jemena',
+    'Powercor': 'powercor',
+    'United Energy': 'united',
+}
+
+# e.g. 'AER - Stakeholder report - CitiPower- 2024–25 Annual Pricing Proposal.xlsx'
+WORKBOOK_NAME = re.compile(r'Stakeholder report - (?P<network>.+?)\s*-\s*(?P<year>\d{4})\s*[–-]\s*\d{2}')
+PRICES_SCHEDULE = re.compile(r'Tariff schedule \d+ \| (?P<year>\d{4})\s*[–-]\s*\d{2} prices$')
+# The rows under this sub-heading hold the whole network price, not one component of it
+TOTAL_SECTION = 'Total network prices'
+
+FIRST_CHARGE_COLUMN = 8
+NAME_COLUMN, CLASS_COLUMN, CODE_COLUMN = 2, 3, 4
+
+# Normalised prices are rounded to this many decimal places, which drops the float
+# noise of the unit conversion (0.09648 $/kWh is 9.648 c/kWh, not 9.648000000000001)
+DECIMALS = 9
+
+
+def _charge(label, unit, value):
+    """Classify a workbook price and normalise it to $/day or c/kWh."""
+    unit = (unit or '').strip()
+    lowered = unit.lower()
+    scale = 0.01 if lowered.startswith('cents') else 1.0
+    if lowered.endswith('/kwh'):
+        return Charge(label, 'energy', 'c/kWh', round(value * scale * 100, DECIMALS))
+    if lowered.endswith('/day'):
+        return Charge(label, 'fixed', '$/day', round(value * scale, DECIMALS))
+    if lowered.endswith('/year') and '/kw' not in lowered and '/kva' not in lowered:
+        return Charge(label, 'fixed', '$/day', round(value * scale / 365, DECIMALS))
+    if '/kw' in lowered or '/kva' in lowered:
+        return Charge(label, 'demand', unit, round(value, DECIMALS))
+    return Charge(label, 'other', unit, value)
+
+def _schedule_heading(row):
+    """The heading of a row that starts a tariff schedule, or None."""
+    heading = row[1] if len(row) > 1 else None
+    return heading if isinstance(heading, str) and heading.startswith('Tariff schedule') else None
+
+def _prices_schedule(rows):
+    """
+    Skip the rows before the prices schedule.
+
+    Returns:
+    - tuple: (effective_from, labels row, units row), or Nones if the sheet has no prices schedule.
+    """
+    for row in rows:
+        heading = _schedule_heading(row)
+        schedule = PRICES_SCHEDULE.match(heading.strip()) if heading is not None else None
+        if schedule:
+            return date(int(schedule['year']), 7, 1), row, next(rows)
+    return None, None, None
+
+def _total_price_rows(rows):
+    """Yield the tariff rows under the total network prices sub-heading, up to the next schedule."""
+    in_total = False
+    for row in rows:
+        if _schedule_heading(row) is not None:
+            return  # Past the prices schedule
+        if len(row) <= CODE_COLUMN:
+            continue
+        name, code = row[NAME_COLUMN], row[CODE_COLUMN]
+        if isinstance(name, str) and code is None:
+            in_total = name.strip() == TOTAL_SECTION
+        elif in_total and isinstance(name, str):
+            yield row
+
+def _row_charges(row, labels, units):
+    """
+    Read the prices in one tariff's row.
+
+    Returns:
+    - tuple: (daily fee in $/day, tuple of Charge).
+    """
+    charges = []
+    daily_fee = 0.0
+    for column in range(FIRST_CHARGE_COLUMN, len(labels)):
+        value = row[column] if column < len(row) else None
+        if labels[column] is None or not isinstance(value, (int, float)) or value == 0:
+            continue
+        charge = _charge(str(labels[column]).strip(), units[column], float(value))
+        if column == FIRST_CHARGE_COLUMN and charge.kind == 'fixed':
+            daily_fee = charge.value
+        charges.append(charge)
+    return daily_fee, tuple(charges)
+
+def read_workbook(path, source_index: int = 0):
+    """
+    Read the total network prices from one AER stakeholder report workbook.
+
+    Parameters:
+    - path (str): The workbook.
+    - source_index (int): Stored with each tariff to say which source it came from.
+
+    Returns:
+    - list: StoredTariff tuples, effective from 1 July of the pricing year.
+    """
+    from openpyxl import load_workbook
+
+    match = WORKBOOK_NAME.search(os.path.basename(path))
+    if match is None:
+        raise ValueError(f"Not an AER stakeholder report: {path}")
+    network = NETWORK_NAMES.get(match['network'], match['network'].lower().replace(' ', '_'))
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook['Tariff schedule'].iter_rows(values_only=True)
+        effective_from, labels, units = _prices_schedule(rows)
+        tariffs = []
+        for row in _total_price_rows(rows):
+            daily_fee, charges = _row_charges(row, labels, units)
+            tariffs.append(StoredTariff(network, str(row[CODE_COLUMN]).strip(), row[NAME_COLUMN].strip(),
+                                        str(row[CLASS_COLUMN] or '').strip(), effective_from, daily_fee, charges,
+                                        source_index))
+        return tariffs
+    finally:
+        workbook.close()
+
+def _fingerprint(path, sha256=None):
+    stat = os.stat(path)
+    if sha256 is None:
+        with open(path, 'rb') as handle:
+            sha256 = hashlib.sha256(handle.read()).digest()
+    return Source(os.path.basename(path), stat.st_size, stat.st_mtime_ns, sha256)
+
+def _existing(store_path):
+    """The sources and tariffs of an existing store, grouped by source name."""
+    try:
+        store = TariffStore(store_path)
+    except (OSError, ValueError):
+        return {}
+    try:
+        if store.importer_version != IMPORTER_VERSION:
+            return {}
+        sources = store.sources()
+        grouped = {source.name: (source, []) for source in sources}
+        for tariff in store.tariffs():
+            grouped[sources[tariff.source].name][1].append(tariff)
+        return grouped
+    finally:
+        store.close()
+
+def import_workbooks(workbooks=DEFAULT_WORKBOOKS, store_path=DEFAULT_STORE):
+    """
+    Compile AER workbooks into a tariff store, re-reading only workbooks that changed.
+
+    A store written by another IMPORTER_VERSION is rebuilt from every workbook.
+    Otherwise a workbook is unchanged if its size and modification time match the store's
+    record of it, or failing that its SHA-256. If every workbook's contents are
+    unchanged and the set of workbooks is the same, the store isn't rewritten, so a
+    fresh checkout (where every workbook has a new modification time) leaves it alone.
+
+    Parameters:
+    - workbooks: A directory of .xlsx files or a list of workbook paths.
+    - store_path (str): The store to write.
+
+    Returns:
+    - list: The names of the workbooks that were (re)read; empty if nothing changed.
+    """
+    if isinstance(workbooks, str) and os.path.isdir(workbooks):
+        workbooks = glob.glob(os.path.join(workbooks, '*.xlsx'))
+    workbooks = sorted(path for path in workbooks if not os.path.basename(path).startswith('~$'))
+
+    existing = _existing(store_path)
+    sources = []
+    tariffs = []
+    read = []
+    for path in workbooks:
+        index = len(sources)
+        stat = os.stat(path)
+        previous = existing.get(os.path.basename(path))
+        if previous is not None and (previous[0].size, previous[0].mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            source, stored = previous
+        else:
+            source = _fingerprint(path)
+            if previous is not None and previous[0].sha256 == source.sha256:
+                stored = previous[1]
+            else:
+                stored = read_workbook(path, index)
+                read.append(source.name)
+        sources.append(source)
+        tariffs.extend(tariff._replace(source=index) for tariff in stored)
+
+    unchanged = set(existing) == {source.name for source in sources} and all(
+        existing[source.name][0].sha256 == source.sha256 for source in sources)
+    if not unchanged:
+        write_store(store_path, sources, tariffs, IMPORTER_VERSION)
+    return read
+
+
+def main(argv):
+    workbooks = argv[1] if len(argv) > 1 else DEFAULT_WORKBOOKS
+    store_path = argv[2] if len(argv) > 2 else DEFAULT_STORE
+    read = import_workbooks(workbooks, store_path)
+    print(f"Read {len(read)} workbook(s) into {store_path} (format {FORMAT_VERSION})" if read
+          else f"{store_path} is up to date")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
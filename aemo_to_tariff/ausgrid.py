@@ -2,6 +2,8 @@
 from datetime import time, datetime
 from zoneinfo import ZoneInfo
 
+from aemo_to_tariff.periods import in_period
+
 def time_zone():
     return 'Australia/Sydney'
 
@@ -49,6 +51,19 @@ def get_periods(tariff_code: str):
 
     return tariff['periods']
 
+def get_rules(tariff_code: str):
+    """
+    Describe how convert() resolves a tariff, for the vectorized converters.
+
+    Parameters:
+    - tariff_code (str): The tariff code.
+
+    Returns:
+    - dict: See energex.get_rules.
+    """
+    tariff = tariffs[tariff_code]
+    return {'variants': [(None, None, tariff['periods'])], 'wrap': True, 'fallback': (1.037869032618134, 5.586606750833143)}
+
 def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     """
     Convert RRP from $/MWh to c/kWh for Ausgrid.
@@ -68,7 +83,7 @@ def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
 
     # Find the applicable period and rate
     for period, start, end, rate in tariff['periods']:
-        if start <= interval_time < end or (start > end and (interval_time >= start or interval_time < end)):
+        if in_period(interval_time, start, end):
             total_price = rrp_c_kwh + rate
             return total_price
 
@@ -0,0 +1,116 @@
+# aemo_to_tariff/batch.py
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from aemo_to_tariff.calendars import day_calendar, state_of
+from aemo_to_tariff.slots import compile_tariff, slot_of_day
+from aemo_to_tariff.timezones import parse_iso, transition_index, MICROS_PER_SECOND, MICROS_PER_DAY
+from aemo_to_tariff.versions import version_index
+
+MICROSECOND = timedelta(microseconds=1)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_utc_micros(times):
+    """
+    Convert interval times to microseconds since the Unix epoch.
+
+    Parameters:
+    - times: Any of
+      - a sequence of datetimes (naive ones are local time, as datetime.astimezone() has it),
+      - a numpy datetime64 array, taken to be UTC,
+      - epoch seconds as integers or floats,
+      - ISO 8601 strings, see timezones.parse_iso.
+
+    Returns:
+    - numpy.ndarray: int64 microseconds since 1970-01-01 UTC.
+    """
+    if not isinstance(times, np.ndarray):
+        times = list(times)
+        if times and not isinstance(times[0], datetime):
+            times = np.asarray(times)
+
+    if isinstance(times, np.ndarray) and times.dtype != object:
+        kind = times.dtype.kind
+        if kind == 'M':
+            return times.astype('datetime64[us]').astype(np.int64)
+        if kind in 'iu':
+            return times.astype(np.int64) * MICROS_PER_SECOND
+        if kind == 'f':
+            return np.round(times * MICROS_PER_SECOND).astype(np.int64)
+        if kind in 'US':
+            return parse_iso(times)
+        raise TypeError(f"Unsupported interval time type: {times.dtype}")
+
+    micros = []
+    for interval_datetime in times:
+        if interval_datetime.tzinfo is None:
+            interval_datetime = interval_datetime.astimezone()
+        micros.append((interval_datetime - _EPOCH) // MICROSECOND)
+    return np.array(micros, dtype=np.int64)
+
+def calendar_slots(utc_micros, time_zone: str):
+    """
+    Get the day code and slot of the day that select a compiled tariff's rate.
+
+    Both come from the local date and time: the day code (see calendars.DAY_CODES) is
+    one index into the precomputed calendar of the time zone's state, so public
+    holidays cost nothing extra.
+
+    Parameters:
+    - utc_micros (numpy.ndarray): int64 microseconds since the Unix epoch.
+    - time_zone (str): The network's time zone.
+
+    Returns:
+    - tuple: (day codes, slots) as numpy arrays.
+    """
+    local = utc_micros + transition_index(time_zone).offsets_at(utc_micros)
+    days = local // MICROS_PER_DAY
+    day_codes = day_calendar(state_of(time_zone)).day_codes(days)
+    return day_codes, slot_of_day(local - days * MICROS_PER_DAY)
+
+def tariff_rates(compiled, utc_micros, export=False):
+    """
+    Look up a compiled tariff's slope and intercept for each instant, see calendar_slots().
+
+    Parameters:
+    - compiled (CompiledTariff): The compiled tariff.
+    - utc_micros (numpy.ndarray): int64 microseconds since the Unix epoch.
+    - export (bool): Also look up the export slope and intercept, from the same slots.
+
+    Returns:
+    - tuple: (slope, intercept) numpy arrays, followed by (export_slope, export_intercept) if export.
+    """
+    if export:
+        return compiled.lookup_import_export(*calendar_slots(utc_micros, compiled.time_zone))
+    return compiled.lookup(*calendar_slots(utc_micros, compiled.time_zone))
+
+def versioned_rates(network: str, tariff_code: str, utc_micros, export=False, block=None):
+    """
+    Like tariff_rates(), but price each instant with the tariff version in effect then.
+
+    The instants are split at version boundaries and each segment is looked up in
+    that version's compiled tables.
+
+    Parameters:
+    - network (str): The name of the network.
+    - tariff_code (str): The tariff code.
+    - utc_micros (numpy.ndarray): int64 microseconds since the Unix epoch.
+    - export (bool): Also look up the export slope and intercept, from the same slots.
+    - block: The consumption block's rates to look up, see blocks.block_prices().
+
+    Returns:
+    - tuple: (slope, intercept) numpy arrays, followed by (export_slope, export_intercept) if export.
+    """
+    segments = version_index(network).segments(utc_micros)
+    if len(segments) == 1:
+        return tariff_rates(compile_tariff(segments[0][0], tariff_code, block), utc_micros[segments[0][1]], export)
+
+    rates = tuple(np.empty(len(utc_micros)) for _ in range(4 if export else 2))
+    for module, selection in segments:
+        compiled = compile_tariff(module, tariff_code, block)
+        for rate, part in zip(rates, tariff_rates(compiled, utc_micros[selection], export)):
+            rate[selection] = part
+    return rates
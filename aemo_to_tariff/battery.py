@@ -0,0 +1,187 @@
+# aemo_to_tariff/battery.py
+from collections import namedtuple
+
+import numpy as np
+
+from aemo_to_tariff.batch import to_utc_micros
+from aemo_to_tariff.cheapest import delivered_prices
+from aemo_to_tariff.convert import _demand_fee_in_dollars
+from aemo_to_tariff.demand import get_demand_windows, _window_mask
+from aemo_to_tariff.registry import get_network
+from aemo_to_tariff.timezones import transition_index, MICROS_PER_SECOND
+
+# Per site and interval (kWh): energy drawn from the grid to charge, energy the battery
+# delivers when discharging, and the site's net grid import (negative for export).
+# soc is the stored energy at the start of each interval plus the end, in kWh; cost is
+# each site's energy and demand-penalty cost over the horizon, in dollars.
+Dispatch = namedtuple('Dispatch', ['soc', 'charge', 'discharge', 'grid', 'cost'])
+
+DEFAULT_LEVELS = 41
+
+
+def _per_site(value, sites):
+    return np.broadcast_to(np.asarray(value, dtype=float), (sites,))
+
+def demand_penalties(network, tariff, times):
+    """
+    Dollars per kW for raising billed demand in each interval, from the tariff's demand windows.
+
+    Billed demand is the peak over the billing period, so a kW above the peak so far inside
+    a demand window is charged a month's worth of the demand fee, as calculate_demand_fee()
+    prices it, once.
+
+    Returns:
+    - numpy.ndarray: $/kW per interval; zero outside the windows.
+    """
+    windows = get_demand_windows(network, tariff)
+    utc_micros = to_utc_micros(times)
+    penalty = np.zeros(len(utc_micros))
+    if not windows:
+        return penalty
+
+    local_micros = utc_micros + transition_index(get_network(network).time_zone()).offsets_at(utc_micros)
+    zero = dict.fromkeys(['demand_kw', *windows], 0.0)
+    base = _demand_fee_in_dollars(network, tariff, **zero)
+    for argument, window in windows.items():
+        rate = _demand_fee_in_dollars(network, tariff, **dict(zero, **{argument: 1.0})) - base
+        penalty += np.where(_window_mask(window, local_micros), rate, 0.0)
+    return penalty
+
+def _rise_levels(grid, hours, peak_kw, rise_kw, peaks):
+    """Peak levels (steps of rise_kw above peak_kw) an import of grid kWh reaches, rounded up."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rise = np.ceil((grid / hours - peak_kw) / rise_kw - 1e-9)
+    return np.clip(np.nan_to_num(rise, posinf=0.0, neginf=0.0), 0, peaks - 1).astype(np.intp)
+
+def optimise_battery(times, network, tariff, rrps, capacity_kwh, power_kw, efficiency=0.9, load_kwh=None,
+                     export_price=None, initial_soc=0.0, final_soc=None, levels=DEFAULT_LEVELS,
+                     dlf=1.05905, mlf=1.0154, market=1.0154):
+    """
+    Schedule batteries against their delivered (network tariff) price by dynamic programming.
+
+    Stored energy is split into levels; working back from the end of the horizon, each
+    interval keeps the cheapest move from every level to every level within the power
+    limit, for every site at once. Imports cost the delivered price from
+    spot_to_tariff_many(), exports earn export_price, and inside demand windows raising
+    the peak import costs the demand penalty for each kW it rises by, so the battery is
+    never scheduled to raise billed demand unless it pays for itself. The peak starts at
+    the site's own load peak in the windows and is tracked as part of the state, in steps
+    of one charging level's kW; a tariff with several windows shares one peak between them.
+
+    Parameters:
+    - times: Interval start times shared by every site, evenly spaced.
+    - network (str): The name of the network.
+    - tariff (str): The tariff code.
+    - rrps (array-like): Forecast spot prices in $/MWh, shape (intervals,) or (sites, intervals).
+    - capacity_kwh, power_kw (float or array-like): Usable capacity and inverter power, per site or for all.
+    - efficiency (float): Round-trip efficiency, split evenly between charging and discharging.
+    - load_kwh (array-like): The sites' own consumption per interval; none if None.
+    - export_price (float or array-like): c/kWh paid for exports; nothing if None.
+    - initial_soc (float): Stored energy at the start, as a fraction of capacity.
+    - final_soc (float): Least stored energy at the end, as a fraction of capacity; any if None.
+    - levels (int): How many stored-energy levels to consider.
+    - dlf, mlf, market (float): Loss and market factors.
+
+    Returns:
+    - Dispatch: The schedule, with a leading sites axis unless rrps was one-dimensional.
+    """
+    rrps = np.asarray(rrps, dtype=float)
+    single = rrps.ndim == 1
+    rrps = np.atleast_2d(rrps)
+    sites, intervals = rrps.shape
+    utc_micros = to_utc_micros(times)
+    steps = np.diff(utc_micros)
+    hours = float(steps[0]) / (3600 * MICROS_PER_SECOND) if len(steps) else 5 / 60
+
+    price = delivered_prices(utc_micros.astype('datetime64[us]'), network, tariff, rrps, dlf, mlf, market) / 100
+    export = np.zeros((sites, intervals)) if export_price is None else np.broadcast_to(
+        np.asarray(export_price, dtype=float) / 100, (sites, intervals))
+    load = np.zeros((sites, intervals)) if load_kwh is None else np.broadcast_to(
+        np.asarray(load_kwh, dtype=float), (sites, intervals))
+    penalty = demand_penalties(network, tariff, utc_micros.astype('datetime64[us]'))
+    in_window = penalty > 0
+    # Import the site would draw anyway; the battery only pays for demand above it
+    baseline_kw = np.where(in_window, load, -np.inf).max(axis=1, initial=0.0) / hours
+
+    capacity = _per_site(capacity_kwh, sites)
+    power = _per_site(power_kw, sites)
+    one_way = np.sqrt(efficiency)
+    step = capacity / (levels - 1)
+    # Furthest a site can move up (charging) or down (discharging) in one interval, in levels
+    with np.errstate(divide='ignore', invalid='ignore'):
+        up = np.floor(np.where(step > 0, power * hours * one_way / step, 0) + 1e-9).astype(int)
+        down = np.floor(np.where(step > 0, power * hours / one_way / step, 0) + 1e-9).astype(int)
+    up, down = np.minimum(up, levels - 1), np.minimum(down, levels - 1)
+    moves = np.arange(-int(down.max(initial=0)), int(up.max(initial=0)) + 1)
+
+    # Grid-side kWh for each move: charging draws stored / efficiency, discharging delivers stored * efficiency
+    stored = moves[None, :] * step[:, None]
+    battery = np.where(stored > 0, stored / one_way, stored * one_way)
+    allowed = (moves[None, :] <= up[:, None]) & (moves[None, :] >= -down[:, None])
+
+    # Peak levels: how far the peak in the windows has been raised above the baseline, in
+    # steps of the kW one level of charging draws. Within the windows the load is at most
+    # the baseline, so the battery can raise the peak by at most up levels.
+    rise_kw = step / one_way / hours
+    peaks = int(up.max(initial=0)) + 1 if in_window.any() else 1
+    peak_index = np.arange(peaks)
+
+    value = np.zeros((sites, peaks, levels))
+    if final_soc is not None:
+        least = np.ceil(final_soc * (levels - 1) - 1e-9)
+        value[:, :, np.arange(levels) < least] = np.inf
+    # The move chosen at every (interval, site, peak, level), the bulk of the memory used
+    index_type = np.int8 if len(moves) <= np.iinfo(np.int8).max else np.int16
+    policy = np.empty((intervals, sites, peaks, levels), dtype=index_type)
+    rows = np.arange(sites)
+    for t in range(intervals - 1, -1, -1):
+        grid = load[:, t, None] + battery                                           # (sites, moves)
+        cost = np.where(grid > 0, grid * price[:, t, None], grid * export[:, t, None])
+        cost = np.where(allowed, cost, np.inf)
+        if in_window[t]:
+            reached = _rise_levels(grid, hours, baseline_kw[:, None], rise_kw[:, None], peaks)
+
+        best = np.full((sites, peaks, levels), np.inf)
+        choice = np.zeros((sites, peaks, levels), dtype=index_type)
+        for m, move in enumerate(moves.tolist()):
+            # Levels this move starts from, and the levels it lands on
+            source = slice(max(-move, 0), levels - max(move, 0))
+            after = value[:, :, max(move, 0):levels + min(move, 0)]                # (sites, peaks, valid)
+            if in_window[t]:
+                # From peaks below the level this move reaches, the peak rises to it at a cost
+                to = reached[:, m]
+                rise = penalty[t] * rise_kw[:, None] * (to[:, None] - peak_index)    # (sites, peaks)
+                after = np.where((peak_index >= to[:, None])[:, :, None], after,
+                                 after[rows, to][:, None, :] + rise[:, :, None])
+            candidate = cost[:, m, None, None] + after
+            better = candidate < best[:, :, source]
+            best[:, :, source] = np.where(better, candidate, best[:, :, source])
+            choice[:, :, source][better] = m
+        value = best
+        policy[t] = choice
+
+    start = np.clip(np.round(np.asarray(initial_soc, dtype=float) * (levels - 1)), 0, levels - 1).astype(int)
+    level = np.broadcast_to(start, (sites,)).copy()
+    peak = np.zeros(sites, dtype=np.intp)
+    soc = np.empty((sites, intervals + 1))
+    grid = np.empty((sites, intervals))
+    flow = np.empty((sites, intervals))
+    soc[:, 0] = level * step
+    for t in range(intervals):
+        m = policy[t, rows, peak, level]
+        flow[:, t] = battery[rows, m]
+        level = level + moves[m]
+        soc[:, t + 1] = level * step
+        grid[:, t] = load[:, t] + flow[:, t]
+        if in_window[t]:
+            peak = np.maximum(peak, _rise_levels(grid[:, t], hours, baseline_kw, rise_kw, peaks))
+
+    cost = (np.where(grid > 0, grid * price, grid * export)).sum(axis=1)
+    # Each rise of the peak in the windows is charged once, at the penalty of its interval
+    window_kw = np.where(in_window, grid / hours, -np.inf)
+    peak_kw = np.maximum.accumulate(np.concatenate((baseline_kw[:, None], window_kw), axis=1), axis=1)
+    cost += (penalty[None, :] * np.maximum(window_kw - peak_kw[:, :-1], 0.0)).sum(axis=1)
+    dispatch = Dispatch(soc, np.maximum(flow, 0.0), np.maximum(-flow, 0.0), grid, cost)
+    if single:
+        return Dispatch(*(field[0] for field in dispatch))
+    return dispatch
@@ -0,0 +1,142 @@
+# aemo_to_tariff/billing.py
+from collections import namedtuple
+
+import numpy as np
+
+from aemo_to_tariff.batch import to_utc_micros, versioned_rates
+from aemo_to_tariff.blocks import block_prices, get_block_thresholds
+from aemo_to_tariff.convert import _daily_fee_in_dollars
+from aemo_to_tariff.demand import calculate_demand
+from aemo_to_tariff.nem12 import read_series, NEM_TIME_OFFSET_MINUTES
+from aemo_to_tariff.registry import get_network
+from aemo_to_tariff.timezones import transition_index, MICROS_PER_DAY, MICROS_PER_SECOND
+from aemo_to_tariff.versions import version_index
+
+MICROS_PER_HOUR = 3_600_000_000
+MICROS_PER_MINUTE = 60 * MICROS_PER_SECOND
+
+# A network bill in dollars. demand_kw is the largest monthly billed demand.
+Bill = namedtuple('Bill', ['days', 'kwh', 'energy', 'daily', 'demand', 'demand_kw', 'total'])
+
+
+def _local_days(utc_micros, time_zone):
+    return (utc_micros + transition_index(time_zone).offsets_at(utc_micros)) // MICROS_PER_DAY
+
+def _interval_hours(utc_micros, interval_minutes):
+    if interval_minutes is not None:
+        return interval_minutes / 60
+    steps = np.diff(np.unique(utc_micros))
+    return steps.min() / MICROS_PER_HOUR if len(steps) else 0.5
+
+def version_days(network, utc_micros, utc_offset_minutes=None):
+    """
+    Count the days of data under each tariff version.
+
+    Days are local days in the network's time zone, or the meter's days if
+    utc_offset_minutes is given. NEM12 interval dates are in market time (UTC+10),
+    so counted in Adelaide, or anywhere during daylight saving, each meter day
+    would touch two local dates.
+
+    Parameters:
+    - network (str): The name of the network.
+    - utc_micros (numpy.ndarray): int64 microseconds since the Unix epoch.
+    - utc_offset_minutes (int): The fixed offset from UTC of the meter's days, or None.
+
+    Returns:
+    - list: (epoch seconds of the first instant, days) for each version with data.
+    """
+    time_zone = get_network(network).time_zone()
+    counts = []
+    for _, selection in version_index(network).segments(utc_micros):
+        segment = utc_micros[selection]
+        if not len(segment):
+            continue
+        if utc_offset_minutes is None:
+            days = _local_days(segment, time_zone)
+        else:
+            days = (segment + utc_offset_minutes * MICROS_PER_MINUTE) // MICROS_PER_DAY
+        counts.append((int(segment.min()) / MICROS_PER_SECOND, len(np.unique(days))))
+    return counts
+
+def calculate_bill(network, tariff, times, kwh, rrps=None,
+                   dlf=1.05905, mlf=1.0154, market=1.0154, annual_usage=None, interval_minutes=None,
+                   utc_offset_minutes=None):
+    """
+    Calculate the network bill for a load series.
+
+    Energy charges come from the compiled tariff tables (blocks.block_prices() with
+    monthly billing periods for inclining block tariffs), daily fees from get_daily_fee()
+    and demand charges from demand.calculate_demand(), each from the tariff version in
+    effect at the time, in dollars.
+
+    Parameters:
+    - network (str): The name of the network (e.g., 'Energex', 'Ausgrid', 'Evoenergy').
+    - tariff (str): The tariff code.
+    - times: Interval start times, see batch.to_utc_micros().
+    - kwh (array-like): Energy used in each interval in kWh.
+    - rrps (array-like): Spot prices in $/MWh to pass through, or None for network charges only.
+    - dlf (float): The Distribution Loss Factor.
+    - mlf (float): The Metering Loss Factor.
+    - market (float): The market factor.
+    - annual_usage (float): Annual usage in kWh for banded daily fees; estimated from kwh if None.
+    - interval_minutes (int): Interval length; inferred from the times if None.
+    - utc_offset_minutes (int): The offset from UTC of the meter's days (e.g. NEM12 interval
+      dates), to count days for daily fees; local days in the network's time zone if None.
+
+    Returns:
+    - Bill: The bill in dollars.
+    """
+    utc_micros = to_utc_micros(times)
+    kwh = np.asarray(kwh, dtype=float)
+
+    if get_block_thresholds(network, tariff):
+        # Inclining block tariffs switch rates as usage builds up over each month
+        price = block_prices(network, tariff, utc_micros.astype('datetime64[us]'), kwh, rrps, dlf, mlf, market).prices
+    else:
+        slope, intercept = versioned_rates(network, tariff, utc_micros)
+        if rrps is None:
+            price = intercept
+        else:
+            price = np.asarray(rrps, dtype=float) * dlf * mlf * market / 10 * slope + intercept
+    energy = float(kwh @ price) / 100
+
+    segments = version_days(network, utc_micros, utc_offset_minutes)
+    days = sum(segment_days for _, segment_days in segments)
+    total_kwh = float(kwh.sum())
+    if annual_usage is None and days:
+        annual_usage = total_kwh * 365 / days
+    daily = sum((_daily_fee_in_dollars(network, tariff, annual_usage, when=when) or 0.0) * segment_days
+                for when, segment_days in segments)
+
+    demand = 0.0
+    demand_kw = 0.0
+    if len(kwh):
+        monthly = calculate_demand(network, tariff, utc_micros.astype('datetime64[us]'), kwh / _interval_hours(utc_micros, interval_minutes),
+                                   interval_minutes)
+        demand = float(monthly.fee.sum())
+        if 'demand_kw' in monthly.demand:
+            demand_kw = float(monthly.demand['demand_kw'].max())
+
+    return Bill(days, total_kwh, energy, daily, demand, demand_kw, energy + daily + demand)
+
+def bill_nem12(source, network, tariff, rrps=None, suffixes='E', utc_offset_minutes: int = NEM_TIME_OFFSET_MINUTES, **kwargs):
+    """
+    Calculate network bills for every NMI in a NEM12 file, one NMI at a time.
+
+    Parameters:
+    - source: A path or binary file object for a NEM12 file, or a zip of them.
+    - network (str): The name of the network.
+    - tariff (str): The tariff code.
+    - rrps (callable): Optional function taking the series start times and returning $/MWh prices.
+    - suffixes (str or tuple): NMI suffix prefixes to bill, 'E' (consumption) by default.
+    - utc_offset_minutes (int): The offset of the file's interval dates from UTC.
+    - kwargs: Passed on to calculate_bill().
+
+    Yields:
+    - tuple: (nmi, suffix, Bill)
+    """
+    for series in read_series(source, suffixes, utc_offset_minutes):
+        prices = None if rrps is None else rrps(series.start)
+        bill = calculate_bill(network, tariff, series.start, series.kwh, prices,
+                              interval_minutes=series.interval_length, utc_offset_minutes=utc_offset_minutes, **kwargs)
+        yield series.nmi, series.suffix, bill
@@ -0,0 +1,166 @@
+# aemo_to_tariff/blocks.py
+from collections import namedtuple
+
+import numpy as np
+
+from aemo_to_tariff.batch import to_utc_micros, versioned_rates
+from aemo_to_tariff.registry import get_network
+from aemo_to_tariff.rules import blocks, declare
+from aemo_to_tariff.timezones import transition_index, MICROS_PER_DAY, MICROS_PER_SECOND
+from aemo_to_tariff.versions import network_at
+
+# Inclining block prices for one or many load series. prices are c/kWh per interval,
+# block is the (0-based) block each interval's usage starts in, periods are the local
+# start dates of the billing periods with data (datetime64[D]), days counts the days
+# with data in each, and block_kwh is the kWh billed in each block. prices and block
+# are (sites, intervals) and block_kwh (sites, periods, blocks), without the sites axis
+# for a single series.
+BlockPrices = namedtuple('BlockPrices', ['prices', 'block', 'periods', 'days', 'block_kwh'])
+
+
+def get_block_thresholds(network, tariff, when=None):
+    """
+    Get the thresholds between a tariff's consumption blocks.
+
+    Parameters:
+    - network (str): The name of the network.
+    - tariff (str): The tariff code.
+    - when: The tariff version to use, see versions.network_at(); the current one if None.
+
+    Returns:
+    - tuple: kWh per day of the billing period at which each block after the first
+      starts; empty for tariffs without blocks.
+    """
+    module = network_at(network, when)
+    return tuple(getattr(module, 'block_thresholds', {}).get(tariff, ()))
+
+def _period_starts(local_days, billing_period):
+    """Local day numbers starting each billing period that could hold the days."""
+    if isinstance(billing_period, str):
+        months = np.unique(local_days.astype('datetime64[D]').astype('datetime64[M]'))
+        if billing_period == 'quarter':
+            months = np.unique(months - months.astype(np.int64) % 3)
+        elif billing_period != 'month':
+            raise ValueError(f"Unknown billing period: {billing_period}")
+        return months.astype('datetime64[D]').astype(np.int64)
+
+    # Meter read dates; anything before the first read is billed with the first period
+    starts = np.unique(np.asarray(billing_period, dtype='datetime64[D]').astype(np.int64))
+    if len(local_days) and (not len(starts) or local_days.min() < starts[0]):
+        starts = np.concatenate(([local_days.min()], starts))
+    return starts
+
+def block_prices(network, tariff, times, kwh, rrps=None, dlf=1.05905, mlf=1.0154, market=1.0154,
+                 billing_period='month'):
+    """
+    Price load series on an inclining block tariff.
+
+    Usage is accumulated over each billing period: intervals are billed at the first
+    block's rates until the period's usage passes the first threshold, then at the
+    second block's, and so on, with an interval that crosses a threshold split between
+    the blocks. The thresholds are kWh per day (see get_block_thresholds()) times the
+    days of data in the period, from the tariff version in effect at its start.
+
+    Every site and billing period is done at once: a running total (numpy.cumsum) of
+    the usage, restarted each period, is put into blocks with numpy.searchsorted().
+
+    Parameters:
+    - network (str): The name of the network (e.g., 'Endeavour').
+    - tariff (str): The tariff code.
+    - times: Interval start times shared by every site, see batch.to_utc_micros().
+    - kwh (array-like): Energy used in each interval in kWh, shape (intervals,) for one
+      site or (sites, intervals) for many. Usage must not be negative.
+    - rrps (array-like): Spot prices in $/MWh to pass through, or None for network charges only.
+    - dlf (float): The Distribution Loss Factor.
+    - mlf (float): The Metering Loss Factor.
+    - market (float): The market factor.
+    - billing_period: 'month' or 'quarter' (local calendar), or the local dates each
+      billing period starts on, e.g. meter read dates.
+
+    Returns:
+    - BlockPrices: The prices and the kWh billed in each block.
+    """
+    module = get_network(network)
+    utc_micros = to_utc_micros(times)
+    kwh = np.asarray(kwh, dtype=float)
+    single = kwh.ndim == 1
+    kwh = np.atleast_2d(kwh)
+    if len(utc_micros) and (np.diff(utc_micros) < 0).any():
+        raise ValueError("Interval times must be in order")
+    if (kwh < 0).any():
+        raise ValueError("Block tariffs price usage; kwh must not be negative")
+
+    # Each block's price per interval, from its own rules and those of every block
+    names = blocks(declare(module, tariff))
+    spot = None if rrps is None else np.asarray(rrps, dtype=float) * dlf * mlf * market / 10
+    block_rates = []
+    for name in names:
+        slope, intercept = versioned_rates(network, tariff, utc_micros, block=name)
+        block_rates.append(intercept if spot is None else spot * slope + intercept)
+    block_rates = np.stack(block_rates)
+
+    # Billing periods, and the days of data in each
+    local_days = (utc_micros + transition_index(module.time_zone()).offsets_at(utc_micros)) // MICROS_PER_DAY
+    starts = _period_starts(local_days, billing_period)
+    period_of = np.searchsorted(starts, local_days, side='right') - 1
+    used, period_of = np.unique(period_of, return_inverse=True)
+    period_of = period_of.reshape(-1)
+    starts = starts[used]
+    days = np.bincount(np.searchsorted(starts, np.unique(local_days), side='right') - 1, minlength=len(starts))
+
+    # Usage so far in the period after each interval, per day of the period
+    after = np.cumsum(kwh, axis=1)
+    firsts = np.flatnonzero(np.diff(period_of, prepend=-1))
+    carried = np.zeros((len(kwh), len(starts)))
+    carried[:, 1:] = after[:, firsts[1:] - 1]
+    after -= carried[:, period_of]
+    per_day = days[period_of].astype(float)
+    after_per_day = after / per_day
+    before_per_day = after_per_day - kwh / per_day
+
+    # Thresholds in kWh per day of each period, from the version at its start
+    period_from = (utc_micros[firsts] // MICROS_PER_SECOND).tolist()
+    thresholds = [get_block_thresholds(network, tariff, when) for when in period_from]
+    if any(len(limits) != len(names) - 1 for limits in thresholds):
+        raise ValueError(f"{network} {tariff} has {len(names)} block(s) but thresholds for a different number")
+
+    # The block each interval starts in, and whether it ends in a later one
+    if len(set(thresholds)) <= 1:
+        limits = thresholds[0] if thresholds else ()
+        block = np.searchsorted(limits, before_per_day, side='right')
+        crosses = np.searchsorted(limits, after_per_day, side='left') > block
+    else:
+        block = np.zeros(kwh.shape, dtype=np.intp)
+        crosses = np.zeros(kwh.shape, dtype=bool)
+        for limits in set(thresholds):
+            columns = np.array([found == limits for found in thresholds])[period_of]
+            block[:, columns] = np.searchsorted(limits, before_per_day[:, columns], side='right')
+            crosses[:, columns] = np.searchsorted(limits, after_per_day[:, columns], side='left') > block[:, columns]
+
+    intervals = np.arange(kwh.shape[1])
+    prices = block_rates[block, intervals]
+
+    # Intervals that cross a threshold pay each block's price for their share of the usage
+    sites, crossing = np.nonzero(crosses)
+    if len(crossing):
+        periods = period_of[crossing]
+        limits = np.array([thresholds[p] for p in periods.tolist()], dtype=float) * days[periods][:, None]
+        lower = np.concatenate((np.zeros((len(crossing), 1)), limits), axis=1)
+        upper = np.concatenate((limits, np.full((len(crossing), 1), np.inf)), axis=1)
+        used = after[sites, crossing]
+        before = (used - kwh[sites, crossing])[:, None]
+        share = np.clip(used[:, None], lower, upper) - np.clip(before, lower, upper)
+        cost = (share * block_rates[:, crossing].T).sum(axis=1)
+        prices[sites, crossing] = cost / kwh[sites, crossing]
+
+    # kWh billed in each block over each period
+    limits = np.array(thresholds, dtype=float).reshape(len(starts), len(names) - 1) * days[:, None]
+    lower = np.concatenate((np.zeros((len(starts), 1)), limits), axis=1)
+    upper = np.concatenate((limits, np.full((len(starts), 1), np.inf)), axis=1)
+    period_kwh = np.add.reduceat(kwh, firsts, axis=1) if len(firsts) else np.zeros((len(kwh), 0))
+    block_kwh = np.clip(period_kwh[:, :, None], lower, upper) - lower
+
+    periods = starts.astype('datetime64[D]')
+    if single:
+        return BlockPrices(prices[0], block[0], periods, days, block_kwh[0])
+    return BlockPrices(prices, block, periods, days, block_kwh)
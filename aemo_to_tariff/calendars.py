@@ -0,0 +1,219 @@
+# aemo_to_tariff/calendars.py
+from datetime import date, timedelta
+from functools import lru_cache
+
+# In a tariff variant's weekdays (see energex.get_rules), public holidays whatever day
+# of the week they fall on
+HOLIDAY = 7
+
+# Years the precomputed day codes cover; days outside them get no public holidays
+FIRST_YEAR = 2000
+LAST_YEAR = 2060
+
+# A day's code is ((month - 1) * 7 + weekday) * 2 + holiday, so a compiled tariff's
+# day_types[month - 1, weekday, holiday] is day_types.ravel()[code]
+DAY_CODES = 12 * 7 * 2
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# States by network time zone
+TIME_ZONE_STATES = {
+    'Australia/Brisbane': 'QLD',
+    'Australia/Sydney': 'NSW',
+    'Australia/ACT': 'ACT',
+    'Australia/Canberra': 'ACT',
+    'Australia/Adelaide': 'SA',
+    'Australia/Hobart': 'TAS',
+    'Australia/Melbourne': 'VIC',
+}
+
+MONDAY, TUESDAY, FRIDAY, SATURDAY, SUNDAY = 0, 1, 4, 5, 6
+
+_extra_holidays = {}
+
+
+def _nth_weekday(year, month, weekday, n):
+    """The nth (1-based) weekday of a month."""
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+def _easter_sunday(year):
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    return date(year, month, (h + l - 7 * m + 114) % 31 + 1)
+
+def _with_substitutes(days, holidays):
+    """Add each day, and a substitute on the next free weekday if it falls on a weekend."""
+    for day in days:
+        holidays.add(day)
+    for day in days:
+        if day.weekday() >= SATURDAY:
+            substitute = day + timedelta(days=7 - day.weekday())
+            while substitute in holidays:
+                substitute += timedelta(days=1)
+            holidays.add(substitute)
+
+def public_holidays(state: str, year: int):
+    """
+    List a state's statewide public holidays in a year.
+
+    Regional holidays (show days, the Hobart Regatta) and one-off proclamations aren't
+    included; add them with register_holidays().
+
+    Parameters:
+    - state (str): 'QLD', 'NSW', 'ACT', 'VIC', 'SA' or 'TAS'.
+    - year (int): The year.
+
+    Returns:
+    - list: The holidays as dates, in order.
+    """
+    state = state.upper()
+    holidays = set()
+    easter = _easter_sunday(year)
+
+    _with_substitutes([date(year, 1, 1)], holidays)
+    _with_substitutes([date(year, 1, 26)], holidays)
+    holidays.update([easter - timedelta(days=2), easter + timedelta(days=1)])
+    if state != 'TAS':
+        holidays.add(easter - timedelta(days=1))
+    if state in ('NSW', 'ACT', 'VIC', 'QLD'):
+        holidays.add(easter)
+    holidays.add(date(year, 4, 25))
+
+    if state == 'QLD':
+        # The King's Birthday moved to October and Labour Day back to May in 2016
+        holidays.add(_nth_weekday(year, 10, MONDAY, 1) if year >= 2016 else _nth_weekday(year, 6, MONDAY, 2))
+        holidays.add(_nth_weekday(year, 10, MONDAY, 1) if 2013 <= year <= 2015 else _nth_weekday(year, 5, MONDAY, 1))
+    else:
+        holidays.add(_nth_weekday(year, 6, MONDAY, 2))
+    if state in ('NSW', 'ACT', 'SA'):
+        holidays.add(_nth_weekday(year, 10, MONDAY, 1))
+    if state in ('VIC', 'TAS'):
+        holidays.add(_nth_weekday(year, 3, MONDAY, 2))  # Labour Day / Eight Hours Day
+    if state == 'ACT':
+        holidays.add(_nth_weekday(year, 3, MONDAY, 2))  # Canberra Day
+        if year >= 2018:
+            holidays.add(date(year, 5, 27) + timedelta(days=(MONDAY - date(year, 5, 27).weekday()) % 7))
+    if state == 'SA':
+        holidays.add(_nth_weekday(year, 3, MONDAY, 2))  # Adelaide Cup
+    if state == 'VIC':
+        holidays.add(_nth_weekday(year, 11, TUESDAY, 1))  # Melbourne Cup
+
+    _with_substitutes([date(year, 12, 25), date(year, 12, 26)], holidays)
+    holidays.update(day for day in _extra_holidays.get(state, ()) if day.year == year)
+    return sorted(holidays)
+
+def register_holidays(state: str, days):
+    """
+    Add public holidays to a state's calendar, e.g. a one-off national day of mourning.
+
+    Parameters:
+    - state (str): The state.
+    - days (iterable): The dates.
+    """
+    state = state.upper()
+    _extra_holidays.setdefault(state, set()).update(days)
+    _holiday_set.cache_clear()
+    day_calendar.cache_clear()
+
+@lru_cache(maxsize=None)
+def _holiday_set(state):
+    return frozenset(day for year in range(FIRST_YEAR, LAST_YEAR + 1) for day in public_holidays(state, year))
+
+def state_of(time_zone: str):
+    """
+    Get the state whose public holidays apply in a network's time zone, or None.
+    """
+    return TIME_ZONE_STATES.get(time_zone)
+
+def is_public_holiday(state, day: date):
+    """
+    Check whether a local date is a public holiday, without numpy.
+
+    Parameters:
+    - state (str): The state, or None for no public holidays.
+    - day (date): The local date.
+
+    Returns:
+    - bool: True on a public holiday.
+    """
+    return state is not None and day in _holiday_set(state)
+
+def day_code(day: date, state=None):
+    """
+    Get the day code of a local date, see DAY_CODES.
+    """
+    return ((day.month - 1) * 7 + day.weekday()) * 2 + is_public_holiday(state, day)
+
+
+class DayCalendar:
+    """
+    A state's day codes precomputed for every day from FIRST_YEAR to LAST_YEAR.
+
+    codes[day - first_day] is the day code of a day counted from 1970-01-01, so the
+    day type of any number of intervals is an array index once their local day is known.
+    """
+    __slots__ = ('state', 'first_day', 'codes', 'code_list')
+
+    def __init__(self, state):
+        import numpy as np
+
+        self.state = state
+        self.first_day = date(FIRST_YEAR, 1, 1).toordinal() - EPOCH_ORDINAL
+        last_day = date(LAST_YEAR + 1, 1, 1).toordinal() - EPOCH_ORDINAL
+        days = np.arange(self.first_day, last_day, dtype=np.int64)
+        months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) % 12
+        weekdays = (days + 3) % 7  # 1970-01-01 was a Thursday
+        codes = (months * 7 + weekdays) * 2
+        if state is not None:
+            holidays = np.array(sorted(_holiday_set(state)), dtype='datetime64[D]').astype(np.int64)
+            codes[holidays - self.first_day] += 1
+        self.codes = codes.astype(np.int16)
+        self.codes.flags.writeable = False
+        # For the scalar converters, which index one day at a time
+        self.code_list = self.codes.tolist()
+
+    def day_codes(self, days):
+        """
+        Get the day codes of days counted from 1970-01-01 (local dates).
+
+        Parameters:
+        - days (numpy.ndarray): int64 day numbers.
+
+        Returns:
+        - numpy.ndarray: Day codes; days outside the covered years have no public holidays.
+        """
+        import numpy as np
+
+        index = days - self.first_day
+        inside = (index >= 0) & (index < len(self.codes))
+        if inside.all():
+            return self.codes[index]
+        months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) % 12
+        codes = (months * 7 + (days + 3) % 7) * 2
+        codes[inside] = self.codes[index[inside]]
+        return codes
+
+    def code_of(self, day_number: int):
+        """
+        Get the day code of one day counted from 1970-01-01, see day_codes().
+        """
+        index = day_number - self.first_day
+        if 0 <= index < len(self.code_list):
+            return self.code_list[index]
+        return day_code(date.fromordinal(EPOCH_ORDINAL + day_number))
+
+@lru_cache(maxsize=None)
+def day_calendar(state):
+    """
+    Get (building it on first use) a state's DayCalendar; None gives one without public holidays.
+    """
+    return DayCalendar(state)
@@ -0,0 +1,115 @@
+# aemo_to_tariff/cheapest.py
+from collections import namedtuple
+
+import numpy as np
+
+from aemo_to_tariff.batch import to_utc_micros, versioned_rates
+
+# Per site: the chosen interval indices in time order and their prices (c/kWh). Sites
+# with fewer allowed intervals than asked for get index -1 and price inf for the rest.
+CheapestIntervals = namedtuple('CheapestIntervals', ['indices', 'prices'])
+# Per site: the first interval of the cheapest window and its average price (c/kWh);
+# -1 and inf where no window of allowed intervals fits.
+CheapestWindow = namedtuple('CheapestWindow', ['start', 'average'])
+
+
+def delivered_prices(times, network, tariff, rrps, dlf=1.05905, mlf=1.0154, market=1.0154):
+    """
+    Convert forecast spot prices for one or many sites to c/kWh, as spot_to_tariff_many() does.
+
+    Parameters:
+    - times: Interval times shared by every site, see batch.to_utc_micros().
+    - network (str): The name of the network.
+    - tariff (str): The tariff code.
+    - rrps (array-like): Spot prices in $/MWh, shape (intervals,) or (sites, intervals).
+    - dlf, mlf, market (float): Loss and market factors.
+
+    Returns:
+    - numpy.ndarray: Prices in c/kWh, the shape of rrps.
+    """
+    slope, intercept = versioned_rates(network, tariff, to_utc_micros(times))
+    return np.asarray(rrps, dtype=float) * (dlf * mlf * market / 10) * slope + intercept
+
+def _masked(prices, allowed):
+    prices = np.asarray(prices, dtype=float)
+    single = prices.ndim == 1
+    prices = np.atleast_2d(prices)
+    if allowed is not None:
+        prices = np.where(np.broadcast_to(allowed, prices.shape), prices, np.inf)
+    return prices, single
+
+def cheapest_intervals(prices, count: int, allowed=None):
+    """
+    Pick the count cheapest intervals for each site, e.g. to charge an EV.
+
+    Uses a partial sort (numpy.argpartition), so each site costs O(intervals) rather
+    than a full sort.
+
+    Parameters:
+    - prices (array-like): Prices, shape (intervals,) or (sites, intervals).
+    - count (int): How many intervals to pick.
+    - allowed (array-like): Boolean mask broadcastable to prices; False intervals are never picked.
+
+    Returns:
+    - CheapestIntervals: indices and prices of shape (count,) or (sites, count).
+    """
+    prices, single = _masked(prices, allowed)
+    count = min(int(count), prices.shape[1])
+    if count <= 0:
+        indices = np.zeros((len(prices), 0), dtype=np.intp)
+    elif count == prices.shape[1]:
+        indices = np.broadcast_to(np.arange(count), prices.shape).copy()
+    else:
+        indices = np.argpartition(prices, count - 1, axis=1)[:, :count]
+    # Picks that had to fall on disallowed intervals go last, as -1
+    missing = np.isposinf(np.take_along_axis(prices, indices, axis=1))
+    indices = np.where(missing, prices.shape[1], indices)
+    indices.sort(axis=1)
+    missing = indices == prices.shape[1]
+    picked = np.where(missing, np.inf, np.take_along_axis(prices, np.minimum(indices, prices.shape[1] - 1), axis=1))
+    indices[missing] = -1
+    if single:
+        return CheapestIntervals(indices[0], picked[0])
+    return CheapestIntervals(indices, picked)
+
+def cheapest_window(prices, length: int, allowed=None):
+    """
+    Find the cheapest run of length consecutive intervals for each site, e.g. a hot-water boost.
+
+    Window sums come from a running total, so every window of every site is priced in
+    one O(intervals) pass.
+
+    Parameters:
+    - prices (array-like): Prices, shape (intervals,) or (sites, intervals).
+    - length (int): The window length in intervals (e.g. 24 for two hours of 5-minute intervals).
+    - allowed (array-like): Boolean mask broadcastable to prices; windows containing a
+      False interval are skipped.
+
+    Returns:
+    - CheapestWindow: start and average, scalars or (sites,) arrays.
+    """
+    prices, single = _masked(prices, allowed)
+    sites, intervals = prices.shape
+    length = int(length)
+    if length <= 0:
+        raise ValueError("length must be at least one interval")
+
+    if length > intervals:
+        start, average = np.full(sites, -1), np.full(sites, np.inf)
+    else:
+        blocked = np.isinf(prices)
+        # Running totals with blocked intervals zeroed, so inf doesn't poison later sums
+        total = np.zeros((sites, intervals + 1))
+        np.cumsum(np.where(blocked, 0.0, prices), axis=1, out=total[:, 1:])
+        blocks = np.zeros((sites, intervals + 1), dtype=np.int64)
+        np.cumsum(blocked, axis=1, out=blocks[:, 1:])
+
+        sums = total[:, length:] - total[:, :-length]
+        sums[(blocks[:, length:] - blocks[:, :-length]) > 0] = np.inf
+        start = np.argmin(sums, axis=1)
+        average = sums[np.arange(sites), start] / length
+        start = np.where(np.isinf(average), -1, start)
+
+    if single:
+        return CheapestWindow(int(start[0]), float(average[0]))
+    return CheapestWindow(start, average)
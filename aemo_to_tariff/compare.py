@@ -0,0 +1,203 @@
+# aemo_to_tariff/compare.py
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from aemo_to_tariff.batch import to_utc_micros, calendar_slots
+from aemo_to_tariff.billing import version_days
+from aemo_to_tariff.blocks import block_prices, get_block_thresholds
+from aemo_to_tariff.calendars import DAY_CODES
+from aemo_to_tariff.convert import _daily_fee_in_dollars
+from aemo_to_tariff.demand import calculate_demand, get_demand_windows
+from aemo_to_tariff.registry import get_network, accepts
+from aemo_to_tariff.shared_tables import use_shared_tables
+from aemo_to_tariff.slots import compile_tariff, SLOTS_PER_DAY
+from aemo_to_tariff.timezones import MICROS_PER_SECOND
+from aemo_to_tariff.versions import version_index
+
+# Every (day code, slot) a compiled tariff can tell apart
+CALENDAR_SLOTS = DAY_CODES * SLOTS_PER_DAY
+
+# Annual costs in dollars, (customers, tariffs) each. order[c] lists tariff indexes for
+# customer c from cheapest to dearest.
+TariffComparison = namedtuple('TariffComparison', ['tariffs', 'energy', 'daily', 'demand', 'total', 'order'])
+
+
+@lru_cache(maxsize=None)
+def rate_matrix(module, tariffs: tuple):
+    """
+    Build (once per process) the rates of many tariffs for every calendar slot.
+
+    Parameters:
+    - module: The network module, or one of its versions (see versions.network_at()).
+    - tariffs (tuple): Tariff codes, one per column.
+
+    Returns:
+    - tuple: (slope, intercept) numpy arrays of shape (CALENDAR_SLOTS, tariffs), indexed
+      by day code * SLOTS_PER_DAY + slot (see calendars.DAY_CODES).
+    """
+    keys = np.arange(CALENDAR_SLOTS)
+    day_codes = keys // SLOTS_PER_DAY
+    slots = keys % SLOTS_PER_DAY
+
+    slope = np.empty((CALENDAR_SLOTS, len(tariffs)))
+    intercept = np.empty((CALENDAR_SLOTS, len(tariffs)))
+    for column, tariff in enumerate(tariffs):
+        slope[:, column], intercept[:, column] = compile_tariff(module, tariff).lookup(day_codes, slots)
+    return slope, intercept
+
+def _slot_sums(utc_micros, time_zone, kwh, rrp_c_kwh):
+    """Total kWh (and kWh x c/kWh) per calendar slot for each customer."""
+    day_codes, slots = calendar_slots(utc_micros, time_zone)
+    keys = day_codes.astype(np.int64) * SLOTS_PER_DAY + slots
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    kwh = kwh[:, order]
+    usage = np.add.reduceat(kwh, starts, axis=1)
+    spot = None if rrp_c_kwh is None else np.add.reduceat(kwh * rrp_c_kwh[order], starts, axis=1)
+    return keys[starts], usage, spot
+
+def compare_tariffs(network, times, kwh, rrps=None, tariffs=None,
+                    dlf=1.05905, mlf=1.0154, market=1.0154, interval_minutes=None, utc_offset_minutes=None):
+    """
+    Cost every candidate tariff for one or many customers in one pass.
+
+    Usage is summed per (day code, slot) and multiplied by rate_matrix(), so the
+    cost of each extra tariff is a matrix column rather than another pass over the
+    intervals; intervals under different tariff versions are summed separately.
+    Inclining block tariffs are priced with blocks.block_prices() instead. Daily
+    fees use each customer's annualised usage; demand fees come from
+    demand.calculate_demand().
+
+    Parameters:
+    - network (str): The name of the network.
+    - times: Interval start times shared by every customer, see batch.to_utc_micros().
+    - kwh (array-like): Energy per interval in kWh, (intervals,) or (customers, intervals).
+    - rrps (array-like): Spot prices in $/MWh per interval, or None for network charges only.
+    - tariffs (iterable): Tariff codes to compare; every tariff of the network if None.
+    - dlf (float): The Distribution Loss Factor.
+    - mlf (float): The Metering Loss Factor.
+    - market (float): The market factor.
+    - interval_minutes (int): Interval length; inferred from the times if None.
+    - utc_offset_minutes (int): The offset from UTC of the meter's days, see billing.version_days().
+
+    Returns:
+    - TariffComparison: Costs per customer and tariff, with each customer's ranking.
+    """
+    module = get_network(network)
+    tariffs = tuple(module.tariffs) if tariffs is None else tuple(tariffs)
+    time_zone = module.time_zone()
+
+    utc_micros = to_utc_micros(times)
+    kwh = np.atleast_2d(np.asarray(kwh, dtype=float))
+    rrp_c_kwh = None if rrps is None else np.asarray(rrps, dtype=float) * dlf * mlf * market / 10
+
+    # Each tariff version prices the intervals it was in effect for
+    energy = np.zeros((len(kwh), len(tariffs)))
+    for version, selection in version_index(network).segments(utc_micros):
+        slope, intercept = rate_matrix(version, tariffs)
+        keys, usage, spot = _slot_sums(utc_micros[selection], time_zone, kwh[:, selection],
+                                       None if rrp_c_kwh is None else rrp_c_kwh[selection])
+        energy += usage @ intercept[keys]
+        if spot is not None:
+            energy += spot @ slope[keys]
+    energy /= 100
+
+    # Inclining block tariffs depend on each customer's usage so far, as in calculate_bill()
+    interval_times = utc_micros.astype('datetime64[us]')
+    for column, tariff in enumerate(tariffs):
+        if get_block_thresholds(network, tariff):
+            prices = block_prices(network, tariff, interval_times, kwh, rrps, dlf, mlf, market).prices
+            energy[:, column] = (kwh * prices).sum(axis=1) / 100
+
+    segments = version_days(network, utc_micros, utc_offset_minutes)
+    days = sum(segment_days for _, segment_days in segments)
+    annual_usage = kwh.sum(axis=1) * 365 / max(days, 1)
+
+    if interval_minutes is not None:
+        hours = interval_minutes / 60
+    else:
+        steps = np.diff(np.unique(utc_micros))
+        hours = steps.min() / (3600 * MICROS_PER_SECOND) if len(steps) else 0.5
+    kw = kwh / hours
+
+    daily = np.zeros_like(energy)
+    demand = np.zeros_like(energy)
+    get_fee = getattr(module, 'get_daily_fee', None)
+    banded = get_fee is not None and accepts(get_fee, 'annual_usage')
+    for column, tariff in enumerate(tariffs):
+        for when, segment_days in segments:
+            if banded:
+                fees = [_daily_fee_in_dollars(network, tariff, usage, when=when) or 0.0 for usage in annual_usage.tolist()]
+            else:
+                fees = _daily_fee_in_dollars(network, tariff, when=when) or 0.0
+            daily[:, column] += np.asarray(fees, dtype=float) * segment_days
+        if get_demand_windows(network, tariff):
+            demand[:, column] = calculate_demand(network, tariff, interval_times, kw, interval_minutes).fee.sum(axis=1)
+
+    total = energy + daily + demand
+    return TariffComparison(tariffs, energy, daily, demand, total, np.argsort(total, axis=1, kind='stable'))
+
+def _compare_chunk(arguments):
+    network, times, kwh, rrps, tariffs, kwargs = arguments
+    return compare_tariffs(network, times, kwh, rrps, tariffs, **kwargs)
+
+def compare_customers(network, times, loads, rrps=None, tariffs=None, workers=None, shared_tables=None, **kwargs):
+    """
+    Compare tariffs for a whole customer book, fanning chunks of customers out to processes.
+
+    Chunks are submitted a few at a time, so loads may be a generator over a book that
+    doesn't fit in memory. Results come back in the order of the chunks.
+
+    Parameters:
+    - network (str): The name of the network.
+    - times: Interval start times shared by every customer.
+    - loads (iterable): (customers, intervals) kWh arrays, one per chunk of customers.
+    - rrps (array-like): Spot prices in $/MWh per interval, or None.
+    - tariffs (iterable): Tariff codes to compare; every tariff of the network if None.
+    - workers (int): Worker processes; 1 compares in this process, None uses every CPU.
+    - shared_tables (str): A shared_tables.write_tables() file for the workers to map
+      instead of each compiling every tariff.
+    - kwargs: Passed on to compare_tariffs().
+
+    Yields:
+    - TariffComparison: One per chunk of customers.
+    """
+    tariffs = tuple(get_network(network).tariffs) if tariffs is None else tuple(tariffs)
+    times = to_utc_micros(times).astype('datetime64[us]')
+    tasks = ((network, times, kwh, rrps, tariffs, kwargs) for kwh in loads)
+
+    if workers == 1:
+        for task in tasks:
+            yield _compare_chunk(task)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    initializer = None if shared_tables is None else use_shared_tables
+    with ProcessPoolExecutor(workers, initializer=initializer, initargs=(shared_tables,)) as executor:
+        in_flight = []
+        limit = 2 * workers
+        for task in tasks:
+            in_flight.append(executor.submit(_compare_chunk, task))
+            if len(in_flight) >= limit:
+                yield in_flight.pop(0).result()
+        for future in in_flight:
+            yield future.result()
+
+def ranked(comparison, customer: int = 0):
+    """
+    List one customer's tariffs from cheapest to dearest.
+
+    Parameters:
+    - comparison (TariffComparison): The comparison.
+    - customer (int): The customer's row in the comparison.
+
+    Returns:
+    - list: (tariff, total dollars) tuples.
+    """
+    return [(comparison.tariffs[column], float(comparison.total[customer, column]))
+            for column in comparison.order[customer].tolist()]
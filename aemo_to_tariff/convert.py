@@ -1,13 +1,7 @@
 # aemo_to_tariff/convert.py
 
-import aemo_to_tariff.energex as energex
-import aemo_to_tariff.ausgrid as ausgrid
-import aemo_to_tariff.evoenergy as evoenergy
-import aemo_to_tariff.sapower as sapower
-import aemo_to_tariff.tasnetworks as tasnetworks
-import aemo_to_tariff.endeavour as endeavour
-import aemo_to_tariff.powercor as powercor
-import aemo_to_tariff.victoria as victoria
+from aemo_to_tariff.registry import get_network, accepts
+from aemo_to_tariff.versions import network_at
 
 def spot_to_tariff(interval_time, network, tariff, rrp,
                    dlf=1.05905, mlf=1.0154, market=1.0154):
@@ -24,31 +18,106 @@ def spot_to_tariff(interval_time, network, tariff, rrp,
     - market (float): The market factor.
 
     Returns:
-    - float: The price in c/kWh.
+    - float: The price in c/kWh, using the tariff version in effect at interval_time.
     """
     adjusted_rrp = rrp * dlf * mlf * market
-    network = network.lower()
-
-    if network == 'energex':
-        return energex.convert(interval_time, tariff, adjusted_rrp)
-    elif network == 'ausgrid':
-        return ausgrid.convert(interval_time, tariff, adjusted_rrp)
-    elif network == 'evoenergy':
-        return evoenergy.convert(interval_time, tariff, adjusted_rrp)
-    elif network == 'sapn':
-        return sapower.convert(interval_time, tariff, adjusted_rrp)
-    elif network == 'tasnetworks':
-        return tasnetworks.convert(interval_time, tariff, adjusted_rrp)
-    elif network == 'endeavour':
-        return endeavour.convert(interval_time, tariff, adjusted_rrp)
-    elif network == 'powercor':
-        return powercor.convert(interval_time, tariff, adjusted_rrp)
-    elif network == 'victoria':
-        return endeavour.convert(interval_time, tariff, adjusted_rrp)
-    else:
-        raise ValueError(f"Unknown network: {network}")
-
-def get_daily_fee(network, tariff, annual_usage=None):
+    return network_at(network, interval_time).convert(interval_time, tariff, adjusted_rrp)
+
+def spot_to_tariff_many(times, network, tariff, rrps,
+                        dlf=1.05905, mlf=1.0154, market=1.0154):
+    """
+    Convert an array of spot prices from $/MWh to c/kWh for a given network and tariff.
+
+    Gives the same results as calling spot_to_tariff() for each interval, but resolves
+    the network, tariff, time zone and periods once for each tariff version the
+    intervals span.
+
+    Parameters:
+    - times: Interval times: datetimes, UTC datetime64, epoch seconds or ISO 8601 strings.
+    - network (str): The name of the network (e.g., 'Energex', 'Ausgrid', 'Evoenergy').
+    - tariff (str): The tariff code (e.g., '6970', '017').
+    - rrps (array-like): The Regional Reference Prices in $/MWh, one per interval.
+    - dlf (float): The Distribution Loss Factor.
+    - mlf (float): The Metering Loss Factor.
+    - market (float): The market factor.
+
+    Returns:
+    - numpy.ndarray: The prices in c/kWh.
+    """
+    # numpy is only imported by callers that use the batch path
+    import numpy as np
+    from aemo_to_tariff.batch import to_utc_micros, versioned_rates
+
+    slope, intercept = versioned_rates(network, tariff, to_utc_micros(times))
+    return np.asarray(rrps, dtype=float) * dlf * mlf * market / 10 * slope + intercept
+
+def spot_to_tariff_import_export(times, network, tariff, rrps,
+                                 dlf=1.05905, mlf=1.0154, market=1.0154):
+    """
+    Convert spot prices to both the import price and the export (feed-in) price.
+
+    Each interval's slot is found once and both prices are read from it. Exports are
+    paid the adjusted spot price plus the tariff's export-side network rate, which is
+    nothing outside its export periods or for tariffs without export rates.
+
+    Parameters:
+    - times: Interval times, as for spot_to_tariff_many().
+    - network (str): The name of the network (e.g., 'SAPN').
+    - tariff (str): The tariff code (e.g., 'RTOU').
+    - rrps (array-like): The Regional Reference Prices in $/MWh, one per interval
+      (or shape (sites, intervals)).
+    - dlf (float): The Distribution Loss Factor.
+    - mlf (float): The Metering Loss Factor.
+    - market (float): The market factor.
+
+    Returns:
+    - tuple: (import prices, export prices) numpy arrays in c/kWh, the shape of rrps.
+    """
+    import numpy as np
+    from aemo_to_tariff.batch import to_utc_micros, versioned_rates
+
+    slope, intercept, export_slope, export_intercept = versioned_rates(network, tariff, to_utc_micros(times), export=True)
+    rrp_c_kwh = np.asarray(rrps, dtype=float) * dlf * mlf * market / 10
+    return rrp_c_kwh * slope + intercept, rrp_c_kwh * export_slope + export_intercept
+
+def tariff_to_spot_threshold(times, network, tariff, target_c_kwh,
+                             dlf=1.05905, mlf=1.0154, market=1.0154):
+    """
+    Find the spot price at which the delivered price reaches a target, for each interval.
+
+    The inverse of spot_to_tariff_many(): each interval's price is linear in the RRP,
+    rrp * dlf * mlf * market / 10 * slope + intercept, with the slope and intercept of
+    the period in effect (or of the network's fallback for unknown tariffs), so the
+    threshold is solved for directly. The delivered price is at or below the target
+    whenever the RRP is at or below the threshold.
+
+    Parameters:
+    - times: Interval times: datetimes, UTC datetime64, epoch seconds or ISO 8601 strings.
+    - network (str): The name of the network (e.g., 'Energex', 'Ausgrid', 'Evoenergy').
+    - tariff (str): The tariff code (e.g., '6970', '017').
+    - target_c_kwh (float or array-like): The delivered price in c/kWh, one or per interval.
+    - dlf (float): The Distribution Loss Factor.
+    - mlf (float): The Metering Loss Factor.
+    - market (float): The market factor.
+
+    Returns:
+    - numpy.ndarray: RRPs in $/MWh; NaN where the price doesn't depend on the RRP.
+    """
+    import numpy as np
+    from aemo_to_tariff.batch import to_utc_micros, versioned_rates
+
+    slope, intercept = versioned_rates(network, tariff, to_utc_micros(times))
+    scale = dlf * mlf * market / 10 * slope
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(scale != 0, (np.asarray(target_c_kwh, dtype=float) - intercept) / scale, np.nan)
+
+def _to_dollars(module, units_attribute, fee):
+    """Scale a network module's fee to dollars; modules say so when their tables are in cents."""
+    if fee is None or not getattr(module, units_attribute, '$').startswith('c'):
+        return fee
+    return fee / 100
+
+def get_daily_fee(network, tariff, annual_usage=None, when=None):
     """
     Calculate the daily fee for a given network and tariff.
 
@@ -56,65 +125,56 @@ def get_daily_fee(network, tariff, annual_usage=None):
     - network (str): The name of the network (e.g., 'Energex', 'Ausgrid', 'Evoenergy').
     - tariff (str): The tariff code.
     - annual_usage (float): Annual usage in kWh, required for some tariffs.
+    - when: A datetime or date to use the tariff version in effect then; None for the current one.
 
     Returns:
-    - float: The daily fee in dollars.
+    - float: The daily fee in dollars, or in cents for networks that declare
+      daily_fee_units = 'c/day' (SAPN and TasNetworks).
     """
-    network = network.lower()
-
-    if network == 'energex':
-        return energex.get_daily_fee(tariff, annual_usage)
-    elif network == 'ausgrid':
-        # Placeholder for Ausgrid daily fee calculation
+    get_fee = getattr(network_at(network, when), 'get_daily_fee', None)
+    if get_fee is None:
+        # Placeholder for networks without daily fees yet (e.g. Ausgrid, Evoenergy)
         return 0.0
-    elif network == 'evoenergy':
-        # Placeholder for Evoenergy daily fee calculation
-        return 0.0
-    elif network == 'sapn':
-        return sapower.get_daily_fee(tariff)
-    elif network == 'tasnetworks':
-        return tasnetworks.get_daily_fee(tariff)
-    elif network == 'victoria':
-        return victoria.get_daily_fee(tariff)
-    elif network == 'powercor':
-        return powercor.get_daily_fee(tariff)
-    else:
-        raise ValueError(f"Unknown network: {network}")
-
-def calculate_demand_fee(network, tariff, demand_kw, days=30):
+    if annual_usage is not None and accepts(get_fee, 'annual_usage'):
+        return get_fee(tariff, annual_usage=annual_usage)
+    return get_fee(tariff)
+
+def calculate_demand_fee(network, tariff, demand_kw, days=30, peak_demand_kw=None, when=None, summer_demand_kw=None):
     """
     Calculate the demand fee for a given network, tariff, demand amount, and time period.
 
+    Demands and days may be numpy arrays (e.g. sites x months) to price many at once.
+
     Parameters:
     - network (str): The name of the network (e.g., 'Energex', 'Ausgrid', 'Evoenergy').
     - tariff (str): The tariff code.
     - demand_kw (float): The maximum demand in kW (or kVA for some tariffs).
     - days (int): The number of days for the billing period (default is 30).
+    - peak_demand_kw (float): The maximum demand in peak hours, for tariffs that charge it separately.
+    - when: A datetime or date to use the tariff version in effect then; None for the current one.
+    - summer_demand_kw (float): The maximum demand in summer months, for tariffs that charge it separately.
 
     Returns:
-    - float: The demand fee in dollars.
+    - float: The demand fee in dollars, or in cents for networks that declare
+      demand_charge_units in cents (SAPN's 'c/kW/day').
     """
-    network = network.lower()
-
-    if network == 'energex':
-        return energex.calculate_demand_fee(tariff, demand_kw, days)
-    elif network == 'ausgrid':
-        # Placeholder for Ausgrid demand fee calculation
-        return 0.0
-    elif network == 'evoenergy':
-        # Placeholder for Evoenergy demand fee calculation
+    calculate_fee = getattr(network_at(network, when), 'calculate_demand_fee', None)
+    if calculate_fee is None:
+        # Placeholder for networks without demand charges yet (e.g. Ausgrid, Evoenergy)
         return 0.0
-    elif network == 'sapn':
-        return sapower.calculate_demand_fee(tariff, demand_kw, days)
-    elif network == 'tasnetworks':
-        return tasnetworks.calculate_demand_fee(tariff, demand_kw, days)
-    elif network == 'endeavour':
-        return endeavour.calculate_demand_fee(tariff, demand_kw, days)
-    elif network == 'victoria':
-        return victoria.calculate_demand_fee(tariff, demand_kw, days)
-    else:
-        raise ValueError(f"Unknown network: {network}")
+    demands = {'peak_demand_kw': peak_demand_kw, 'summer_demand_kw': summer_demand_kw}
+    demands = {argument: value for argument, value in demands.items()
+               if value is not None and accepts(calculate_fee, argument)}
+    return calculate_fee(tariff, demand_kw, days=days, **demands)
+
+def _daily_fee_in_dollars(network, tariff, annual_usage=None, when=None):
+    """get_daily_fee() in dollars whatever the network's daily_fee_units, for billing."""
+    return _to_dollars(network_at(network, when), 'daily_fee_units', get_daily_fee(network, tariff, annual_usage, when))
 
+def _demand_fee_in_dollars(network, tariff, demand_kw, days=30, when=None, **demands):
+    """calculate_demand_fee() in dollars whatever the network's demand_charge_units, for billing."""
+    fee = calculate_demand_fee(network, tariff, demand_kw, days, when=when, **demands)
+    return _to_dollars(network_at(network, when), 'demand_charge_units', fee)
 
 def get_periods(network, tariff: str):
     """
@@ -127,23 +187,4 @@ def get_periods(network, tariff: str):
     Returns:
     - list: A list of periods for the given tariff.
     """
-    network = network.lower()
-
-    if network == 'energex':
-        return energex.get_periods(tariff)
-    elif network == 'ausgrid':
-        return ausgrid.get_periods(tariff)
-    elif network == 'evoenergy':
-        return evoenergy.get_periods(tariff)
-    elif network == 'sapn':
-        return sapower.get_periods(tariff)
-    elif network == 'tasnetworks':
-        return tasnetworks.get_periods(tariff)
-    elif network == 'endeavour':
-        return endeavour.get_periods(tariff)
-    elif network == 'victoria':
-        return victoria.get_periods(tariff)
-    elif network == 'powercor':
-        return powercor.get_periods(tariff)
-    else:
-        raise ValueError(f"Unknown network: {network}")
+    return get_network(network).get_periods(tariff)
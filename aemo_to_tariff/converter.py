@@ -0,0 +1,148 @@
+# aemo_to_tariff/converter.py
+from datetime import datetime, timezone
+
+import numpy as np
+
+from aemo_to_tariff.batch import to_utc_micros, versioned_rates
+from aemo_to_tariff.calendars import day_calendar, state_of, EPOCH_ORDINAL
+from aemo_to_tariff.registry import get_network
+from aemo_to_tariff.slots import compile_tariff, SLOTS_PER_DAY, SLOT_MINUTES
+from aemo_to_tariff.timezones import transition_index
+from aemo_to_tariff.versions import version_index
+
+_UNCACHED = object()
+
+
+class TariffConverter:
+    """
+    A spot_to_tariff() bound to one network, tariff and set of loss factors.
+
+    Everything that does not depend on the interval is resolved when the converter is
+    built; a call only maps the interval time to a slot and does the arithmetic. The
+    tables of each tariff version are bound as intervals reach it.
+    """
+    __slots__ = ('network', 'tariff', 'compiled', '_versions', '_module', '_tables', '_index', '_dlf', '_mlf',
+                 '_market', '_slope', '_intercept', '_day_base', '_calendar', '_codes', '_first_ordinal', '_tzinfo',
+                 '_valid_from', '_valid_to', '_shift')
+
+    def __init__(self, network, tariff, versions, module, dlf, mlf, market):
+        self.network = network
+        self.tariff = tariff
+        self._versions = versions
+        self._tables = {}
+        # Kept apart and multiplied in spot_to_tariff()'s order, so results match it exactly
+        self._dlf, self._mlf, self._market = dlf, mlf, market
+        self._tzinfo = _UNCACHED
+        self._valid_from = self._valid_to = None
+        self._shift = 0
+        self._bind(module)
+
+    def _bind(self, module):
+        tables = self._tables.get(module)
+        if tables is None:
+            compiled = compile_tariff(module, self.tariff)
+            # Flat index of the first slot of each day code's day type
+            day_base = (compiled.day_types.astype(int) * SLOTS_PER_DAY).ravel().tolist()
+            tables = (compiled, compiled.slope.ravel().tolist(), compiled.intercept.ravel().tolist(), day_base)
+            self._tables[module] = tables
+        self._module = module
+        self.compiled, self._slope, self._intercept, self._day_base = tables
+        self._index = transition_index(self.compiled.time_zone)
+        self._calendar = day_calendar(state_of(self.compiled.time_zone))
+        self._codes = self._calendar.code_list
+        self._first_ordinal = EPOCH_ORDINAL + self._calendar.first_day
+
+    def _local_minutes(self, interval_time):
+        """
+        Work out the local day (as a date ordinal) and minute of the day the slow way, and
+        cache the offset window.
+        """
+        timestamp = interval_time.timestamp()
+        module, version_from, version_to = self._versions.window(timestamp)
+        if module is not self._module:
+            self._bind(module)
+        offset, valid_from, valid_to = self._index.offset_window(timestamp)
+
+        # Datetimes with a fixed offset (UTC, or parsed with %z) can then skip timestamp()
+        tzinfo = interval_time.tzinfo
+        if isinstance(tzinfo, timezone):
+            self._tzinfo = tzinfo
+            self._valid_from = datetime.fromtimestamp(max(valid_from, version_from), tzinfo)
+            self._valid_to = datetime.fromtimestamp(min(valid_to, version_to), tzinfo)
+            self._shift = int(offset - interval_time.utcoffset().total_seconds()) // 60
+        else:
+            self._tzinfo = _UNCACHED
+
+        local = timestamp + offset
+        return EPOCH_ORDINAL + int(local // 86400), int(local % 86400) // 60
+
+    def __call__(self, interval_time: datetime, rrp: float):
+        """
+        Convert a spot price from $/MWh to c/kWh.
+
+        Parameters:
+        - interval_time (datetime): The interval time.
+        - rrp (float): The Regional Reference Price in $/MWh.
+
+        Returns:
+        - float: The price in c/kWh.
+        """
+        if interval_time.tzinfo is self._tzinfo and self._valid_from <= interval_time < self._valid_to:
+            minutes = interval_time.hour * 60 + interval_time.minute + self._shift
+            day = interval_time.toordinal() + minutes // 1440 - self._first_ordinal
+            minutes %= 1440
+        else:
+            day, minutes = self._local_minutes(interval_time)
+            day -= self._first_ordinal
+
+        # The day code from the state's precomputed calendar, see calendars.DayCalendar
+        if 0 <= day < len(self._codes):
+            code = self._codes[day]
+        else:
+            code = self._calendar.code_of(day + self._calendar.first_day)
+        index = self._day_base[code] + minutes // SLOT_MINUTES
+        return rrp * self._dlf * self._mlf * self._market / 10 * self._slope[index] + self._intercept[index]
+
+    def convert_many(self, times, rrps):
+        """
+        Convert arrays of spot prices from $/MWh to c/kWh.
+
+        Parameters:
+        - times: Interval times: datetimes, UTC datetime64, epoch seconds or ISO 8601 strings.
+        - rrps (array-like): The Regional Reference Prices in $/MWh.
+
+        Returns:
+        - numpy.ndarray: The prices in c/kWh.
+        """
+        slope, intercept = versioned_rates(self.network, self.tariff, to_utc_micros(times))
+        return np.asarray(rrps, dtype=float) * self._dlf * self._mlf * self._market / 10 * slope + intercept
+
+    def convert_import_export(self, times, rrps):
+        """
+        Convert arrays of spot prices to import and export prices in one pass, see
+        convert.spot_to_tariff_import_export().
+
+        Returns:
+        - tuple: (import prices, export prices) numpy arrays in c/kWh.
+        """
+        slope, intercept, export_slope, export_intercept = versioned_rates(
+            self.network, self.tariff, to_utc_micros(times), export=True)
+        rrp_c_kwh = np.asarray(rrps, dtype=float) * self._dlf * self._mlf * self._market / 10
+        return rrp_c_kwh * slope + intercept, rrp_c_kwh * export_slope + export_intercept
+
+
+def get_converter(network, tariff, dlf=1.05905, mlf=1.0154, market=1.0154):
+    """
+    Build a converter for repeated spot_to_tariff() calls on the same network and tariff.
+
+    Parameters:
+    - network (str): The name of the network (e.g., 'Energex', 'Ausgrid', 'Evoenergy').
+    - tariff (str): The tariff code (e.g., '6970', '017').
+    - dlf (float): The Distribution Loss Factor.
+    - mlf (float): The Metering Loss Factor.
+    - market (float): The market factor.
+
+    Returns:
+    - TariffConverter: A callable taking (interval_time, rrp) and returning c/kWh.
+    """
+    return TariffConverter(network.lower(), tariff, version_index(network), get_network(network), dlf, mlf, market)
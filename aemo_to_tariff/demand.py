@@ -0,0 +1,203 @@
+# aemo_to_tariff/demand.py
+from collections import namedtuple
+
+import numpy as np
+
+from aemo_to_tariff.batch import to_utc_micros
+from aemo_to_tariff.convert import _demand_fee_in_dollars
+from aemo_to_tariff.registry import get_network
+from aemo_to_tariff.timezones import transition_index, MICROS_PER_DAY, MICROS_PER_SECOND
+from aemo_to_tariff.versions import version_index
+
+# Networks bill demand as the average kW over a half hour
+DEMAND_MINUTES = 30
+DEMAND_MICROS = DEMAND_MINUTES * 60 * MICROS_PER_SECOND
+MICROS_PER_MINUTE = 60 * MICROS_PER_SECOND
+
+# Used for networks that charge demand but don't define demand windows
+ANYTIME = {'windows': None, 'weekdays': None, 'method': 'max'}
+
+# Billed demand per local calendar month. months is datetime64[M], days counts the days
+# with data in each month, demand maps calculate_demand_fee() arguments to kW and fee is
+# in dollars; demand and fee arrays are (sites, months), or (months,) for a single site.
+MonthlyDemand = namedtuple('MonthlyDemand', ['months', 'days', 'demand', 'fee'])
+
+
+def get_demand_windows(network, tariff):
+    """
+    Get when and how billed demand is measured for a tariff.
+
+    Parameters:
+    - network (str): The name of the network.
+    - tariff (str): The tariff code.
+
+    Returns:
+    - dict: calculate_demand_fee() argument -> window definition, see
+      energex.get_demand_windows(). Empty if the tariff has no demand charge.
+    """
+    module = get_network(network)
+    get_windows = getattr(module, 'get_demand_windows', None)
+    if get_windows is not None:
+        return get_windows(tariff) or {}
+    if hasattr(module, 'demand_charges') and hasattr(module, 'calculate_demand_fee'):
+        return {'demand_kw': ANYTIME}
+    return {}
+
+def _group_starts(keys):
+    """Indices where a sorted key array changes value."""
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.intp)
+    return np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+def _window_mask(window, local_micros):
+    days = local_micros // MICROS_PER_DAY
+    mask = np.ones(len(local_micros), dtype=bool)
+
+    if window.get('weekdays') is not None:
+        mask &= np.isin((days + 3) % 7, window['weekdays'])  # 1970-01-01 was a Thursday
+
+    if window.get('months') is not None:
+        months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) % 12 + 1
+        mask &= np.isin(months, window['months'])
+
+    if window.get('windows') is not None:
+        time_of_day = local_micros - days * MICROS_PER_DAY
+        inside = np.zeros(len(local_micros), dtype=bool)
+        for start, end in window['windows']:
+            start = _minutes(start) * MICROS_PER_MINUTE
+            end = _minutes(end) * MICROS_PER_MINUTE
+            if start < end:
+                inside |= (time_of_day >= start) & (time_of_day < end)
+            else:
+                inside |= (time_of_day >= start) | (time_of_day < end)
+        mask &= inside
+    return mask
+
+def _half_hours(kw, local_micros, interval_micros):
+    """Average interval demand up to half-hour blocks."""
+    if interval_micros >= DEMAND_MICROS:
+        return kw, local_micros
+    starts = _group_starts(local_micros // DEMAND_MICROS)
+    return np.add.reduceat(kw, starts, axis=1) * (interval_micros / DEMAND_MICROS), local_micros[starts]
+
+def _rolling(kw, local_micros, interval_micros, window):
+    """The average over the trailing half hour at each interval, if it lies in the window."""
+    count = max(1, DEMAND_MICROS // interval_micros)
+    total = np.cumsum(kw, axis=1)
+    rolling = np.full(kw.shape, -np.inf)
+    if kw.shape[1] >= count:
+        rolling[:, count - 1:] = total[:, count - 1:]
+        rolling[:, count:] -= total[:, :-count]
+        rolling[:, count - 1:] /= count
+    mask = _window_mask(window, local_micros)
+    # The whole half hour must be inside the demand window
+    mask[count - 1:] &= mask[:len(mask) - count + 1]
+    mask[:count - 1] = False
+    return np.where(mask, rolling, -np.inf)
+
+def _top_average(daily, count):
+    """Average the count highest finite values in each row."""
+    top = -np.sort(-daily, axis=1)[:, :count]
+    finite = np.isfinite(top)
+    found = finite.sum(axis=1)
+    total = np.where(finite, top, 0.0).sum(axis=1)
+    return np.where(found > 0, total / np.maximum(found, 1), -np.inf)
+
+def _monthly(window, kw, local_micros, interval_micros):
+    method = window.get('method', 'max')
+
+    if method == 'rolling':
+        values, value_times = _rolling(kw, local_micros, interval_micros, window), local_micros
+    elif method in ('max', 'top'):
+        values, value_times = _half_hours(kw, local_micros, interval_micros)
+        values = np.where(_window_mask(window, value_times), values, -np.inf)
+    else:
+        raise ValueError(f"Unknown demand method: {method}")
+
+    value_days = value_times // MICROS_PER_DAY
+    value_months = value_days.astype('datetime64[D]').astype('datetime64[M]')
+
+    if method == 'top':
+        day_starts = _group_starts(value_days)
+        daily = np.maximum.reduceat(values, day_starts, axis=1)
+        day_months = value_months[day_starts]
+        month_starts = list(_group_starts(day_months)) + [len(day_starts)]
+        peak = np.stack([
+            _top_average(daily[:, start:end], window.get('count', 1))
+            for start, end in zip(month_starts[:-1], month_starts[1:])
+        ], axis=1)
+    else:
+        peak = np.maximum.reduceat(values, _group_starts(value_months), axis=1)
+
+    # Months with no intervals in the window have no billed demand
+    return np.where(np.isfinite(peak), peak, 0.0)
+
+def calculate_demand(network, tariff, times, kw, interval_minutes=None):
+    """
+    Find the billed demand and demand fee for each month of one or many load series.
+
+    The demand in each calendar month is measured inside the tariff's demand windows,
+    as the largest half-hour demand ('max'), the largest rolling half-hour average
+    ('rolling') or the average of the highest days ('top'). Fees come from the
+    network's calculate_demand_fee(), prorated by the days of data in each month, at the
+    tariff version in effect at the start of the month.
+
+    Parameters:
+    - network (str): The name of the network.
+    - tariff (str): The tariff code.
+    - times: Interval start times shared by every site, see batch.to_utc_micros().
+    - kw (array-like): Average demand in kW per interval, shape (intervals,) for one site
+      or (sites, intervals) for a fleet.
+    - interval_minutes (int): Interval length; inferred from the times if None.
+
+    Returns:
+    - MonthlyDemand: The billed demand and fee per month.
+    """
+    module = get_network(network)
+    windows = get_demand_windows(network, tariff)
+
+    utc_micros = to_utc_micros(times)
+    kw = np.asarray(kw, dtype=float)
+    single = kw.ndim == 1
+    kw = np.atleast_2d(kw)
+    if len(utc_micros) and (np.diff(utc_micros) < 0).any():
+        order = np.argsort(utc_micros, kind='stable')
+        utc_micros, kw = utc_micros[order], kw[:, order]
+
+    if interval_minutes is not None:
+        interval_micros = int(interval_minutes * MICROS_PER_MINUTE)
+    else:
+        steps = np.diff(np.unique(utc_micros))
+        interval_micros = int(steps.min()) if len(steps) else DEMAND_MICROS
+
+    local_micros = utc_micros + transition_index(module.time_zone()).offsets_at(utc_micros)
+    local_days = local_micros // MICROS_PER_DAY
+    months = local_days.astype('datetime64[D]').astype('datetime64[M]')
+    month_starts = _group_starts(months)
+    new_day = np.zeros(len(local_days), dtype=np.int64)
+    new_day[_group_starts(local_days)] = 1
+    days = np.add.reduceat(new_day, month_starts) if len(month_starts) else new_day
+
+    demand = {
+        argument: _monthly(window, kw, local_micros, interval_micros)
+        for argument, window in windows.items()
+    }
+    fee = np.zeros((len(kw), len(month_starts)))
+    if 'demand_kw' in demand:
+        # Each month is charged at the tariff version in effect at its first interval
+        index = version_index(network)
+        month_from = (utc_micros[month_starts] // MICROS_PER_SECOND).tolist()
+        positions = np.array([index.position(when) for when in month_from], dtype=int)
+        for position in np.unique(positions).tolist():
+            columns = positions == position
+            others = {argument: values[:, columns] for argument, values in demand.items() if argument != 'demand_kw'}
+            fee[:, columns] = _demand_fee_in_dollars(network, tariff, demand['demand_kw'][:, columns], days[columns],
+                                                     when=month_from[int(np.argmax(columns))], **others)
+
+    if single:
+        demand = {argument: values[0] for argument, values in demand.items()}
+        fee = fee[0]
+    return MonthlyDemand(months[month_starts], days, demand, fee)
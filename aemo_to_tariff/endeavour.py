@@ -1,6 +1,11 @@
 from datetime import time, datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
+from aemo_to_tariff.periods import in_period
+
+# Seasonal tariffs (those with 'season' in their name) use their high-season rates in these months
+HIGH_SEASON_MONTHS = (11, 12, 1, 2, 3)
 
 def time_zone():
     return 'Australia/Sydney'
@@ -49,6 +54,13 @@ tariffs = {
     }
 }
 
+# Inclining block tariffs: kWh per day of a billing period billed at each block's rate
+# before the next block starts, see blocks.block_prices(). convert() has no usage to go
+# on, so it always gives the Block 1 rate.
+block_thresholds = {
+    'N90': (1750 / 91.25,),  # 1,750 kWh a quarter
+}
+
 
 def calculate_daily_fee(tariff_code: str):
     """
@@ -94,6 +106,41 @@ def get_periods(tariff_code: str):
 
     return tariff['periods']
 
+@lru_cache(maxsize=None)
+def _season_periods(tariff_code: str):
+    """
+    Split a seasonal tariff's periods into (high season, low season) lists, once per tariff.
+
+    Off-peak periods apply in both seasons. Returns None for tariffs priced the same all year.
+    """
+    tariff = tariffs[tariff_code]
+    if 'season' not in tariff['name'].lower():
+        return None
+    periods = tariff['periods']
+    high = [p for p in periods if 'high' in p[0].lower() or 'off' in p[0].lower()]
+    low = [p for p in periods if 'low' in p[0].lower() or 'off' in p[0].lower()]
+    return high, low
+
+def get_rules(tariff_code: str):
+    """
+    Describe how convert() resolves a tariff, for the vectorized converters.
+
+    Parameters:
+    - tariff_code (str): The tariff code.
+
+    Returns:
+    - dict: See energex.get_rules.
+    """
+    periods = tariffs[tariff_code]['periods']
+    seasons = _season_periods(tariff_code)
+    if seasons is not None:
+        variants = [(HIGH_SEASON_MONTHS, None, seasons[0]), (None, None, seasons[1])]
+    else:
+        variants = [(None, None, periods)]
+
+    # Unlike the other networks, convert() here never wraps periods past midnight
+    return {'variants': variants, 'wrap': False, 'fallback': (1.037869032618134, 5.586606750833143)}
+
 def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     """
     Convert RRP from $/MWh to c/kWh for endeavour.
@@ -106,32 +153,20 @@ def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     Returns:
     - float: The price in c/kWh.
     """
-    interval_time = interval_datetime.astimezone(ZoneInfo(time_zone())).time()
+    local = interval_datetime.astimezone(ZoneInfo(time_zone()))
+    interval_time = local.time()
     rrp_c_kwh = rrp / 10
-    tariff = tariffs[tariff_code]
+    periods = tariffs[tariff_code]['periods']
 
-    # Determine if it's high season (November to March) or low season (April to October)
-    current_month = interval_datetime.month
-    is_high_season = current_month in [11, 12, 1, 2, 3]
+    # High season is November to March, by the local month
+    seasons = _season_periods(tariff_code)
+    if seasons is not None:
+        periods = seasons[0] if local.month in HIGH_SEASON_MONTHS else seasons[1]
 
     # Find the applicable period and rate
-    for period, start, end, rate in tariff['periods']:
-        if start <= interval_time < end:
-            if 'season' in tariff['name'].lower():
-                if is_high_season and 'high' in period.lower():
-                    total_price = rrp_c_kwh + rate
-                    return total_price
-                elif 'low' in period.lower() and not is_high_season:
-                    total_price = rrp_c_kwh + rate
-                    return total_price
-                elif 'off' in period.lower():
-                    total_price = rrp_c_kwh + rate
-                    return total_price
-                else:
-                    continue
-            else:
-                total_price = rrp_c_kwh + rate
-                return total_price
+    for period, start, end, rate in periods:
+        if in_period(interval_time, start, end, wrap=False):
+            return rrp_c_kwh + rate
 
     # Otherwise, this terrible approximation
     slope = 1.037869032618134
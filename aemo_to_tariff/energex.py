@@ -2,155 +2,99 @@
 from datetime import time, datetime
 from zoneinfo import ZoneInfo
 
+from aemo_to_tariff.periods import in_period
+from aemo_to_tariff.tariff_store import approved_prices
+from aemo_to_tariff.versions import CURRENT_EFFECTIVE_FROM
+
 def time_zone():
     return 'Australia/Brisbane'
 
 
-daily_fees = {
-    '8400': 0.556,  # Residential Flat
-    '3900': 0.556,  # Residential Transitional Demand
-    '3700': 0.556,  # Residential Demand
-    '6900': 0.556,  # Residential Time of Use Energy
-    '8500': 0.739,  # Small Business Flat
-    '3600': 0.739,  # Small Business Demand
-    '3800': 0.739,  # Small Business Transitional Demand
-    '6000': {        # Small Business Wide IFT
-        'band1': 0.739,
-        'band2': 1.033,
-        'band3': 1.322,
-        'band4': 1.608,
-        'band5': 1.888
-    },
-    '6800': {        # Small Business ToU Energy
-        'band1': 0.739,
-        'band2': 1.041,
-        'band3': 1.343,
-        'band4': 1.647,
-        'band5': 1.950
-    },
-    '6600': 5.273,  # Large Residential Energy
-    '6700': 5.273,  # Large Business Energy
-    '7200': 4.994,  # LV Demand Time-of-Use
-    '8100': 37.740,  # Demand Large
-    '8300': 5.273,  # Demand Small
+# Each tariff's periods, as (name, start, end, the workbook price it charges). Rates, daily
+# fees and demand charges are the AER approved prices in the tariff store (see aer_import.py).
+_tariff_periods = {
+    '8400': ('Residential Flat', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '3900': ('Residential Transitional Demand', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '3700': ('Residential Demand', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '6900': ('Residential Time of Use Energy', [
+        ('Evening', time(16, 0), time(21, 0), 'Evening'),
+        ('Overnight', time(21, 0), time(9, 0), 'Overnight'),
+        ('Day', time(9, 0), time(16, 0), 'Day'),
+    ]),
+    '3600': ('Small Business Demand', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '3800': ('Small Business Transitional Demand', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '6000': ('Small Business Wide IFT', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '8500': ('Small Business Flat', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '6800': ('Small Business ToU Energy', [
+        ('Day', time(9, 0), time(16, 0), 'Day'),
+        ('Evening', time(16, 0), time(21, 0), 'Evening'),
+        ('Overnight', time(21, 0), time(9, 0), 'Overnight'),
+    ]),
+    '6600': ('Large Residential Energy', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '6700': ('Large Business Energy', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '7200': ('LV Demand Time-of-Use', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '8100': ('Demand Large', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
+    '8300': ('Demand Small', [('Anytime', time(0, 0), time(23, 59), 'Volume')]),
 }
 
-tariffs = {
-    '8400': {
-        'name': 'Residential Flat',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 9.648)
-        ],
-        'rate': 9.648
-    },
-    '3900': {
-        'name': 'Residential Transitional Demand',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 4.085)
-        ],
-        'rate': 4.085
-    },
-    '3700': {
-        'name': 'Residential Demand',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 3.320)
-        ],
-        'rate': 3.320
-    },
-    '6900': {
-        'name': 'Residential Time of Use Energy',
-        'periods': [
-            ('Evening', time(16, 0), time(21, 0), 17.861),
-            ('Overnight', time(21, 0), time(9, 0), 6.268),
-            ('Day', time(9, 0), time(16, 0), 4.066)
-        ],
-        'rate': {'Evening': 17.861, 'Overnight': 6.268, 'Day': 4.066}
-    },
-    '3600': {
-        'name': 'Small Business Demand',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 5.616)
-        ],
-        'rate': 5.616
-    },
-    '3800': {
-        'name': 'Small Business Transitional Demand',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 6.558)
-        ],
-        'rate': 6.558
-    },
-    '6000': {
-        'name': 'Small Business Wide IFT',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 10.359)
-        ],
-        'rate': 10.359
-    },
-    '8500': {
-        'name': 'Small Business Flat',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 10.359)
-        ],
-        'rate': 10.195
-    },
-    '6800': {
-        'name': 'Small Business ToU Energy',
-        'periods': [
-            ('Day', time(9, 0), time(16, 0), 4.356),
-            ('Evening', time(16, 0), time(21, 0), 19.219),
-            ('Overnight', time(21, 0), time(9, 0), 14.097)
-        ],
-        'rate': {'Day': 4.356, 'Evening': 19.219, 'Overnight': 14.097}
-    },
-    '6600': {
-        'name': 'Large Residential Energy',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 9.648)
-        ],
-        'rate': 9.648
-    },
-    '6700': {
-        'name': 'Large Business Energy',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 10.195)
-        ],
-        'rate': 10.195
-    },
-    '7200': {
-        'name': 'LV Demand Time-of-Use',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 2.484)
-        ],
-        'rate': 2.484
-    },
-    '8100': {
-        'name': 'Demand Large',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 1.301)
-        ],
-        'rate': 1.301
-    },
-    '8300': {
-        'name': 'Demand Small',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 1.799)
-        ],
-        'rate': 1.799
-    }
+# The daily fees of the Wide IFT and ToU Energy tariffs go up with annual usage, in the
+# workbooks' four bands of up to 20, 40, 60 and 80 MWh a year.
+USAGE_BANDS = (20000, 40000, 60000, 80000)
+
+def _approved_tables():
+    """Build the tariffs, daily_fees and demand_charges tables from the tariff store."""
+    tariffs, daily_fees, demand_charges = {}, {}, {}
+    for code, (name, periods) in _tariff_periods.items():
+        prices = approved_prices('energex', code, CURRENT_EFFECTIVE_FROM)
+        rates = {period: prices['energy'][label] for period, _, _, label in periods}
+        tariffs[code] = {
+            'name': name,
+            'periods': [(period, start, end, rates[period]) for period, start, end, _ in periods],
+            'rate': rates if len(rates) > 1 else rates[periods[0][0]],
+        }
+
+        fixed = prices['fixed']
+        if 'Fixed' in fixed:
+            daily_fees[code] = fixed['Fixed']
+        elif fixed:
+            daily_fees[code] = {f"band{band}": fixed[f"Band{band}"] for band in range(1, len(USAGE_BANDS) + 1)}
+
+        # For 7200 the peak demand charge, not the excess demand one
+        if prices['demand']:
+            demand_charges[code] = next(iter(prices['demand'].values()))
+    return tariffs, daily_fees, demand_charges
+
+
+# Demand charges are in $/kW/month (or $/kVA/month for 8100 and 8300)
+tariffs, daily_fees, demand_charges = _approved_tables()
+
+# When billed demand is measured, see get_demand_windows()
+_EVENING = {'windows': [(time(16, 0), time(21, 0))], 'weekdays': None, 'method': 'max'}
+_ANYTIME = {'windows': None, 'weekdays': None, 'method': 'max'}
+
+demand_windows = {
+    '3700': {'demand_kw': _EVENING},
+    '3900': {'demand_kw': _EVENING},
+    '3600': {'demand_kw': _EVENING},
+    '3800': {'demand_kw': _EVENING},
+    '8100': {'demand_kw': {'windows': None, 'weekdays': None, 'method': 'rolling'}},
+    '8300': {'demand_kw': _ANYTIME},
 }
 
-# Add this to your existing code
+def get_demand_windows(tariff_code: str):
+    """
+    Get the demand windows for a given tariff code.
 
-demand_charges = {
-    '3700': 8.998,  # Residential Demand
-    '3900': 5.127,  # Residential Transitional Demand
-    '3600': 10.289,  # Small Business Demand
-    '3800': 4.975,  # Small Business Transitional Demand
-    '7200': 15.254,  # LV Demand Time-of-Use (peak) but not excess demand
-    '8100': 15.773,  # Demand Large
-    '8300': 15.704,  # Demand Small
-}
+    Parameters:
+    - tariff_code (str): The tariff code.
+
+    Returns:
+    - dict: calculate_demand_fee() argument -> {'windows': [(start, end)] in local time or None
+      for all day, 'weekdays': weekdays (Monday is 0) or None for every day, optionally
+      'months' (1 to 12) it applies in, 'method': 'max', 'rolling' or 'top', and for 'top'
+      the 'count' of days averaged}, or None if the tariff has no demand charge.
+    """
+    return demand_windows.get(str(tariff_code)[:4])
 
 def calculate_demand_fee(tariff_code: str, demand_kw: float, days: int = 30):
     """
@@ -183,7 +127,8 @@ def get_daily_fee(tariff_code: str, annual_usage: float = None):
 
     Parameters:
     - tariff_code (str): The tariff code.
-    - annual_usage (float): Annual usage in kWh, required for Wide IFT and ToU Energy tariffs.
+    - annual_usage (float): Annual usage in kWh, required for Wide IFT and ToU Energy tariffs;
+      these have no approved fee above 80 MWh a year, so more raises ValueError.
 
     Returns:
     - float: The daily fee in dollars.
@@ -194,16 +139,10 @@ def get_daily_fee(tariff_code: str, annual_usage: float = None):
         if annual_usage is None:
             raise ValueError("Annual usage is required for this tariff.")
 
-        if annual_usage <= 20000:
-            return fee['band1']
-        elif annual_usage <= 40000:
-            return fee['band2']
-        elif annual_usage <= 60000:
-            return fee['band3']
-        elif annual_usage <= 80000:
-            return fee['band4']
-        else:
-            return fee['band5']
+        for band, upper in enumerate(USAGE_BANDS, 1):
+            if annual_usage <= upper:
+                return fee[f"band{band}"]
+        raise ValueError(f"No approved daily fee for tariff {tariff_code} above {USAGE_BANDS[-1]} kWh a year.")
 
     return fee
 
@@ -215,6 +154,31 @@ def get_periods(tariff_code: str):
 
     return tariff['periods']
 
+def get_rules(tariff_code: str):
+    """
+    Describe how convert() resolves a tariff, for the vectorized converters.
+
+    Parameters:
+    - tariff_code (str): The tariff code.
+
+    Returns:
+    - dict: 'variants' lists (months, weekdays, periods) tried in order (None matches any),
+      'wrap' says whether a period with start > end crosses midnight and 'fallback'
+      is the (slope, intercept) applied to the c/kWh price when no period matches.
+      A period whose start equals its end covers the whole day.
+    """
+    tariff = tariffs.get(str(tariff_code)[:4])
+
+    if not tariff:
+        return {'variants': [], 'wrap': True, 'fallback': (1.037869032618134, 5.586606750833143)}
+
+    if isinstance(tariff['rate'], dict):
+        rate = list(tariff['rate'].values())[0]
+    else:
+        rate = tariff['rate']
+
+    return {'variants': [(None, None, tariff['periods'])], 'wrap': True, 'fallback': (1.0, rate)}
+
 def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     """
     Convert RRP from $/MWh to c/kWh for Energex.
@@ -241,7 +205,7 @@ def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
 
     # Find the applicable period and rate
     for period, start, end, rate in tariff['periods']:
-        if start <= interval_time < end or (start > end and (interval_time >= start or interval_time < end)):
+        if in_period(interval_time, start, end):
             total_price = rrp_c_kwh + rate
             return total_price
 
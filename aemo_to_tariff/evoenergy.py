@@ -1,6 +1,8 @@
 # aemo_to_tariff/evoenergy.py
 from datetime import datetime
 from zoneinfo import ZoneInfo
+
+from aemo_to_tariff.periods import in_period
 from datetime import time
 
 def time_zone():
@@ -52,6 +54,12 @@ tariffs = {
     }
 }
 
+# Export-side network rates in c/kWh, see sapower.export_tariffs
+export_tariffs = {
+    '017': {'name': 'New Residential TOU Network', 'periods': [('Solar Soak', time(11, 0), time(15, 0), 0.0)]},
+    '018': {'name': 'New Residential TOU Network XMC', 'periods': [('Solar Soak', time(11, 0), time(15, 0), 0.0)]},
+}
+
 
 def get_periods(tariff_code: str):
     tariff = tariffs.get(tariff_code)
@@ -60,6 +68,19 @@ def get_periods(tariff_code: str):
 
     return tariff['periods']
 
+def get_rules(tariff_code: str):
+    """
+    Describe how convert() resolves a tariff, for the vectorized converters.
+
+    Parameters:
+    - tariff_code (str): The tariff code.
+
+    Returns:
+    - dict: See energex.get_rules.
+    """
+    tariff = tariffs[tariff_code]
+    return {'variants': [(None, None, tariff['periods'])], 'wrap': True, 'fallback': (1.037869032618134, 5.586606750833143)}
+
 def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     """
     Convert RRP from $/MWh to c/kWh for Evoenergy.
@@ -79,12 +100,7 @@ def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
 
     # Find the applicable period and rate
     for period, start, end, rate in tariff['periods']:
-        if start <= interval_time < end:
-            total_price = rrp_c_kwh + rate
-            return total_price
-
-        # Handle overnight periods (e.g., 22:00 to 07:00)
-        if start > end and (interval_time >= start or interval_time < end):
+        if in_period(interval_time, start, end):
             total_price = rrp_c_kwh + rate
             return total_price
 
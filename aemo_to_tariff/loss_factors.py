@@ -0,0 +1,242 @@
+# aemo_to_tariff/loss_factors.py
+import csv
+import re
+
+import numpy as np
+
+from aemo_to_tariff.batch import to_utc_micros
+from aemo_to_tariff.nemweb import open_text_sources
+
+# Loss factors change on 1 July in market time, which is always UTC+10
+MARKET_TIME_OFFSET_MICROS = 10 * 3600 * 1_000_000
+
+# DNSP names as AEMO publishes them -> network names used by spot_to_tariff()
+DNSP_NAMES = {
+    'energex': 'energex',
+    'ausgrid': 'ausgrid',
+    'endeavour energy': 'endeavour',
+    'endeavour': 'endeavour',
+    'evoenergy': 'evoenergy',
+    'actewagl': 'evoenergy',
+    'sa power networks': 'sapn',
+    'sapn': 'sapn',
+    'tasnetworks': 'tasnetworks',
+    'powercor': 'powercor',
+}
+
+# Header names (upper case, letters and digits only) AEMO uses for each column
+_DNSP_COLUMNS = ('DNSP', 'DISTRIBUTOR', 'PARTICIPANTID', 'NETWORK')
+_DLF_CODE_COLUMNS = ('DLFCODE',)
+_TNI_COLUMNS = ('TNI', 'TNICODE', 'CONNECTIONPOINTID')
+_VALUE_COLUMNS = ('DISTRIBUTIONLOSSFACTOR', 'TRANSMISSIONLOSSFACTOR', 'LOSSFACTOR', 'DLF', 'MLF', 'VALUE')
+_YEAR_COLUMNS = ('FINANCIALYEAR', 'EFFECTIVEDATE')
+_FINANCIAL_YEAR = re.compile(r'(?:FY)?\s*(\d{4})\s*[-/]\s*(\d{2}|\d{4})')
+
+
+def financial_years(times):
+    """
+    Get the financial year of interval times, by the year it starts in (2024 for 2024-25).
+
+    Parameters:
+    - times: Interval times, see batch.to_utc_micros().
+
+    Returns:
+    - numpy.ndarray: int64 years.
+    """
+    market = (to_utc_micros(times) + MARKET_TIME_OFFSET_MICROS).astype('datetime64[us]')
+    months = market.astype('datetime64[M]').astype(np.int64)
+    return months // 12 + 1970 - (months % 12 < 6)
+
+def _financial_year(text):
+    match = _FINANCIAL_YEAR.search(text.upper())
+    if match:
+        return int(match.group(1))
+    # An effective date, e.g. '2024/07/01 00:00:00'
+    day = np.datetime64(text.strip()[:10].replace('/', '-'), 'D')
+    return int(financial_years(np.array([day], dtype='datetime64[us]'))[0])
+
+def _column(header, names):
+    for name in names:
+        if name in header:
+            return header[name]
+    return None
+
+def _dnsp(name):
+    name = name.strip().lower()
+    return DNSP_NAMES.get(name, name)
+
+
+class _Table:
+    """One kind of loss factor: sorted keys by financial years, NaN where not published."""
+    __slots__ = ('keys', 'years', 'values')
+
+    def __init__(self, entries):
+        self.keys = np.array(sorted({key for key, _ in entries}), dtype=str)
+        self.years = np.array(sorted({year for _, year in entries}), dtype=np.int64)
+        self.values = np.full((len(self.keys), len(self.years)), np.nan)
+        if entries:
+            pairs = list(entries)
+            rows = np.searchsorted(self.keys, np.array([key for key, _ in pairs], dtype=str))
+            columns = np.searchsorted(self.years, np.array([year for _, year in pairs], dtype=np.int64))
+            self.values[rows, columns] = [entries[pair] for pair in pairs]
+
+    def lookup(self, keys, years, kind):
+        keys, years = np.broadcast_arrays(np.asarray(keys, dtype=str), np.asarray(years, dtype=np.int64))
+        rows = np.searchsorted(self.keys, keys)
+        columns = np.searchsorted(self.years, years)
+        found = (rows < len(self.keys)) & (columns < len(self.years))
+        if found.any():
+            rows, columns = np.where(found, rows, 0), np.where(found, columns, 0)
+            found &= (self.keys[rows] == keys) & (self.years[columns] == years)
+            values = np.where(found, self.values[rows, columns], np.nan)
+        else:
+            values = np.full(keys.shape, np.nan)
+
+        missing = np.flatnonzero(np.isnan(values).ravel())
+        if len(missing):
+            key, year = keys.ravel()[missing[0]], int(years.ravel()[missing[0]])
+            raise ValueError(f"No {kind} for {key} in {year}-{(year + 1) % 100:02d}")
+        return values
+
+
+class LossFactors:
+    """
+    Distribution loss factors by DNSP and DLF code, and marginal loss factors by
+    transmission node (TNI), for each financial year.
+
+    Loaded factors are kept as sorted key arrays by financial year, so resolving the
+    factors of many sites or intervals is a pair of numpy.searchsorted() calls rather
+    than a dictionary lookup each.
+    """
+
+    def __init__(self):
+        self._entries = {'dlf': {}, 'mlf': {}}
+        self._tables = {}
+
+    def add_dlf(self, dnsp: str, code: str, financial_year: int, value: float):
+        """
+        Add a distribution loss factor.
+
+        Parameters:
+        - dnsp (str): The network (e.g. 'Energex', or AEMO's 'SA Power Networks').
+        - code (str): The DLF code.
+        - financial_year (int): The year the financial year starts in.
+        - value (float): The loss factor.
+        """
+        self._entries['dlf'][(f"{_dnsp(dnsp)}/{code.strip().upper()}", int(financial_year))] = float(value)
+        self._tables.pop('dlf', None)
+
+    def add_mlf(self, tni: str, financial_year: int, value: float):
+        """
+        Add a marginal loss factor.
+
+        Parameters:
+        - tni (str): The transmission node identity.
+        - financial_year (int): The year the financial year starts in.
+        - value (float): The loss factor.
+        """
+        self._entries['mlf'][(tni.strip().upper(), int(financial_year))] = float(value)
+        self._tables.pop('mlf', None)
+
+    def load_csv(self, source):
+        """
+        Load loss factors from AEMO's published CSV files.
+
+        Either layout AEMO uses is read: one row per DLF code or TNI with a column per
+        financial year (headers like '2024-25' or 'FY2024-25 MLF'), or one row per factor
+        with a financial year or effective date column, including the C/I/D layout of
+        MMS data files. DLF files have DNSP and DLF code columns; MLF files have a TNI
+        (or CONNECTIONPOINTID) column.
+
+        Parameters:
+        - source: A path or binary file object for a .csv or .zip file.
+
+        Returns:
+        - int: The number of factors loaded.
+        """
+        loaded = 0
+        for stream in open_text_sources(source):
+            header = None
+            for row in csv.reader(stream):
+                if not row or not any(cell.strip() for cell in row) or row[0] == 'C':
+                    continue
+                mms = row[0] in ('I', 'D')
+                if header is None or (mms and row[0] == 'I'):
+                    header = {re.sub(r'[^A-Z0-9]', '', name.upper()): i for i, name in enumerate(row)}
+                    years = {i: _financial_year(name) for i, name in enumerate(row) if _FINANCIAL_YEAR.search(name.upper())}
+                    dnsp_column = _column(header, _DNSP_COLUMNS)
+                    code_column = _column(header, _DLF_CODE_COLUMNS)
+                    tni_column = _column(header, _TNI_COLUMNS)
+                    value_column = _column(header, _VALUE_COLUMNS)
+                    year_column = _column(header, _YEAR_COLUMNS)
+                    if code_column is None and tni_column is None:
+                        header = None
+                    continue
+
+                if mms and row[0] != 'D':
+                    continue
+                cells = years.items() if year_column is None else [(value_column, _financial_year(row[year_column]))]
+                for column, year in cells:
+                    if column is None or column >= len(row) or not row[column].strip():
+                        continue
+                    value = float(row[column])
+                    if code_column is not None:
+                        self.add_dlf(row[dnsp_column], row[code_column], year, value)
+                    else:
+                        self.add_mlf(row[tni_column], year, value)
+                    loaded += 1
+        return loaded
+
+    def _table(self, kind):
+        table = self._tables.get(kind)
+        if table is None:
+            table = self._tables[kind] = _Table(self._entries[kind])
+        return table
+
+    def dlf(self, dnsp, code, financial_year):
+        """
+        Look up distribution loss factors.
+
+        Parameters:
+        - dnsp: The network, or an array of networks.
+        - code: The DLF code, or an array of codes.
+        - financial_year: Financial years (see financial_years()), broadcast against the codes.
+
+        Returns:
+        - numpy.ndarray: The loss factors. Raises ValueError if any isn't known.
+        """
+        # AEMO's DNSP names are mapped once per distinct name, not per site
+        names, inverse = np.unique(np.char.lower(np.char.strip(np.asarray(dnsp, dtype=str))), return_inverse=True)
+        dnsp = np.array([DNSP_NAMES.get(name, name) for name in names.tolist()], dtype=str)[inverse]
+        keys = np.char.add(np.char.add(dnsp, '/'), np.char.upper(np.char.strip(np.asarray(code, dtype=str))))
+        return self._table('dlf').lookup(keys, financial_year, 'DLF')
+
+    def mlf(self, tni, financial_year):
+        """
+        Look up marginal loss factors.
+
+        Parameters:
+        - tni: The transmission node identity, or an array of them.
+        - financial_year: Financial years (see financial_years()), broadcast against the TNIs.
+
+        Returns:
+        - numpy.ndarray: The loss factors. Raises ValueError if any isn't known.
+        """
+        keys = np.char.upper(np.char.strip(np.asarray(tni, dtype=str)))
+        return self._table('mlf').lookup(keys, financial_year, 'MLF')
+
+
+def load_loss_factors(*sources):
+    """
+    Build a LossFactors from AEMO's DLF and MLF files, see LossFactors.load_csv().
+
+    Parameters:
+    - sources: Paths or binary file objects.
+
+    Returns:
+    - LossFactors: The loaded factors.
+    """
+    factors = LossFactors()
+    for source in sources:
+        factors.load_csv(source)
+    return factors
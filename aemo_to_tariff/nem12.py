@@ -0,0 +1,96 @@
+# aemo_to_tariff/nem12.py
+import csv
+from collections import namedtuple
+
+import numpy as np
+
+from aemo_to_tariff.nemweb import open_text_sources
+
+# Energy units found in NEM12 200 records, as multipliers to kWh
+ENERGY_UNITS = {'KWH': 1.0, 'WH': 0.001, 'MWH': 1000.0}
+# NEM12 interval dates are in market time, UTC+10, unless the file's provider says otherwise
+NEM_TIME_OFFSET_MINUTES = 600
+
+# One 300 record: a day of interval values for a NMI data stream, with any 400 events
+# (first interval, last interval, quality method) that qualify it
+IntervalDay = namedtuple('IntervalDay', ['nmi', 'suffix', 'uom', 'interval_length', 'date', 'values', 'quality', 'events'])
+# Every interval read for a NMI data stream; start is UTC datetime64[m] of each interval start
+MeterSeries = namedtuple('MeterSeries', ['nmi', 'suffix', 'interval_length', 'start', 'kwh'])
+
+
+def read_nem12(source):
+    """
+    Stream the interval data days from a NEM12 file.
+
+    Parameters:
+    - source: A path or binary file object for a NEM12 file, or a zip of them.
+
+    Yields:
+    - IntervalDay: One per 300 record, with its 400 events attached.
+    """
+    for stream in open_text_sources(source):
+        nmi = suffix = uom = None
+        interval_length = 30
+        day = None
+
+        for row in csv.reader(stream):
+            if not row:
+                continue
+            record = row[0]
+            if record == '400' and day is not None:
+                day.events.append((int(row[1]), int(row[2]), row[3]))
+                continue
+            if day is not None:
+                yield day
+                day = None
+
+            if record == '200':
+                nmi, suffix, uom = row[1], row[4], row[7].upper()
+                interval_length = int(row[8])
+            elif record == '300':
+                count = 1440 // interval_length
+                values = np.array(row[2:2 + count], dtype=float)
+                quality = row[2 + count] if len(row) > 2 + count else ''
+                day = IntervalDay(nmi, suffix, uom, interval_length, row[1], values, quality, [])
+
+        if day is not None:
+            yield day
+
+def _interval_starts(date: str, interval_length: int, utc_offset_minutes: int):
+    midnight = np.datetime64(f"{date[:4]}-{date[4:6]}-{date[6:8]}", 'm')
+    return midnight + np.arange(0, 1440, interval_length) - utc_offset_minutes
+
+def read_series(source, suffixes='E', utc_offset_minutes: int = NEM_TIME_OFFSET_MINUTES):
+    """
+    Stream whole energy series per NMI data stream from a NEM12 file.
+
+    NEM12 files group records by NMI, so only one NMI's data is held at a time.
+
+    Parameters:
+    - source: A path or binary file object for a NEM12 file, or a zip of them.
+    - suffixes (str or tuple): NMI suffix prefixes to read, e.g. 'E' for consumption, 'B' for export.
+    - utc_offset_minutes (int): The offset of the file's interval dates from UTC.
+
+    Yields:
+    - MeterSeries: Interval start times (UTC) and energy in kWh for one NMI and suffix.
+    """
+    suffixes = tuple(suffixes) if not isinstance(suffixes, str) else (suffixes,)
+    current_nmi = None
+    pending = {}
+
+    def flush():
+        for (nmi, suffix, interval_length), (starts, kwh) in pending.items():
+            yield MeterSeries(nmi, suffix, interval_length, np.concatenate(starts), np.concatenate(kwh))
+        pending.clear()
+
+    for day in read_nem12(source):
+        if day.nmi != current_nmi:
+            yield from flush()
+            current_nmi = day.nmi
+        if not day.suffix.startswith(suffixes) or day.uom not in ENERGY_UNITS:
+            continue
+        starts, kwh = pending.setdefault((day.nmi, day.suffix, day.interval_length), ([], []))
+        starts.append(_interval_starts(day.date, day.interval_length, utc_offset_minutes))
+        kwh.append(day.values * ENERGY_UNITS[day.uom])
+
+    yield from flush()
@@ -0,0 +1,160 @@
+# aemo_to_tariff/nemweb.py
+import csv
+import io
+import zipfile
+from collections import namedtuple
+
+import numpy as np
+
+from aemo_to_tariff.converter import get_converter
+
+# MMS (report type, sub type) records that carry REGIONID, SETTLEMENTDATE and RRP
+DISPATCH_PRICE = ('DISPATCH', 'PRICE')
+PUBLIC_PRICES = ('DREGION', '')
+TRADING_PRICE = ('TRADING', 'PRICE')
+DEFAULT_REPORTS = (DISPATCH_PRICE, PUBLIC_PRICES)
+
+# SETTLEMENTDATE is in market time, which is always UTC+10
+NEM_TIME_OFFSET = np.timedelta64(10, 'h')
+# SETTLEMENTDATE is the end of a dispatch interval; prices apply from its start
+DISPATCH_INTERVAL = np.timedelta64(5, 'm')
+
+# One region's converted prices for one network/tariff; times are UTC datetime64 interval starts
+PriceChunk = namedtuple('PriceChunk', ['region', 'network', 'tariff', 'interval_time', 'rrp', 'price'])
+PriceRow = namedtuple('PriceRow', ['region', 'network', 'tariff', 'interval_time', 'rrp', 'price'])
+
+
+def open_text_sources(source):
+    """
+    Yield a text stream for a file, or for each file inside a (possibly nested) zip.
+
+    Zip members are read in name order without extracting them to disk.
+
+    Parameters:
+    - source: A path or binary file object.
+
+    Yields:
+    - io.TextIOWrapper: One stream per file.
+    """
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        with open(source, 'rb') as handle:
+            yield from open_text_sources(handle)
+        return
+
+    if zipfile.is_zipfile(source):
+        source.seek(0)
+        with zipfile.ZipFile(source) as archive:
+            for name in sorted(archive.namelist()):
+                if name.endswith('/'):
+                    continue
+                with archive.open(name) as member:
+                    if name.lower().endswith('.zip'):
+                        yield from open_text_sources(member)
+                    else:
+                        yield io.TextIOWrapper(member, encoding='ascii', errors='replace', newline='')
+        return
+
+    source.seek(0)
+    yield io.TextIOWrapper(source, encoding='ascii', errors='replace', newline='')
+
+def read_prices(source, regions=None, reports=DEFAULT_REPORTS):
+    """
+    Stream (settlement date, region, rrp) rows from AEMO MMS price files.
+
+    Reads the C/I/D layout used by NEMweb DISPATCHIS and PUBLIC_PRICES files straight
+    out of (possibly nested) zip archives, one row at a time. Intervention reruns are
+    skipped.
+
+    Parameters:
+    - source: A path or binary file object for a .csv or .zip file.
+    - regions (iterable): Region IDs to keep (e.g. 'QLD1'), or None for all.
+    - reports (iterable): (report type, sub type) records to read.
+
+    Yields:
+    - tuple: (settlement date 'YYYY/MM/DD HH:MM:SS' in market time, region ID, RRP in $/MWh).
+    """
+    regions = None if regions is None else set(regions)
+    reports = set(reports)
+
+    for stream in open_text_sources(source):
+        columns = {}
+        for row in csv.reader(stream):
+            if not row:
+                continue
+            if row[0] == 'I':
+                if (row[1], row[2]) in reports:
+                    header = {name: i for i, name in enumerate(row)}
+                    columns[(row[1], row[2])] = (header['SETTLEMENTDATE'], header['REGIONID'], header['RRP'],
+                                                 header.get('INTERVENTION'))
+            elif row[0] == 'D':
+                found = columns.get((row[1], row[2]))
+                if found is None:
+                    continue
+                date_column, region_column, rrp_column, intervention_column = found
+                region = row[region_column]
+                if regions is not None and region not in regions:
+                    continue
+                if intervention_column is not None and row[intervention_column] not in ('0', ''):
+                    continue
+                yield row[date_column], region, float(row[rrp_column])
+
+def _interval_times(strings):
+    """Parse market-time SETTLEMENTDATE strings (interval ends) to UTC datetime64 interval starts."""
+    local = np.char.replace(np.asarray(strings, dtype=str), '/', '-').astype('datetime64[s]')
+    return local - NEM_TIME_OFFSET - DISPATCH_INTERVAL
+
+def iter_price_chunks(sources, regions, chunk_size: int = 8192, reports=DEFAULT_REPORTS):
+    """
+    Convert AEMO price files to network tariff prices, a chunk at a time.
+
+    Memory use is bounded by chunk_size rows per region whatever the size of the files.
+    Each price is applied from the start of its 5-minute interval, one dispatch
+    interval before its SETTLEMENTDATE.
+
+    Parameters:
+    - sources: A path or file object, or a list of them, see read_prices().
+    - regions (dict): Region ID -> list of (network, tariff) or (network, tariff, dlf, mlf, market)
+      to price, e.g. {'QLD1': [('energex', '6900')], 'SA1': [('sapn', 'RTOU')]}.
+    - chunk_size (int): Rows per region converted in one batch call.
+    - reports (iterable): (report type, sub type) records to read.
+
+    Yields:
+    - PriceChunk: Prices in c/kWh for one region, network and tariff.
+    """
+    if isinstance(sources, (str, bytes)) or hasattr(sources, '__fspath__') or hasattr(sources, 'read'):
+        sources = [sources]
+
+    converters = {
+        region: [(entry[0], entry[1], get_converter(*entry)) for entry in entries]
+        for region, entries in regions.items()
+    }
+    pending = {region: ([], []) for region in regions}
+
+    def flush(region):
+        dates, rrps = pending[region]
+        if not dates:
+            return
+        interval_time = _interval_times(dates)
+        rrp = np.array(rrps, dtype=float)
+        pending[region] = ([], [])
+        for network, tariff, converter in converters[region]:
+            yield PriceChunk(region, network, tariff, interval_time, rrp, converter.convert_many(interval_time, rrp))
+
+    for source in sources:
+        for settlement_date, region, rrp in read_prices(source, regions, reports):
+            dates, rrps = pending[region]
+            dates.append(settlement_date)
+            rrps.append(rrp)
+            if len(dates) >= chunk_size:
+                yield from flush(region)
+
+    for region in regions:
+        yield from flush(region)
+
+def iter_prices(sources, regions, chunk_size: int = 8192, reports=DEFAULT_REPORTS):
+    """
+    Like iter_price_chunks(), but yield one PriceRow per interval, network and tariff.
+    """
+    for chunk in iter_price_chunks(sources, regions, chunk_size, reports):
+        for interval_time, rrp, price in zip(chunk.interval_time.tolist(), chunk.rrp.tolist(), chunk.price.tolist()):
+            yield PriceRow(chunk.region, chunk.network, chunk.tariff, interval_time, rrp, price)
@@ -0,0 +1,26 @@
+# aemo_to_tariff/periods.py
+from datetime import time
+
+# Tariff periods written as ending at 23:59 run until midnight
+LAST_MINUTE = time(23, 59)
+
+
+def in_period(interval_time: time, start: time, end: time, wrap: bool = True):
+    """
+    Check whether a local time of day falls in a tariff period, reading the period the
+    same way slots.compile_tariff() does.
+
+    Parameters:
+    - interval_time (time): The local time of day.
+    - start (time): The start of the period.
+    - end (time): The end of the period (exclusive); 23:59 means midnight.
+    - wrap (bool): Whether a period with start > end crosses midnight.
+
+    Returns:
+    - bool: True if the period applies. A period whose start equals its end covers the whole day.
+    """
+    if start == end:
+        return True
+    if start < end:
+        return start <= interval_time and (end == LAST_MINUTE or interval_time < end)
+    return wrap and (interval_time >= start or interval_time < end)
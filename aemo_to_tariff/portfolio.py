@@ -0,0 +1,166 @@
+# aemo_to_tariff/portfolio.py
+from collections.abc import Mapping
+
+import numpy as np
+
+from aemo_to_tariff.batch import to_utc_micros, versioned_rates
+from aemo_to_tariff.loss_factors import financial_years
+
+SITE_COLUMNS = ('network', 'tariff', 'dlf', 'mlf')
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class Portfolio:
+    """
+    A table of sites priced against shared spot price series.
+
+    Sites are grouped by (network, tariff) and, when prices are per region, by region.
+    Each group's rates come from versioned_rates(), which splits the intervals by tariff
+    version, so the slot lookup is done once per group rather than once per site; a
+    site's price is then its own loss factors times the group's scaled spot price plus
+    the group's network rate, one vectorized multiply-add.
+
+    Sites with 'dlf_code' or 'tni' columns take their loss factors from a
+    loss_factors.LossFactors, resolved once per site and financial year.
+    """
+    __slots__ = ('sites', 'intervals', 'group_of_site', 'groups', 'factor', '_year_of_interval', '_scaled', '_intercept')
+
+    def __init__(self, sites, times, rrps, dlf=1.05905, mlf=1.0154, market=1.0154, loss_factors=None):
+        """
+        Parameters:
+        - sites: A sequence of (network, tariff, dlf, mlf) rows (dlf and mlf may be left
+          off), or a mapping of columns 'network', 'tariff' and optionally 'dlf', 'mlf',
+          'dlf_code', 'tni' and 'region'.
+        - times: Interval times shared by every site, see batch.to_utc_micros().
+        - rrps: Spot prices in $/MWh per interval, or a mapping of region ID -> prices
+          when the sites have a 'region' column.
+        - dlf, mlf (float): Loss factors for sites that don't give their own.
+        - market (float): The market factor.
+        - loss_factors (LossFactors): Where to find the factors of sites' DLF codes and TNIs.
+        """
+        columns = sites if isinstance(sites, Mapping) else None
+        network, tariff, site_dlf, site_mlf, region = _site_columns(sites, dlf, mlf)
+        utc_micros = to_utc_micros(times)
+        self.sites = len(network)
+        self.intervals = len(utc_micros)
+
+        # Loss factors per site and financial year; one column unless a site's factors change mid-series
+        coded = columns is not None and ('dlf_code' in columns or 'tni' in columns)
+        if coded:
+            if loss_factors is None:
+                raise ValueError("Sites with DLF codes or TNIs need loss_factors")
+            years, self._year_of_interval = np.unique(financial_years(utc_micros.astype('datetime64[us]')), return_inverse=True)
+            site_dlf, site_mlf = site_dlf[:, None], site_mlf[:, None]
+            if 'dlf_code' in columns:
+                site_dlf = loss_factors.dlf(network[:, None], np.asarray(columns['dlf_code'], dtype=str)[:, None], years)
+            if 'tni' in columns:
+                site_mlf = loss_factors.mlf(np.asarray(columns['tni'], dtype=str)[:, None], years)
+            self.factor = np.broadcast_to(site_dlf * site_mlf, (self.sites, len(years)))
+        else:
+            self._year_of_interval = None
+            self.factor = (site_dlf * site_mlf)[:, None]
+
+        if region is None:
+            if isinstance(rrps, Mapping):
+                raise ValueError("Prices by region need a 'region' column in the sites")
+            keys = (network, tariff)
+        else:
+            keys = (network, tariff, region)
+        first, self.group_of_site = _group(keys, self.sites)
+        self.groups = [tuple(column[i] for column in keys) for i in first.tolist()]
+
+        shared = None if isinstance(rrps, Mapping) else np.asarray(rrps, dtype=float) * market / 10
+        self._scaled = np.empty((len(self.groups), self.intervals))
+        self._intercept = np.empty((len(self.groups), self.intervals))
+        rates = {}
+        for g, group in enumerate(self.groups):
+            group_network, group_tariff = group[0], group[1]
+            if (group_network, group_tariff) not in rates:
+                rates[group_network, group_tariff] = versioned_rates(group_network, group_tariff, utc_micros)
+            slope, self._intercept[g] = rates[group_network, group_tariff]
+            rrp = shared if shared is not None else np.asarray(rrps[group[2]], dtype=float) * market / 10
+            self._scaled[g] = rrp * slope
+
+    def prices(self, sites=None):
+        """
+        Get delivered prices for sites.
+
+        Parameters:
+        - sites: Site indexes (an array, list or slice); every site if None.
+
+        Returns:
+        - numpy.ndarray: Prices in c/kWh, shape (sites, intervals).
+        """
+        if sites is None:
+            sites = slice(None)
+        groups = self.group_of_site[sites]
+        factor = self.factor[sites]
+        if self._year_of_interval is not None and factor.shape[1] > 1:
+            factor = factor[:, self._year_of_interval.reshape(-1)]
+        return factor * self._scaled[groups] + self._intercept[groups]
+
+    def iter_prices(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Yield each site's prices in site order, pricing chunk_size sites at a time.
+
+        Yields:
+        - tuple: (site index, numpy.ndarray of prices in c/kWh per interval).
+        """
+        for start in range(0, self.sites, chunk_size):
+            block = self.prices(slice(start, start + chunk_size))
+            for offset, row in enumerate(block):
+                yield start + offset, row
+
+
+def _site_columns(sites, dlf, mlf):
+    if isinstance(sites, Mapping):
+        columns = sites
+    else:
+        rows = list(sites)
+        columns = dict(zip(SITE_COLUMNS, zip(*rows))) if rows else {'network': (), 'tariff': ()}
+
+    network = np.char.lower(np.asarray(columns['network'], dtype=str))
+    tariff = np.asarray(columns['tariff'], dtype=str)
+    if len(tariff) != len(network):
+        raise ValueError("Every site needs a network and a tariff")
+    count = len(network)
+    site_dlf = np.broadcast_to(np.asarray(columns.get('dlf', dlf), dtype=float), (count,))
+    site_mlf = np.broadcast_to(np.asarray(columns.get('mlf', mlf), dtype=float), (count,))
+    region = columns.get('region')
+    if region is not None:
+        region = np.asarray(region, dtype=str)
+    return network, tariff, site_dlf, site_mlf, region
+
+def _group(columns, count):
+    """The first site of each distinct row of columns, and each site's group."""
+    codes = np.zeros(count, dtype=np.int64)
+    for column in columns:
+        values, inverse = np.unique(column, return_inverse=True)
+        codes = codes * len(values) + inverse.reshape(-1)
+    _, first, group_of_site = np.unique(codes, return_index=True, return_inverse=True)
+    return first, group_of_site.reshape(-1)
+
+def portfolio_prices(sites, times, rrps, dlf=1.05905, mlf=1.0154, market=1.0154, loss_factors=None):
+    """
+    Convert spot prices to delivered prices for every site of a portfolio, see Portfolio.
+
+    Parameters:
+    - sites: The site table, see Portfolio.
+    - times: Interval times shared by every site.
+    - rrps: Spot prices in $/MWh per interval, or a mapping of region ID -> prices.
+    - dlf, mlf (float): Loss factors for sites that don't give their own.
+    - market (float): The market factor.
+    - loss_factors (LossFactors): Where to find the factors of sites' DLF codes and TNIs.
+
+    Returns:
+    - numpy.ndarray: Prices in c/kWh, shape (sites, intervals).
+    """
+    return Portfolio(sites, times, rrps, dlf, mlf, market, loss_factors).prices()
+
+def iter_portfolio_prices(sites, times, rrps, dlf=1.05905, mlf=1.0154, market=1.0154, loss_factors=None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Like portfolio_prices(), but yield (site index, prices) one site at a time, so a
+    large portfolio never needs the whole matrix in memory.
+    """
+    yield from Portfolio(sites, times, rrps, dlf, mlf, market, loss_factors).iter_prices(chunk_size)
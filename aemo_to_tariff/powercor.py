@@ -3,29 +3,43 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 from datetime import time
 
+from aemo_to_tariff.periods import in_period
+from aemo_to_tariff.tariff_store import approved_prices
+from aemo_to_tariff.versions import CURRENT_EFFECTIVE_FROM
+
 def time_zone():
     return 'Australia/Melbourne'
 
 
-tariffs = {
-    'D1': {
-        'name': 'Residential Single Rate',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 9.6700)
-        ]
-    },
-    'PRTOU': {
-        'name': 'Residential TOU',
-        'periods': [
-            ('Off-peak', time(0, 0), time(16, 0), 4.8700),
-            ('Peak', time(16, 0), time(21, 0), 18.3400),
-            ('Off-peak', time(21, 0), time(23, 59), 4.8700),
-        ]
-    }
+# Each tariff's periods, as (name, start, end, the workbook price it charges). Rates and
+# daily fees are the AER approved prices in the tariff store (see aer_import.py).
+_tariff_periods = {
+    'D1': ('Residential Single Rate', [('Anytime', time(0, 0), time(23, 59), 'Anytime')]),
+    'PRTOU': ('Residential TOU', [
+        ('Off-peak', time(0, 0), time(16, 0), 'Off-peak'),
+        ('Peak', time(16, 0), time(21, 0), 'Peak'),
+        ('Off-peak', time(21, 0), time(23, 59), 'Off-peak'),
+    ]),
 }
 
+def _approved_tables():
+    """Build the tariffs and daily_fees tables from the tariff store."""
+    tariffs, daily_fees = {}, {}
+    for code, (name, periods) in _tariff_periods.items():
+        prices = approved_prices('powercor', code, CURRENT_EFFECTIVE_FROM)
+        tariffs[code] = {
+            'name': name,
+            'periods': [(period, start, end, prices['energy'][label]) for period, start, end, label in periods],
+        }
+        daily_fees[code] = prices['fixed'].get('Fixed', 0.0)
+    return tariffs, daily_fees
+
+
+# Daily fees in $/day
+tariffs, daily_fees = _approved_tables()
+
 def get_daily_fee(tariff_code: str):
-    return 39.7300
+    return daily_fees.get(tariff_code, 0.0)
 
 def get_periods(tariff_code: str):
     tariff = tariffs.get(tariff_code)
@@ -34,6 +48,19 @@ def get_periods(tariff_code: str):
 
     return tariff['periods']
 
+def get_rules(tariff_code: str):
+    """
+    Describe how convert() resolves a tariff, for the vectorized converters.
+
+    Parameters:
+    - tariff_code (str): The tariff code.
+
+    Returns:
+    - dict: See energex.get_rules.
+    """
+    tariff = tariffs[tariff_code]
+    return {'variants': [(None, None, tariff['periods'])], 'wrap': True, 'fallback': (1.037869032618134, 5.586606750833143)}
+
 def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     """
     Convert RRP from $/MWh to c/kWh for Powercor.
@@ -53,12 +80,7 @@ def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
 
     # Find the applicable period and rate
     for period, start, end, rate in tariff['periods']:
-        if start <= interval_time < end:
-            total_price = rrp_c_kwh + rate
-            return total_price
-
-        # Handle overnight periods (e.g., 22:00 to 07:00)
-        if start > end and (interval_time >= start or interval_time < end):
+        if in_period(interval_time, start, end):
             total_price = rrp_c_kwh + rate
             return total_price
 
@@ -0,0 +1,101 @@
+# aemo_to_tariff/registry.py
+import importlib
+from functools import lru_cache
+
+# Third-party packages can add networks with an entry point in this group, e.g. in setup.py:
+#   entry_points={'aemo_to_tariff.networks': ['mydnsp = mydnsp.tariffs']}
+# The target is a module laid out like aemo_to_tariff.energex.
+ENTRY_POINT_GROUP = 'aemo_to_tariff.networks'
+
+# Network name -> module path; modules are only imported when first used
+NETWORKS = {
+    'energex': 'aemo_to_tariff.energex',
+    'ausgrid': 'aemo_to_tariff.ausgrid',
+    'evoenergy': 'aemo_to_tariff.evoenergy',
+    'sapn': 'aemo_to_tariff.sapower',
+    'tasnetworks': 'aemo_to_tariff.tasnetworks',
+    'endeavour': 'aemo_to_tariff.endeavour',
+    'powercor': 'aemo_to_tariff.powercor',
+    'victoria': 'aemo_to_tariff.victoria',
+}
+
+_providers = {}
+_entry_points_loaded = False
+
+
+def register_network(name: str, provider):
+    """
+    Register a network provider.
+
+    Parameters:
+    - name (str): The network name used in spot_to_tariff() etc. (case-insensitive).
+    - provider: A module (or module path) with time_zone(), tariffs, get_rules(), convert()
+      and get_periods(), and optionally get_daily_fee() and calculate_demand_fee().
+    """
+    name = name.lower()
+    if isinstance(provider, str):
+        NETWORKS[name] = provider
+        _providers.pop(name, None)
+    else:
+        _providers[name] = provider
+
+def entry_points():
+    # importlib.metadata is slow to import, so it is only loaded for unknown network names
+    from importlib.metadata import entry_points
+    return entry_points()
+
+def _load_entry_points():
+    global _entry_points_loaded
+    _entry_points_loaded = True
+
+    found = entry_points()
+    if hasattr(found, 'select'):
+        found = found.select(group=ENTRY_POINT_GROUP)
+    else:
+        # Python 3.8 and 3.9 return a dict of groups
+        found = found.get(ENTRY_POINT_GROUP, [])
+
+    for entry_point in found:
+        if entry_point.name.lower() not in NETWORKS:
+            NETWORKS[entry_point.name.lower()] = entry_point
+
+def get_network(network: str):
+    """
+    Get the provider module for a network, importing it on first use.
+
+    Parameters:
+    - network (str): The name of the network (e.g., 'Energex', 'Ausgrid', 'Evoenergy').
+
+    Returns:
+    - module: The network's provider module.
+    """
+    name = network.lower()
+    provider = _providers.get(name)
+    if provider is not None:
+        return provider
+
+    if name not in NETWORKS and not _entry_points_loaded:
+        _load_entry_points()
+    if name not in NETWORKS:
+        raise ValueError(f"Unknown network: {network}")
+
+    target = NETWORKS[name]
+    provider = importlib.import_module(target) if isinstance(target, str) else target.load()
+    _providers[name] = provider
+    return provider
+
+def network_names():
+    """
+    List the names of every known network, including ones added by entry points.
+    """
+    if not _entry_points_loaded:
+        _load_entry_points()
+    return sorted(set(NETWORKS) | set(_providers))
+
+@lru_cache(maxsize=None)
+def accepts(function, parameter: str):
+    """
+    Check whether a provider function takes a given parameter.
+    """
+    import inspect
+    return parameter in inspect.signature(function).parameters
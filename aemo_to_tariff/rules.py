@@ -0,0 +1,242 @@
+# aemo_to_tariff/rules.py
+import re
+import sys
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from aemo_to_tariff.calendars import HOLIDAY, day_code, state_of
+
+# One line of a tariff: a period's time of day and rate, and the seasons (months), day
+# types (weekdays 0-6 and/or calendars.HOLIDAY) and consumption block it applies in.
+# None matches any. start > end crosses midnight if the tariff wraps; start == end is
+# the whole day. A rule whose rate is None only claims its days, leaving the fallback.
+Rule = namedtuple('Rule', ['period', 'start', 'end', 'rate', 'months', 'days', 'block'], defaults=(None, None, None))
+
+# A tariff's rules, tried in order; the first that matches an interval sets its rate,
+# and fallback (slope, intercept) applies where none does.
+TariffRules = namedtuple('TariffRules', ['rules', 'wrap', 'fallback'])
+
+# Consumption blocks are periods named 'Block 1', 'Block 2', ... (e.g. endeavour N90)
+_BLOCK_NAME = re.compile(r'^block\s*(\d+)$', re.IGNORECASE)
+
+# Where a declared rule and convert() disagree, see differential_check()
+RuleMismatch = namedtuple('RuleMismatch', ['local_time', 'day_code', 'slot', 'expected', 'compiled'])
+
+ALL_DAYS = frozenset(range(HOLIDAY + 1))
+WEEKDAYS = frozenset(range(HOLIDAY))
+
+
+def from_variants(rules: dict):
+    """
+    Translate the rules returned by a network module's get_rules() into declared rules.
+
+    Each variant's periods become rules scoped to exactly the months and days that
+    variant claims (an earlier variant claiming a day hides later ones), and periods
+    named 'Block N' become consumption block N.
+
+    Parameters:
+    - rules (dict): See energex.get_rules.
+
+    Returns:
+    - TariffRules: The same tariff as declared rules.
+    """
+    variants = list(rules['variants'])
+    claimed = np.full((12, HOLIDAY + 1), -1, dtype=np.int16)
+    for index, (months, weekdays, periods) in enumerate(variants):
+        rows = np.arange(12) if months is None else np.asarray(months) - 1
+        cols = np.arange(HOLIDAY) if weekdays is None else np.asarray(weekdays)
+        block = claimed[np.ix_(rows, cols)]
+        claimed[np.ix_(rows, cols)] = np.where(block < 0, index, block)
+
+    declared = []
+    for index, (months, weekdays, periods) in enumerate(variants):
+        for scope_months, scope_days in _rectangles(claimed == index, claimed[:, HOLIDAY] < 0):
+            if not periods:
+                declared.append(Rule(None, time(0, 0), time(0, 0), None, scope_months, scope_days))
+            for period, start, end, rate in periods:
+                match = _BLOCK_NAME.match(period.strip())
+                declared.append(Rule(period, start, end, rate, scope_months, scope_days,
+                                     int(match.group(1)) if match else None))
+    return TariffRules(tuple(declared), rules['wrap'], tuple(rules['fallback']))
+
+def _rectangles(cells, holiday_free):
+    """
+    Split a (12, 8) mask of (month, day) cells into (months, days) scopes, None for all.
+    """
+    scopes = {}
+    for month in range(12):
+        days = frozenset(np.flatnonzero(cells[month]).tolist())
+        if days:
+            scopes.setdefault(days, []).append(month)
+
+    for days, months in scopes.items():
+        # Holidays nobody else claims behave like their weekday, so 'every weekday' can
+        # also cover them
+        if days == ALL_DAYS or (days == WEEKDAYS and holiday_free[months].all()):
+            days = None
+        else:
+            days = tuple(sorted(days))
+        yield (None if len(months) == 12 else tuple(m + 1 for m in months)), days
+
+def blocks(declared: TariffRules):
+    """
+    List the consumption blocks a tariff's rules use, in order; [None] if there are none.
+    """
+    found = sorted({rule.block for rule in declared.rules if rule.block is not None})
+    return found or [None]
+
+def day_type_table(declared: TariffRules, block=None):
+    """
+    Work out which rules can apply on each kind of day.
+
+    A day's rules are those whose months and days include it, in order. Public holidays
+    match rules listing HOLIDAY if any rule lists it in that month, and their weekday's
+    rules otherwise. Days with the same rules share a day type.
+
+    Parameters:
+    - declared (TariffRules): The tariff's rules.
+    - block: The consumption block to price; rules for other blocks are left out. The
+      first block if None.
+
+    Returns:
+    - tuple: (labels, rules per day type, day_types) where day_types is a (12, 7, 2)
+      int8 array indexed by (month - 1, weekday, public holiday).
+    """
+    if block is None:
+        block = blocks(declared)[0]
+    rules = [rule for rule in declared.rules if rule.block is None or rule.block == block]
+
+    cover = np.zeros((len(rules), 12, HOLIDAY + 1), dtype=bool)
+    for i, rule in enumerate(rules):
+        rows = np.arange(12) if rule.months is None else np.asarray(rule.months) - 1
+        cols = np.arange(HOLIDAY + 1) if rule.days is None else np.asarray(rule.days)
+        cover[np.ix_([i], rows, cols)] = True
+
+    # The day column each (month, weekday, holiday) is matched against
+    holiday_column = cover[:, :, HOLIDAY].any(axis=0)
+    column = np.empty((12, HOLIDAY, 2), dtype=np.intp)
+    column[:, :, 0] = np.arange(HOLIDAY)
+    column[:, :, 1] = np.where(holiday_column[:, None], HOLIDAY, np.arange(HOLIDAY))
+    months = np.broadcast_to(np.arange(12)[:, None, None], column.shape)
+
+    keys = cover[:, months, column].reshape(len(rules), months.size).T
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    # Day types in the order their first day appears, so 'January weekdays' comes first
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    day_types = rank[inverse.reshape(-1)].reshape(column.shape).astype(np.int8)
+
+    labels = []
+    day_rules = []
+    for day_type, code in enumerate(first[order].tolist()):
+        day_rules.append([rule for rule, applies in zip(rules, keys[code]) if applies and rule.rate is not None])
+        in_type = (day_types == day_type)
+        cells = np.zeros((12, HOLIDAY + 1), dtype=bool)
+        cells[months[in_type], column[in_type]] = True
+        labels.append(_label(cells) if keys[code].any() else 'unmatched')
+    return labels, day_rules, day_types
+
+def _scope_label(months, days):
+    parts = []
+    if months is not None:
+        parts.append('months ' + ','.join(str(m) for m in months))
+    if days is not None:
+        names = {(5, 6): 'weekends', (0, 1, 2, 3, 4): 'weekdays', (5, 6, HOLIDAY): 'weekends and public holidays',
+                 (HOLIDAY,): 'public holidays'}
+        parts.append(names.get(tuple(days), 'days ' + ','.join(str(d) for d in days)))
+    return ' '.join(parts) or 'any day'
+
+def _label(cells):
+    parts = []
+    for months, days in _rectangles(cells, np.ones(12, dtype=bool)):
+        parts.append(_scope_label(months, None if days is not None and WEEKDAYS <= set(days) else days))
+    return ' or '.join(parts)
+
+def declare(module, tariff_code: str):
+    """
+    Get a network module's tariff as declared rules, see from_variants().
+
+    Parameters:
+    - module: The network module (e.g. aemo_to_tariff.endeavour).
+    - tariff_code (str): The tariff code.
+
+    Returns:
+    - TariffRules: The tariff's rules.
+    """
+    return from_variants(module.get_rules(tariff_code))
+
+def differential_check(module, tariff_code: str, first_day: date, last_day: date, rrp: float = 123.45):
+    """
+    Check a tariff's compiled slot tables against its module's convert().
+
+    Every 5-minute slot of every local day from first_day to last_day is priced by
+    convert(); as compiled prices depend only on a day's code and the slot, each
+    distinct (day code, slot) is priced once, which covers the whole calendar.
+
+    Parameters:
+    - module: The network module.
+    - tariff_code (str): The tariff code.
+    - first_day, last_day (date): The local days to check, inclusive.
+    - rrp (float): The spot price in $/MWh to check at.
+
+    Returns:
+    - list: A RuleMismatch for each slot where the prices differ; empty if they all agree.
+    """
+    from aemo_to_tariff.slots import compile_tariff, SLOTS_PER_DAY, SLOT_MINUTES
+
+    compiled = compile_tariff(module, tariff_code)
+    zone = ZoneInfo(compiled.time_zone)
+    state = state_of(compiled.time_zone)
+    slope, intercept = compiled.slope.ravel().tolist(), compiled.intercept.ravel().tolist()
+    day_types = compiled.day_types.ravel().tolist()
+
+    # Slots still to check for each day code seen
+    unchecked = {}
+    mismatches = []
+    day = first_day - timedelta(days=1)
+    while day < last_day:
+        day += timedelta(days=1)
+        code = day_code(day, state)
+        slots = unchecked.setdefault(code, set(range(SLOTS_PER_DAY)))
+        if not slots:
+            continue
+        midnight = datetime(day.year, day.month, day.day)
+        for slot in sorted(slots):
+            local = (midnight + timedelta(minutes=slot * SLOT_MINUTES)).replace(tzinfo=zone)
+            utc = local.astimezone(timezone.utc)
+            if utc.astimezone(zone).replace(tzinfo=None) != local.replace(tzinfo=None):
+                continue  # Skipped when the clocks go forward
+            slots.discard(slot)
+            index = day_types[code] * SLOTS_PER_DAY + slot
+            expected = module.convert(utc, tariff_code, rrp)
+            found = rrp / 10 * slope[index] + intercept[index]
+            if found != expected:
+                mismatches.append(RuleMismatch(local, code, slot, expected, found))
+    return mismatches
+
+
+def main(argv):
+    first_year = int(argv[1]) if len(argv) > 1 else 2023
+    last_year = int(argv[2]) if len(argv) > 2 else first_year + 3
+    from aemo_to_tariff.registry import get_network, network_names
+
+    failed = 0
+    for network in network_names():
+        module = get_network(network)
+        for tariff_code in module.tariffs:
+            mismatches = differential_check(module, tariff_code, date(first_year, 1, 1), date(last_year, 12, 31))
+            for mismatch in mismatches[:3]:
+                print(f"{network} {tariff_code}: {mismatch.local_time:%Y-%m-%d %H:%M} convert() gives "
+                      f"{mismatch.expected}, the compiled rules {mismatch.compiled}")
+            failed += bool(mismatches)
+    print(f"{failed} tariff(s) differ from convert() in {first_year}-{last_year}" if failed
+          else f"Every tariff matches convert() in {first_year}-{last_year}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
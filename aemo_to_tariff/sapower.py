@@ -2,6 +2,8 @@
 from datetime import time, datetime
 from zoneinfo import ZoneInfo
 
+from aemo_to_tariff.periods import in_period
+
 def time_zone():
     return 'Australia/Adelaide'
 
@@ -53,6 +55,10 @@ tariffs = {
     }
 }
 
+# Daily fees in c/day and demand charges in c/kW/day
+daily_fee_units = 'c/day'
+demand_charge_units = 'c/kW/day'
+
 daily_fees = {
     'RSR': 57.53,
     'RTOU': 57.53,
@@ -63,8 +69,31 @@ daily_fees = {
 }
 
 demand_charges = {
-    'RPRO': 83.39,  # $/kW/day
-    'SBTOUD': 8.42  # $/kW/day
+    'RPRO': 83.39,
+    'SBTOUD': 8.42
+}
+
+# When billed demand is measured, see energex.get_demand_windows()
+demand_windows = {
+    'RPRO': {'demand_kw': {'windows': [(time(17, 0), time(21, 0))], 'weekdays': None, 'method': 'max'}},
+    'SBTOUD': {'demand_kw': {'windows': [(time(17, 0), time(21, 0))], 'weekdays': None, 'method': 'max'}},
+}
+
+def get_demand_windows(tariff_code: str):
+    """
+    Get the demand windows for a given tariff code, see energex.get_demand_windows().
+    """
+    return demand_windows.get(tariff_code)
+
+
+# Export-side network rates in c/kWh, added to the spot price an exporter is paid
+# (negative for an export charge), see slots.export_rules(). These tariffs charge and
+# credit nothing for exports, so exports in their Solar Sponge windows earn the spot
+# price; a two-way tariff is added as a version with its own export_tariffs.
+export_tariffs = {
+    'RTOU': {'name': 'Residential Time of Use', 'periods': [('Solar Sponge', time(10, 0), time(15, 0), 0.0)]},
+    'RPRO': {'name': 'Residential Prosumer', 'periods': [('Solar Sponge', time(10, 0), time(15, 0), 0.0)]},
+    'RELE': {'name': 'Residential Electrify', 'periods': [('Solar Sponge', time(10, 0), time(15, 0), 0.0)]},
 }
 
 
@@ -75,6 +104,23 @@ def get_periods(tariff_code: str):
 
     return tariff['periods']
 
+def get_rules(tariff_code: str):
+    """
+    Describe how convert() resolves a tariff, for the vectorized converters.
+
+    Parameters:
+    - tariff_code (str): The tariff code.
+
+    Returns:
+    - dict: See energex.get_rules.
+    """
+    tariff = tariffs.get(tariff_code)
+
+    if not tariff:
+        return {'variants': [], 'wrap': True, 'fallback': (1.037869032618134, 5.586606750833143)}
+
+    return {'variants': [(None, None, tariff['periods'])], 'wrap': True, 'fallback': (1.0, tariff['periods'][0][3])}
+
 def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     """
     Convert RRP from $/MWh to c/kWh for SA Power Networks.
@@ -100,7 +146,7 @@ def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
 
     # Find the applicable period and rate
     for period, start, end, rate in tariff['periods']:
-        if start <= interval_time < end or (start > end and (interval_time >= start or interval_time < end)):
+        if in_period(interval_time, start, end):
             total_price = rrp_c_kwh + rate
             return total_price
 
@@ -115,7 +161,7 @@ def get_daily_fee(tariff_code: str):
     - tariff_code (str): The tariff code.
 
     Returns:
-    - float: The daily fee in dollars.
+    - float: The daily fee in cents.
     """
     return daily_fees.get(tariff_code, 0.0)
 
@@ -129,7 +175,7 @@ def calculate_demand_fee(tariff_code: str, demand_kw: float, days: int = 30):
     - days (int): The number of days for the billing period (default is 30).
 
     Returns:
-    - float: The demand fee in dollars.
+    - float: The demand fee in cents.
     """
     daily_charge = demand_charges.get(tariff_code, 0.0)
     return daily_charge * demand_kw * days
@@ -0,0 +1,164 @@
+# aemo_to_tariff/schedule.py
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from aemo_to_tariff.calendars import day_calendar, day_code, state_of
+from aemo_to_tariff.slots import compile_tariff, slot_of_day, SLOTS_PER_DAY, SLOT_MINUTES
+from aemo_to_tariff.timezones import transition_index, local_calendar, MICROS_PER_SECOND
+from aemo_to_tariff.versions import version_index
+
+SLOT_SECONDS = SLOT_MINUTES * 60
+SECONDS_PER_DAY = 86_400
+
+# How far ahead next_transition() looks by default
+DEFAULT_HORIZON = timedelta(days=400)
+
+# The rates of every 5-minute interval of one local day. starts are the intervals' UTC
+# start times (datetime64[us]); the price of interval i is rrp_c_kwh * slope[i] + intercept[i].
+# A day has SLOTS_PER_DAY intervals, or an hour's worth fewer or more when the clocks change.
+DayProfile = namedtuple('DayProfile', ['starts', 'slope', 'intercept'])
+
+
+class _Boundaries:
+    """
+    Where one compiled tariff's rate changes within each day type.
+
+    changes[d] is the sorted list of slots whose (slope, intercept) differs from the
+    slot before, so the next change after a slot is one bisect away.
+    """
+    __slots__ = ('compiled', 'slope', 'intercept', 'changes', 'constant')
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.slope = compiled.slope.tolist()
+        self.intercept = compiled.intercept.tolist()
+        differs = (np.diff(compiled.slope, axis=1) != 0) | (np.diff(compiled.intercept, axis=1) != 0)
+        self.changes = [(np.flatnonzero(row) + 1).tolist() for row in differs]
+        same_slope = (compiled.slope == compiled.slope[0, 0]).all()
+        self.constant = bool(same_slope and (compiled.intercept == compiled.intercept[0, 0]).all())
+
+    def day_type(self, code):
+        return int(self.compiled.day_types.flat[code])
+
+    def rate(self, day_type, slot):
+        return self.slope[day_type][slot], self.intercept[day_type][slot]
+
+@lru_cache(maxsize=None)
+def _boundaries(module, tariff_code):
+    return _Boundaries(compile_tariff(module, tariff_code))
+
+def _timestamp(at):
+    if isinstance(at, datetime):
+        return at.timestamp()
+    return float(at)
+
+def next_transition(network: str, tariff: str, at, horizon=DEFAULT_HORIZON):
+    """
+    Find when a tariff's rate next changes.
+
+    The search steps through spans with one local date, UTC offset and tariff version;
+    within each span the next change is a bisect over the day type's change points,
+    so a change later in the day costs O(log n) and one on a later day O(log n) per day.
+
+    Parameters:
+    - network (str): The name of the network.
+    - tariff (str): The tariff code.
+    - at: A datetime (naive ones are local time) or epoch seconds.
+    - horizon (timedelta): How far ahead to look.
+
+    Returns:
+    - datetime: The first instant after at with a different slope or intercept, in UTC;
+      None if the rate doesn't change within the horizon.
+    """
+    versions = version_index(network)
+    start = _timestamp(at)
+    until = start + horizon.total_seconds()
+    zones = {}
+    calendars = {}
+
+    current = None
+    t = start
+    while t < until:
+        module, _, version_to = versions.window(t)
+        boundaries = _boundaries(module, tariff)
+        time_zone = boundaries.compiled.time_zone
+        zone = zones.get(time_zone)
+        if zone is None:
+            zone = zones[time_zone] = transition_index(time_zone)
+            calendars[time_zone] = day_calendar(state_of(time_zone))
+        offset, _, offset_to = zone.offset_window(t)
+        if offset_to <= t:
+            offset_to = t + SLOT_SECONDS  # Outside the indexed years; look again a slot later
+
+        local = t + offset
+        local_midnight = local - local % SECONDS_PER_DAY
+        day_type = boundaries.day_type(calendars[time_zone].code_of(int(local_midnight // SECONDS_PER_DAY)))
+        slot = int((local - local_midnight) // SLOT_SECONDS)
+
+        rate = boundaries.rate(day_type, slot)
+        if current is None:
+            current = rate
+        elif rate != current:
+            return datetime.fromtimestamp(t, timezone.utc)
+
+        if boundaries.constant:
+            span_end = version_to
+        else:
+            span_end = min(version_to, offset_to, local_midnight + SECONDS_PER_DAY - offset)
+            changes = boundaries.changes[day_type]
+            i = bisect_right(changes, slot)
+            if i < len(changes):
+                when = local_midnight + changes[i] * SLOT_SECONDS - offset
+                if when < span_end:
+                    return datetime.fromtimestamp(when, timezone.utc) if when < until else None
+        t = span_end
+    return None
+
+@lru_cache(maxsize=4096)
+def _day_rates(module, tariff_code, day_type):
+    """A day type's slope and intercept rows, copied so callers can't change the compiled tables."""
+    compiled = compile_tariff(module, tariff_code)
+    slope, intercept = compiled.slope[day_type].copy(), compiled.intercept[day_type].copy()
+    slope.flags.writeable = intercept.flags.writeable = False
+    return slope, intercept
+
+def day_profile(network: str, tariff: str, day: date):
+    """
+    Get the rate of every 5-minute interval of a local day.
+
+    The rates come from the tariff version in effect on the day and the day type of the
+    local date, public holidays included. The (slope, intercept) rows are cached per
+    (version, tariff, day type), so most days are two dictionary lookups; days when the
+    clocks change are gathered from the same rows for the intervals the day actually has.
+
+    Parameters:
+    - network (str): The name of the network.
+    - tariff (str): The tariff code.
+    - day (date): The local date, in the network's time zone.
+
+    Returns:
+    - DayProfile: starts, slope and intercept arrays (read-only).
+    """
+    if isinstance(day, datetime):
+        day = day.date()
+    versions = version_index(network)
+    module = versions.modules[versions.position(day)]
+    compiled = compile_tariff(module, tariff)
+    zone = ZoneInfo(compiled.time_zone)
+    code = day_code(day, state_of(compiled.time_zone))
+    slope, intercept = _day_rates(module, tariff, int(compiled.day_types.flat[code]))
+
+    first = int(datetime.combine(day, time(0, 0), zone).timestamp())
+    last = int(datetime.combine(day + timedelta(days=1), time(0, 0), zone).timestamp())
+    starts = (np.arange(first, last, SLOT_SECONDS, dtype=np.int64) * MICROS_PER_SECOND)
+    if len(starts) != SLOTS_PER_DAY:
+        time_of_day, _, _ = local_calendar(starts, compiled.time_zone)
+        slots = slot_of_day(time_of_day)
+        slope, intercept = slope[slots], intercept[slots]
+        slope.flags.writeable = intercept.flags.writeable = False
+    return DayProfile(starts.astype('datetime64[us]'), slope, intercept)
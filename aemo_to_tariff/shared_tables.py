@@ -0,0 +1,143 @@
+# aemo_to_tariff/shared_tables.py
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from aemo_to_tariff import slots
+from aemo_to_tariff.registry import NETWORKS
+from aemo_to_tariff.slots import CompiledTariff, SlotIssue, compile_tariff
+from aemo_to_tariff.versions import version_index
+
+MAGIC = b'AESL'
+FORMAT_VERSION = 3
+# magic, format version, flags, length of the JSON index that follows
+HEADER = struct.Struct('<4sHHQ')
+# Arrays start on cache-line boundaries so every view is aligned
+ALIGNMENT = 64
+ARRAYS = ('period', 'slope', 'intercept', 'day_types', 'export_slope', 'export_intercept')
+# Day types by month, weekday and public holiday, see calendars.DAY_CODES
+DAY_TYPES_SHAPE = [12, 7, 2]
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def _version_key(module):
+    effective_from = getattr(module, 'effective_from', None)
+    return effective_from.isoformat() if effective_from is not None else ''
+
+def write_tables(path, networks=None):
+    """
+    Compile every tariff of every network (and every tariff version) into one file.
+
+    The file is a small JSON index followed by the raw slot tables, so readers can
+    map it and use the tables in place.
+
+    Parameters:
+    - path (str): The file to write.
+    - networks (iterable): Network names; every built-in network if None.
+
+    Returns:
+    - int: The number of tariffs written.
+    """
+    entries = []
+    blobs = []
+    offset = 0
+    for network in (NETWORKS if networks is None else networks):
+        seen = set()
+        for module in version_index(network).modules:
+            if id(module) in seen:
+                continue
+            seen.add(id(module))
+            for tariff_code in module.tariffs:
+                compiled = compile_tariff(module, tariff_code)
+                arrays = {}
+                for name in ARRAYS:
+                    array = np.ascontiguousarray(getattr(compiled, name))
+                    offset = _aligned(offset)
+                    arrays[name] = [offset, array.dtype.str, list(array.shape)]
+                    blobs.append((offset, array.tobytes()))
+                    offset += array.nbytes
+                entries.append({
+                    'network': network, 'module': module.__name__, 'version': _version_key(module),
+                    'tariff': tariff_code, 'time_zone': compiled.time_zone, 'labels': list(compiled.labels),
+                    'period_names': list(compiled.period_names), 'issues': [list(issue) for issue in compiled.issues],
+                    'arrays': arrays,
+                })
+
+    index = json.dumps({'entries': entries}).encode('utf-8')
+    data_start = _aligned(HEADER.size + len(index))
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(index)))
+        handle.write(index)
+        for blob_offset, blob in blobs:
+            handle.seek(data_start + blob_offset)
+            handle.write(blob)
+    os.replace(temporary, path)
+    return len(entries)
+
+
+class SharedTables:
+    """
+    Compiled slot tables memory-mapped read-only from a write_tables() file.
+
+    The arrays of each CompiledTariff are read-only NumPy views into the mapping, so
+    every process that opens the file shares one copy of the tables in the page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, index_length = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a compiled tariff table file (format {FORMAT_VERSION}): {path}")
+        index = json.loads(self._buffer[HEADER.size:HEADER.size + index_length].decode('utf-8'))
+        if any(entry['arrays']['day_types'][2] != DAY_TYPES_SHAPE for entry in index['entries']):
+            raise ValueError(f"Compiled tariff table file has day types for another calendar: {path}")
+        self._data_start = _aligned(HEADER.size + index_length)
+        self._entries = {(entry['module'], entry['version'], entry['tariff']): entry for entry in index['entries']}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, module, tariff_code: str):
+        """
+        Get a tariff's compiled tables without compiling it.
+
+        Parameters:
+        - module: The network module or tariff version.
+        - tariff_code (str): The tariff code.
+
+        Returns:
+        - CompiledTariff: Views into the mapped file, or None if the file doesn't have it.
+        """
+        entry = self._entries.get((module.__name__, _version_key(module), tariff_code))
+        if entry is None:
+            return None
+        arrays = {}
+        for name, (offset, dtype, shape) in entry['arrays'].items():
+            count = int(np.prod(shape))
+            arrays[name] = np.frombuffer(self._buffer, dtype=dtype, count=count,
+                                         offset=self._data_start + offset).reshape(shape)
+        return CompiledTariff(tariff_code, entry['time_zone'], tuple(entry['labels']), tuple(entry['period_names']),
+                              arrays['period'], arrays['slope'], arrays['intercept'], arrays['day_types'],
+                              [SlotIssue(*issue) for issue in entry['issues']],
+                              arrays['export_slope'], arrays['export_intercept'])
+
+
+def use_shared_tables(path):
+    """
+    Make compile_tariff() take tables from a write_tables() file in this process.
+
+    Pass it as a process pool initializer, e.g.
+    ProcessPoolExecutor(initializer=use_shared_tables, initargs=(path,)).
+
+    Parameters:
+    - path (str): The file, or None to go back to compiling tariffs.
+    """
+    slots.set_shared_tables(None if path is None else SharedTables(path))
@@ -0,0 +1,292 @@
+# aemo_to_tariff/slots.py
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from aemo_to_tariff.rules import TariffRules, day_type_table, from_variants
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOT_MICROS = SLOT_MINUTES * 60 * 1_000_000
+
+# Something the compiler noticed about a tariff's periods, e.g. a gap or an overlap.
+# start and end are 'HH:MM' strings, with '24:00' for midnight at the end of the day.
+SlotIssue = namedtuple('SlotIssue', ['kind', 'day_type', 'start', 'end', 'detail'])
+
+# Precompiled tables compile_tariff() takes tariffs from, see shared_tables.py
+_shared_tables = None
+
+
+class CompiledTariff:
+    """
+    A tariff compiled into dense per-5-minute slot tables.
+
+    Each day type has SLOTS_PER_DAY (slope, intercept) pairs; the network price for an
+    interval is rrp_c_kwh * slope + intercept. The price paid for exports is
+    rrp_c_kwh * export_slope + export_intercept, the spot price where the tariff has no
+    export rates. day_types maps (month - 1, weekday, public holiday) to a day type; its
+    flat index is the day's calendars.DAY_CODES code, so a lookup is a pair of array
+    indexes.
+    """
+    __slots__ = ('tariff_code', 'time_zone', 'labels', 'period_names', 'period', 'slope', 'intercept', 'day_types', 'issues',
+                 'export_slope', 'export_intercept')
+
+    def __init__(self, tariff_code, time_zone, labels, period_names, period, slope, intercept, day_types, issues,
+                 export_slope=None, export_intercept=None):
+        self.tariff_code = tariff_code
+        self.time_zone = time_zone
+        self.labels = labels
+        self.period_names = period_names
+        self.period = period
+        self.slope = slope
+        self.intercept = intercept
+        self.day_types = day_types
+        self.issues = issues
+        self.export_slope = np.ones_like(slope) if export_slope is None else export_slope
+        self.export_intercept = np.zeros_like(intercept) if export_intercept is None else export_intercept
+
+    def lookup(self, day_codes, slots):
+        """
+        Get the slope and intercept for intervals.
+
+        Parameters:
+        - day_codes (numpy.ndarray): Day codes of the local dates, see calendars.DAY_CODES.
+        - slots (numpy.ndarray): Slot of the day (0 to SLOTS_PER_DAY - 1).
+
+        Returns:
+        - tuple: (slope, intercept) numpy arrays.
+        """
+        day_type = self.day_types.ravel()[day_codes]
+        return self.slope[day_type, slots], self.intercept[day_type, slots]
+
+    def lookup_import_export(self, day_codes, slots):
+        """
+        Get the import and export slope and intercept for intervals, finding each slot once.
+
+        Parameters:
+        - day_codes (numpy.ndarray): Day codes of the local dates, see calendars.DAY_CODES.
+        - slots (numpy.ndarray): Slot of the day (0 to SLOTS_PER_DAY - 1).
+
+        Returns:
+        - tuple: (slope, intercept, export_slope, export_intercept) numpy arrays.
+        """
+        index = self.day_types.ravel()[day_codes].astype(np.intp) * SLOTS_PER_DAY + slots
+        return (self.slope.ravel().take(index), self.intercept.ravel().take(index),
+                self.export_slope.ravel().take(index), self.export_intercept.ravel().take(index))
+
+    def period_name(self, day_type: int, slot: int):
+        """
+        Name the period that sets the rate in a slot, or None where the fallback applies.
+        """
+        index = self.period[day_type, slot]
+        return self.period_names[index] if index >= 0 else None
+
+
+def slot_of_day(time_of_day):
+    """
+    Map local microseconds since midnight to the slot of the day.
+    """
+    return time_of_day // SLOT_MICROS
+
+def _minutes(t):
+    return t.hour * 60 + t.minute + (t.second + t.microsecond / 1_000_000) / 60
+
+def _clock(minutes):
+    return f"{int(minutes) // 60:02d}:{int(minutes) % 60:02d}"
+
+def _ranges(mask):
+    """Yield (first, last + 1) for each run of True in a slot mask."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return zip(edges[::2], edges[1::2])
+
+def _overlap_issues(label, periods, matches, winner, issues):
+    """Report slots claimed by more than one period, and periods that never win a slot."""
+    for first, last in _ranges(matches.sum(axis=0) > 1):
+        for slot in range(first, last):
+            if slot == first or not np.array_equal(matches[:, slot], matches[:, slot - 1]):
+                run_start = slot
+            if slot + 1 == last or not np.array_equal(matches[:, slot], matches[:, slot + 1]):
+                names = [periods[i][0] for i in np.flatnonzero(matches[:, slot])]
+                issues.append(SlotIssue('overlap', label, _clock(run_start * SLOT_MINUTES), _clock((slot + 1) * SLOT_MINUTES),
+                                        f"{' / '.join(names)} overlap; {names[0]} wins"))
+
+    for i, (period, start, end, rate, *_) in enumerate(periods):
+        if matches[i].any() and not (winner == i).any():
+            issues.append(SlotIssue('shadowed', label, _clock(_minutes(start)), _clock(_minutes(end)),
+                                    f"{period} is always preceded by another period and never applies"))
+
+def _compile_variant(label, periods, wrap, issues):
+    slot_starts = np.arange(SLOTS_PER_DAY) * SLOT_MINUTES
+    matches = np.zeros((len(periods), SLOTS_PER_DAY), dtype=bool)
+
+    for i, (period, start, end, rate, *_) in enumerate(periods):
+        start = _minutes(start)
+        end = _minutes(end)
+        if end == 23 * 60 + 59:
+            # A period written as ending at 23:59 means "until midnight"
+            issues.append(SlotIssue('hole', label, '23:59', '24:00', f"{period} ends at 23:59; compiled as running to midnight"))
+            end = 24 * 60
+        if start % SLOT_MINUTES or end % SLOT_MINUTES:
+            issues.append(SlotIssue('misaligned', label, _clock(start), _clock(end), f"{period} does not start and end on a slot boundary"))
+
+        if start == end:
+            matches[i] = True
+        elif start < end:
+            matches[i] = (slot_starts >= start) & (slot_starts < end)
+        elif wrap:
+            matches[i] = (slot_starts >= start) | (slot_starts < end)
+
+    # The first period listed wins, exactly as in each network's convert() loop
+    count = matches.sum(axis=0)
+    winner = np.where(count > 0, matches.argmax(axis=0) if len(periods) else 0, -1)
+
+    for first, last in _ranges(count == 0):
+        issues.append(SlotIssue('gap', label, _clock(first * SLOT_MINUTES), _clock(last * SLOT_MINUTES),
+                                'no period covers this time; the fallback rate applies'))
+
+    _overlap_issues(label, periods, matches, winner, issues)
+    return winner
+
+def _compile_export(export, issues):
+    labels, day_rules, day_types = day_type_table(from_variants(export))
+    fallback_slope, fallback_intercept = export['fallback']
+    slope = np.full((len(labels), SLOTS_PER_DAY), fallback_slope, dtype=float)
+    intercept = np.full((len(labels), SLOTS_PER_DAY), fallback_intercept, dtype=float)
+
+    for day_type, (label, rules) in enumerate(zip(labels, day_rules)):
+        variant_issues = []
+        winner = _compile_variant(f"export {label}", rules, export['wrap'], variant_issues)
+        # Export periods only cover part of the day; elsewhere exports earn the spot price
+        issues.extend(issue for issue in variant_issues if issue.kind != 'gap')
+        for slot in np.flatnonzero(winner >= 0):
+            slope[day_type, slot] = 1.0
+            intercept[day_type, slot] = rules[winner[slot]].rate
+    return day_types, labels, slope, intercept
+
+def compile_rules(tariff_code, time_zone, rules, export=None):
+    """
+    Compile the rules returned by a network module's get_rules() into slot tables.
+
+    Parameters:
+    - tariff_code (str): The tariff code.
+    - time_zone (str): The network's time zone.
+    - rules (dict): See energex.get_rules.
+    - export (dict): Export-side rules, see export_rules(); exports earn the
+      spot price if None.
+
+    Returns:
+    - CompiledTariff: The compiled tariff, with any gaps and overlaps in .issues.
+    """
+    return compile_declared(tariff_code, time_zone, from_variants(rules), export)
+
+def compile_declared(tariff_code, time_zone, declared: TariffRules, export=None, block=None):
+    """
+    Compile declared rules (see rules.Rule) into slot tables.
+
+    Parameters:
+    - tariff_code (str): The tariff code.
+    - time_zone (str): The network's time zone.
+    - declared (TariffRules): The tariff's rules.
+    - export (dict): Export-side rules, see compile_rules().
+    - block: The consumption block to price, see rules.day_type_table().
+
+    Returns:
+    - CompiledTariff: The compiled tariff, with any gaps and overlaps in .issues.
+    """
+    fallback_slope, fallback_intercept = declared.fallback
+    issues = []
+    period_names = []
+    period_index = {}
+    labels, day_rules, day_types = day_type_table(declared, block)
+
+    period = np.full((len(labels), SLOTS_PER_DAY), -1, dtype=np.int16)
+    slope = np.full((len(labels), SLOTS_PER_DAY), fallback_slope, dtype=float)
+    intercept = np.full((len(labels), SLOTS_PER_DAY), fallback_intercept, dtype=float)
+
+    for day_type, (label, rules) in enumerate(zip(labels, day_rules)):
+        winner = _compile_variant(label, rules, declared.wrap, issues)
+        for slot in np.flatnonzero(winner >= 0):
+            rule = rules[winner[slot]]
+            key = (rule.period, rule.rate)
+            if key not in period_index:
+                period_index[key] = len(period_names)
+                period_names.append(rule.period)
+            period[day_type, slot] = period_index[key]
+            slope[day_type, slot] = 1.0
+            intercept[day_type, slot] = rule.rate
+
+    export_slope = export_intercept = None
+    if export is not None:
+        export_types, export_labels, export_slope, export_intercept = _compile_export(export, issues)
+        if len(export_labels) == 1:
+            export_slope = np.repeat(export_slope, len(labels), axis=0)
+            export_intercept = np.repeat(export_intercept, len(labels), axis=0)
+        else:
+            # One day type per (import, export) pair in use, so a single day_types lookup finds both
+            pairs, inverse = np.unique(day_types.astype(np.int64) * len(export_labels) + export_types, return_inverse=True)
+            imports, exports = pairs // len(export_labels), pairs % len(export_labels)
+            labels = [f"{labels[i]}; export {export_labels[e]}" for i, e in zip(imports, exports)]
+            period, slope, intercept = period[imports], slope[imports], intercept[imports]
+            export_slope, export_intercept = export_slope[exports], export_intercept[exports]
+            day_types = inverse.reshape(day_types.shape).astype(np.int8)
+
+    return CompiledTariff(tariff_code, time_zone, tuple(labels), tuple(period_names),
+                          period, slope, intercept, day_types, issues, export_slope, export_intercept)
+
+@lru_cache(maxsize=None)
+def compile_tariff(module, tariff_code: str, block=None):
+    """
+    Compile a network module's tariff into slot tables, once per (module, tariff).
+
+    Tariffs in the shared tables set with set_shared_tables() aren't compiled; their
+    arrays are read-only views into the shared file.
+
+    Parameters:
+    - module: The network module (e.g. aemo_to_tariff.sapower).
+    - tariff_code (str): The tariff code.
+    - block: The consumption block to price (see rules.blocks()); the first if None.
+
+    Returns:
+    - CompiledTariff: The compiled tariff.
+    """
+    if _shared_tables is not None and block is None:
+        compiled = _shared_tables.get(module, tariff_code)
+        if compiled is not None:
+            return compiled
+    export = export_rules(module, tariff_code)
+    return compile_declared(tariff_code, module.time_zone(), from_variants(module.get_rules(tariff_code)), export, block)
+
+def export_rules(module, tariff_code):
+    """
+    Describe a tariff's export-side rates, for the vectorized converters.
+
+    A module can define get_export_rules(tariff_code); otherwise the rates come from its
+    export_tariffs table, {tariff_code: {'name': ..., 'periods': [(name, start, end, rate)]}},
+    with rates in c/kWh added to the spot price an exporter is paid (negative for an export
+    charge), e.g. sapower.export_tariffs. Two-way tariffs are added as a version with
+    versions.register_version(..., export_tariffs=...).
+
+    Returns:
+    - dict: Laid out like energex.get_rules(), or None if the tariff has no export rates.
+      Each export period sets the slope to 1.0 and the intercept to its rate; outside
+      them exports earn the spot price.
+    """
+    get_export_rules = getattr(module, 'get_export_rules', None)
+    if get_export_rules is not None:
+        return get_export_rules(tariff_code)
+    tariff = getattr(module, 'export_tariffs', {}).get(tariff_code)
+    if not tariff:
+        return None
+    return {'variants': [(None, None, tariff['periods'])], 'wrap': True, 'fallback': (1.0, 0.0)}
+
+def set_shared_tables(tables):
+    """
+    Take compiled tariffs from precompiled tables from now on.
+
+    Parameters:
+    - tables: A shared_tables.SharedTables, or None to compile every tariff.
+    """
+    global _shared_tables
+    _shared_tables = tables
+    compile_tariff.cache_clear()
@@ -0,0 +1,225 @@
+# aemo_to_tariff/tariff_store.py
+import mmap
+import os
+import struct
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+
+# The store aer_import.py writes from the AER approved-price workbooks
+DEFAULT_STORE = os.path.join(os.path.dirname(__file__), 'data', 'aer_tariffs.bin')
+
+MAGIC = b'AETS'
+# Bump when the layout below changes; stores in an older layout are rebuilt on import
+FORMAT_VERSION = 1
+
+# Layout, all little-endian. Strings are (offset, length) into a UTF-8 blob.
+# header: magic, format version, importer version (0 if unknown), counts of
+#   sources/tariffs/charges, then the offsets of the source, tariff, charge and string sections
+HEADER = struct.Struct('<4sHHIIIIIII')
+# source: file name, size, mtime_ns, sha256
+SOURCE = struct.Struct('<IIQQ32s')
+# tariff: network, code, name, tariff class, source index, effective-from ordinal,
+#   first charge, charge count, daily fee ($/day); sorted by (network, code, effective from)
+TARIFF = struct.Struct('<IIIIIIIIIiIId')
+# charge: label, kind, unit, value
+CHARGE = struct.Struct('<IIBIId')
+
+# Charge kinds. Values are normalised to $/day for fixed charges and c/kWh for energy;
+# demand and other charges keep the workbook's unit.
+FIXED, ENERGY, DEMAND, OTHER = range(4)
+KINDS = ('fixed', 'energy', 'demand', 'other')
+
+Source = namedtuple('Source', ['name', 'size', 'mtime_ns', 'sha256'])
+Charge = namedtuple('Charge', ['label', 'kind', 'unit', 'value'])
+StoredTariff = namedtuple('StoredTariff', ['network', 'code', 'name', 'tariff_class', 'effective_from',
+                                           'daily_fee', 'charges', 'source'])
+
+
+def write_store(path, sources, tariffs, importer_version=0):
+    """
+    Write sources and tariffs to a store file, atomically.
+
+    Parameters:
+    - path (str): The store file.
+    - sources (list): Source tuples; StoredTariff.source indexes into this list.
+    - tariffs (iterable): StoredTariff tuples with Charge tuples.
+    - importer_version (int): The version of the code that read the tariffs, see aer_import.IMPORTER_VERSION.
+    """
+    strings = bytearray()
+    string_refs = {}
+
+    def ref(text):
+        if text not in string_refs:
+            encoded = text.encode('utf-8')
+            string_refs[text] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return string_refs[text]
+
+    tariffs = sorted(tariffs, key=lambda t: (t.network, t.code, t.effective_from))
+    source_bytes = b''.join(SOURCE.pack(*ref(s.name), s.size, s.mtime_ns, s.sha256) for s in sources)
+    tariff_bytes = bytearray()
+    charge_bytes = bytearray()
+    charge_count = 0
+    for tariff in tariffs:
+        tariff_bytes += TARIFF.pack(*ref(tariff.network), *ref(tariff.code), *ref(tariff.name), *ref(tariff.tariff_class),
+                                    tariff.source, tariff.effective_from.toordinal(), charge_count,
+                                    len(tariff.charges), tariff.daily_fee)
+        for charge in tariff.charges:
+            charge_bytes += CHARGE.pack(*ref(charge.label), KINDS.index(charge.kind), *ref(charge.unit), charge.value)
+        charge_count += len(tariff.charges)
+
+    sources_offset = HEADER.size
+    tariffs_offset = sources_offset + len(source_bytes)
+    charges_offset = tariffs_offset + len(tariff_bytes)
+    strings_offset = charges_offset + len(charge_bytes)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, importer_version, len(sources), len(tariffs), charge_count,
+                         sources_offset, tariffs_offset, charges_offset, strings_offset)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as handle:
+        handle.write(header + source_bytes + tariff_bytes + charge_bytes + strings)
+    os.replace(temporary, path)
+
+
+class TariffStore:
+    """
+    A memory-mapped view of a store file.
+
+    Opening only reads the header; records are decoded from the mapping as they are
+    looked up, with a binary search over the sorted tariff records.
+    """
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.format_version, self.importer_version, self._source_count, self.tariff_count, self._charge_count,
+         self._sources_offset, self._tariffs_offset, self._charges_offset, self._strings_offset) = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"Not a tariff store: {path}")
+        if self.format_version != FORMAT_VERSION:
+            raise ValueError(f"Tariff store {path} has format {self.format_version}, expected {FORMAT_VERSION}")
+
+    def close(self):
+        self._buffer.close()
+
+    def _string(self, offset, length):
+        start = self._strings_offset + offset
+        return self._buffer[start:start + length].decode('utf-8')
+
+    def _key(self, index):
+        fields = TARIFF.unpack_from(self._buffer, self._tariffs_offset + index * TARIFF.size)
+        return self._string(fields[0], fields[1]), self._string(fields[2], fields[3]), fields[9]
+
+    def _tariff(self, index):
+        fields = TARIFF.unpack_from(self._buffer, self._tariffs_offset + index * TARIFF.size)
+        first, count = fields[10], fields[11]
+        charges = []
+        for i in range(first, first + count):
+            label_offset, label_length, kind, unit_offset, unit_length, value = CHARGE.unpack_from(
+                self._buffer, self._charges_offset + i * CHARGE.size)
+            charges.append(Charge(self._string(label_offset, label_length), KINDS[kind],
+                                  self._string(unit_offset, unit_length), value))
+        return StoredTariff(self._string(fields[0], fields[1]), self._string(fields[2], fields[3]),
+                            self._string(fields[4], fields[5]), self._string(fields[6], fields[7]),
+                            date.fromordinal(fields[9]), fields[12], tuple(charges), fields[8])
+
+    def _search(self, key):
+        """The first record whose (network, code, effective from) is >= key."""
+        low, high = 0, self.tariff_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def sources(self):
+        """
+        List the workbooks the store was built from.
+
+        Returns:
+        - list: Source tuples.
+        """
+        found = []
+        for i in range(self._source_count):
+            name_offset, name_length, size, mtime_ns, sha256 = SOURCE.unpack_from(
+                self._buffer, self._sources_offset + i * SOURCE.size)
+            found.append(Source(self._string(name_offset, name_length), size, mtime_ns, sha256))
+        return found
+
+    def get(self, network: str, code: str, when=None):
+        """
+        Look up a tariff.
+
+        Parameters:
+        - network (str): The network, e.g. 'energex' or 'citipower'.
+        - code (str): The tariff code as the workbook lists it.
+        - when (date): The version in effect on this date; the latest if None.
+
+        Returns:
+        - StoredTariff: The tariff, or None if the store doesn't have it.
+        """
+        network = network.lower()
+        if when is None:
+            end = self._search((network, code, date.max.toordinal()))
+        else:
+            end = self._search((network, code, when.toordinal() + 1))
+        if end and self._key(end - 1)[:2] == (network, code):
+            return self._tariff(end - 1)
+        return None
+
+    def tariffs(self, network: str = None):
+        """
+        Iterate over every tariff version in the store, or one network's.
+
+        Yields:
+        - StoredTariff: In (network, code, effective from) order.
+        """
+        if network is None:
+            start, end = 0, self.tariff_count
+        else:
+            network = network.lower()
+            start = self._search((network, '', 0))
+            end = self._search((network + '\0', '', 0))
+        for index in range(start, end):
+            yield self._tariff(index)
+
+
+@lru_cache(maxsize=None)
+def open_store(path=DEFAULT_STORE):
+    """
+    Open (once per process) a tariff store.
+
+    Parameters:
+    - path (str): The store file; the one shipped with the package by default.
+
+    Returns:
+    - TariffStore: The store.
+    """
+    return TariffStore(path)
+
+def approved_prices(network: str, code: str, when=None):
+    """
+    Get a tariff's prices from the shipped store, for a network module's rate tables.
+
+    Parameters:
+    - network (str): The network, as the store names it (e.g. 'energex', 'citipower').
+    - code (str): The tariff code as the workbook lists it.
+    - when (date): The version in effect on this date; the latest if None.
+
+    Returns:
+    - dict: Charge kind ('fixed', 'energy', 'demand', 'other') -> {label: value}, in the
+      store's units: $/day for fixed charges, c/kWh for energy and the workbook's unit
+      for demand charges. Labels keep the workbook's column order.
+    """
+    stored = open_store().get(network, code, when)
+    if stored is None:
+        raise ValueError(f"No approved prices for {network} tariff {code}")
+    prices = {kind: {} for kind in KINDS}
+    for charge in stored.charges:
+        prices[charge.kind][charge.label] = charge.value
+    return prices
@@ -2,6 +2,9 @@
 from datetime import time, datetime
 from zoneinfo import ZoneInfo
 
+from aemo_to_tariff.calendars import HOLIDAY, is_public_holiday, state_of
+from aemo_to_tariff.periods import in_period
+
 def time_zone():
     return 'Australia/Hobart'
 
@@ -41,7 +44,7 @@ tariffs = {
             ('Peak', time(7, 0), time(22, 0), 16.784),
             ('Shoulder', time(22, 0), time(23, 59), 9.886),
             ('Shoulder', time(0, 0), time(7, 0), 9.886),
-            ('Off-peak', time(0, 0), time(23, 59), 2.426),  # Applies on weekends
+            ('Off-peak', time(0, 0), time(23, 59), 2.426),  # Applies all day on weekends and public holidays
         ]
     },
     'TAS88': {
@@ -78,6 +81,39 @@ demand_charges = {
     }
 }
 
+# When billed demand is measured, see energex.get_demand_windows(). TasNetworks bills the
+# average of the four highest demands on different days; off-peak is charged on the
+# anytime demand above the peak demand.
+_WEEKDAYS = (0, 1, 2, 3, 4)
+_RESIDENTIAL_PEAK = {'windows': [(time(7, 0), time(10, 0)), (time(16, 0), time(21, 0))],
+                     'weekdays': _WEEKDAYS, 'method': 'top', 'count': 4}
+_BUSINESS_PEAK = {'windows': [(time(7, 0), time(22, 0))], 'weekdays': _WEEKDAYS, 'method': 'top', 'count': 4}
+_ANYTIME = {'windows': None, 'weekdays': None, 'method': 'top', 'count': 4}
+
+demand_windows = {
+    'TAS87': {'demand_kw': _ANYTIME, 'peak_demand_kw': _RESIDENTIAL_PEAK},
+    'TAS97': {'demand_kw': _RESIDENTIAL_PEAK},
+    'TAS88': {'demand_kw': _ANYTIME, 'peak_demand_kw': _BUSINESS_PEAK},
+    'TAS98': {'demand_kw': _ANYTIME, 'peak_demand_kw': _BUSINESS_PEAK},
+    'TAS89': {'demand_kw': _ANYTIME, 'peak_demand_kw': _BUSINESS_PEAK},
+    'TAS82': {'demand_kw': _ANYTIME},
+}
+
+def get_demand_windows(tariff_code: str):
+    """
+    Get the demand windows for a given tariff code, see energex.get_demand_windows().
+    """
+    return demand_windows.get(tariff_code)
+
+
+# Export-side network rates in c/kWh, see sapower.export_tariffs
+export_tariffs = {
+    'TAS97': {'name': 'Residential time of use CER', 'periods': [('Super off-peak', time(10, 0), time(16, 0), 0.0)]},
+}
+
+# Daily fees in c/day
+daily_fee_units = 'c/day'
+
 daily_fees = {
     'TAS93': 70.032,
     'TAS87': 71.258,
@@ -97,6 +133,29 @@ def get_periods(tariff_code: str):
 
     return tariff['periods']
 
+def get_rules(tariff_code: str):
+    """
+    Describe how convert() resolves a tariff, for the vectorized converters.
+
+    Parameters:
+    - tariff_code (str): The tariff code.
+
+    Returns:
+    - dict: See energex.get_rules.
+    """
+    tariff = tariffs.get(tariff_code)
+    if not tariff:
+        return {'variants': [], 'wrap': True, 'fallback': (1.037869032618134, 5.586606750833143)}
+
+    variants = [(None, None, tariff['periods'])]
+    if tariff_code == 'TAS94':
+        # Off-peak all day on weekends and public holidays
+        weekend = [(period, time(0, 0), time(0, 0), rate)
+                   for period, start, end, rate in tariff['periods'] if period == 'Off-peak']
+        variants.insert(0, (None, (5, 6, HOLIDAY), weekend))
+
+    return {'variants': variants, 'wrap': True, 'fallback': (1.0, tariff['periods'][0][3])}
+
 def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     """
     Convert RRP from $/MWh to c/kWh for TasNetworks.
@@ -109,7 +168,8 @@ def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     Returns:
     - float: The price in c/kWh.
     """
-    interval_time = interval_datetime.astimezone(ZoneInfo(time_zone())).time()
+    local = interval_datetime.astimezone(ZoneInfo(time_zone()))
+    interval_time = local.time()
     rrp_c_kwh = rrp / 10
 
     tariff = tariffs.get(tariff_code)
@@ -119,14 +179,15 @@ def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
         intercept = 5.586606750833143
         return rrp_c_kwh * slope + intercept
 
-    # Check if it's a weekend for TAS94
-    is_weekend = interval_datetime.weekday() >= 5
+    # Check if it's a weekend or public holiday in Tasmania for TAS94
+    is_weekend = local.weekday() >= 5 or is_public_holiday(state_of(time_zone()), local.date())
 
     # Find the applicable period and rate
     for period, start, end, rate in tariff['periods']:
-        if tariff_code == 'TAS94' and period == 'Off-peak' and is_weekend:
-            return rrp_c_kwh + rate
-        elif start <= interval_time < end or (start > end and (interval_time >= start or interval_time < end)):
+        if tariff_code == 'TAS94' and is_weekend:
+            if period == 'Off-peak':
+                return rrp_c_kwh + rate
+        elif in_period(interval_time, start, end):
             return rrp_c_kwh + rate
 
     # If no period is found, use the default rate (first rate in the list)
@@ -0,0 +1,178 @@
+# aemo_to_tariff/timezones.py
+from bisect import bisect_right
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+MICROS_PER_SECOND = 1_000_000
+MICROS_PER_DAY = 86_400 * MICROS_PER_SECOND
+
+# The zones used by the network modules; any other IANA zone is indexed on first use
+NETWORK_TIME_ZONES = (
+    'Australia/Brisbane',
+    'Australia/Sydney',
+    'Australia/ACT',
+    'Australia/Adelaide',
+    'Australia/Hobart',
+    'Australia/Melbourne',
+)
+
+# Years covered by each index; instants outside them fall back to zoneinfo
+FIRST_YEAR = 1990
+LAST_YEAR = 2100
+# Offsets are sampled weekly when an index is built; no zone changes offset twice in a week
+SAMPLE_SECONDS = 7 * 86_400
+
+
+class TransitionIndex:
+    """
+    The UTC offsets of a time zone between its DST transitions.
+
+    offsets[i] applies from transitions[i - 1] (inclusive) to transitions[i] (exclusive),
+    so offsets has one more entry than transitions. Both are in whole seconds.
+    """
+    __slots__ = ('time_zone', 'start', 'end', 'transitions', 'offsets', '_transition_list', '_offset_list')
+
+    def __init__(self, time_zone, start, end, transitions, offsets):
+        self.time_zone = time_zone
+        self.start = start
+        self.end = end
+        self.transitions = transitions
+        self.offsets = offsets
+        self._transition_list = transitions.tolist()
+        self._offset_list = offsets.tolist()
+
+    def offset_window(self, timestamp: float):
+        """
+        Get the UTC offset at an instant and the span of time it holds for.
+
+        Parameters:
+        - timestamp (float): Seconds since the Unix epoch.
+
+        Returns:
+        - tuple: (offset seconds, valid from, valid to) with valid to exclusive.
+        """
+        if not self.start <= timestamp < self.end:
+            offset = datetime.fromtimestamp(timestamp, ZoneInfo(self.time_zone)).utcoffset().total_seconds()
+            return int(offset), timestamp, timestamp
+        i = bisect_right(self._transition_list, timestamp)
+        valid_from = self._transition_list[i - 1] if i else self.start
+        valid_to = self._transition_list[i] if i < len(self._transition_list) else self.end
+        return self._offset_list[i], valid_from, valid_to
+
+    def offsets_at(self, utc_micros):
+        """
+        Get the UTC offsets for an array of instants.
+
+        Parameters:
+        - utc_micros (numpy.ndarray): int64 microseconds since the Unix epoch.
+
+        Returns:
+        - numpy.ndarray: int64 offsets in microseconds.
+        """
+        seconds = utc_micros // MICROS_PER_SECOND
+        offsets = self.offsets[np.searchsorted(self.transitions, seconds, side='right')]
+        outside = (seconds < self.start) | (seconds >= self.end)
+        if outside.any():
+            zone = ZoneInfo(self.time_zone)
+            offsets[outside] = [datetime.fromtimestamp(int(s), zone).utcoffset().total_seconds() for s in seconds[outside]]
+        return offsets * MICROS_PER_SECOND
+
+
+def _offset(zone, timestamp):
+    return int(datetime.fromtimestamp(timestamp, zone).utcoffset().total_seconds())
+
+@lru_cache(maxsize=None)
+def transition_index(time_zone: str):
+    """
+    Build (once per process) the transition index for a time zone.
+
+    Parameters:
+    - time_zone (str): The IANA time zone name.
+
+    Returns:
+    - TransitionIndex: The zone's offsets between FIRST_YEAR and LAST_YEAR.
+    """
+    zone = ZoneInfo(time_zone)
+    start = int(datetime(FIRST_YEAR, 1, 1, tzinfo=timezone.utc).timestamp())
+    end = int(datetime(LAST_YEAR + 1, 1, 1, tzinfo=timezone.utc).timestamp())
+
+    transitions = []
+    offsets = [_offset(zone, start)]
+    previous = start
+    for sample in range(start + SAMPLE_SECONDS, end + SAMPLE_SECONDS, SAMPLE_SECONDS):
+        sample = min(sample, end - 1)
+        if _offset(zone, sample) != offsets[-1]:
+            # Bisect down to the first second with the new offset
+            low, high = previous, sample
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _offset(zone, middle) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            transitions.append(high)
+            offsets.append(_offset(zone, high))
+        previous = sample
+
+    return TransitionIndex(time_zone, start, end, np.array(transitions, dtype=np.int64), np.array(offsets, dtype=np.int64))
+
+def parse_iso(strings):
+    """
+    Parse ISO 8601 strings to UTC without building datetime objects.
+
+    Strings may end in 'Z' or a '+HH:MM' / '-HH:MM' offset; strings without one are
+    taken to be UTC.
+
+    Parameters:
+    - strings (array-like): ISO 8601 date-times, e.g. '2024-07-01T10:05:00+10:00'.
+
+    Returns:
+    - numpy.ndarray: int64 microseconds since the Unix epoch.
+    """
+    values = np.asarray(strings, dtype=str)
+    if values.size == 0:
+        return np.zeros(values.shape, dtype=np.int64)
+
+    width = values.dtype.itemsize // 4
+    codes = values.reshape(-1).view(np.uint32).reshape(-1, width).copy()
+    lengths = (codes != 0).sum(axis=1)
+    rows = np.arange(len(codes))
+
+    def char_at(position):
+        return codes[rows, np.maximum(position, 0)]
+
+    zulu = char_at(lengths - 1) == ord('Z')
+    sign = char_at(lengths - 6)
+    has_offset = ((sign == ord('+')) | (sign == ord('-'))) & (char_at(lengths - 3) == ord(':')) & (lengths > 6)
+
+    def digits(position):
+        return (char_at(position).astype(np.int64) - ord('0'))
+
+    offset_minutes = (digits(lengths - 5) * 10 + digits(lengths - 4)) * 60 + digits(lengths - 2) * 10 + digits(lengths - 1)
+    offset_minutes = np.where(has_offset, np.where(sign == ord('-'), -offset_minutes, offset_minutes), 0)
+
+    # Blank out the suffixes and let numpy parse the rest
+    cut = np.where(has_offset, lengths - 6, np.where(zulu, lengths - 1, lengths))
+    codes[np.arange(width) >= cut[:, None]] = 0
+    local = codes.view(values.dtype).reshape(-1).astype('datetime64[us]').astype(np.int64)
+    return (local - offset_minutes * 60 * MICROS_PER_SECOND).reshape(values.shape)
+
+def local_calendar(utc_micros, time_zone: str):
+    """
+    Get local time of day, weekday and month for UTC instants in a vectorized pass.
+
+    Parameters:
+    - utc_micros (numpy.ndarray): int64 microseconds since the Unix epoch.
+    - time_zone (str): The IANA time zone name.
+
+    Returns:
+    - tuple: (microseconds since local midnight, weekday with Monday as 0, month 1-12).
+    """
+    local = utc_micros + transition_index(time_zone).offsets_at(utc_micros)
+    days = local // MICROS_PER_DAY
+    weekdays = (days + 3) % 7  # 1970-01-01 was a Thursday
+    months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) % 12 + 1
+    return local - days * MICROS_PER_DAY, weekdays, months
@@ -0,0 +1,193 @@
+# aemo_to_tariff/versions.py
+import importlib.util
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+from aemo_to_tariff.registry import get_network
+
+# The financial year the tables in the network modules are for, unless a module sets
+# its own effective_from
+CURRENT_EFFECTIVE_FROM = date(2024, 7, 1)
+
+# The module-level tables that change from one version to the next; anything a version
+# doesn't give is the same as in the current version
+VERSIONED_TABLES = ('tariffs', 'daily_fees', 'demand_charges', 'export_tariffs', 'block_thresholds')
+
+_registered = {}
+_indexes = {}
+
+
+class VersionIndex:
+    """
+    The versions of one network's tariffs, in effective date order.
+
+    A version applies from local midnight on its effective date until the next one
+    starts. The first version also covers everything before its effective date, so
+    a network with a single version behaves as it always has.
+    """
+    __slots__ = ('network', 'effective_from', 'starts', 'modules')
+
+    def __init__(self, network, effective_from, starts, modules):
+        self.network = network
+        self.effective_from = effective_from
+        # Epoch seconds at which versions 1..n-1 start
+        self.starts = starts
+        self.modules = modules
+
+    def position(self, when):
+        """
+        Find the version in effect at a time.
+
+        Parameters:
+        - when: A datetime, a date, or epoch seconds.
+
+        Returns:
+        - int: The index into modules.
+        """
+        if len(self.modules) == 1:
+            return 0
+        if isinstance(when, datetime):
+            when = when.timestamp()
+        elif isinstance(when, date):
+            return max(bisect_right(self.effective_from, when) - 1, 0)
+        return bisect_right(self.starts, when)
+
+    def window(self, timestamp: float):
+        """
+        Get the module in effect at an instant and the span it holds for.
+
+        Returns:
+        - tuple: (module, valid from, valid to) in epoch seconds, valid to exclusive.
+        """
+        i = self.position(timestamp)
+        valid_from = self.starts[i - 1] if i else float('-inf')
+        valid_to = self.starts[i] if i < len(self.starts) else float('inf')
+        return self.modules[i], valid_from, valid_to
+
+    def segments(self, utc_micros):
+        """
+        Split instants by the version in effect.
+
+        Parameters:
+        - utc_micros (numpy.ndarray): int64 microseconds since the Unix epoch.
+
+        Returns:
+        - list: (module, selection) pairs; selection is a slice when the instants are
+          sorted and a boolean mask otherwise. Versions with no instants are left out.
+        """
+        if len(self.modules) == 1:
+            return [(self.modules[0], slice(None))]
+
+        import numpy as np
+        boundaries = np.array(self.starts, dtype=np.int64) * 1_000_000
+        if len(utc_micros) < 2 or (utc_micros[1:] >= utc_micros[:-1]).all():
+            cuts = [0] + np.searchsorted(utc_micros, boundaries).tolist() + [len(utc_micros)]
+            return [(module, slice(start, end))
+                    for module, start, end in zip(self.modules, cuts[:-1], cuts[1:]) if end > start]
+
+        positions = np.searchsorted(boundaries, utc_micros, side='right')
+        return [(module, positions == i) for i, module in enumerate(self.modules) if (positions == i).any()]
+
+
+def _load_version(module, tables):
+    """Run a network module's code again with one version's tables in place."""
+    spec = importlib.util.find_spec(module.__name__)
+    if spec is None or spec.loader is None:
+        raise ValueError(f"Network module {module.__name__} can't be versioned")
+    version = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(version)
+    for name, table in tables.items():
+        setattr(version, name, table)
+    return version
+
+def register_version(network: str, effective_from: date, **tables):
+    """
+    Add a version of a network's tariffs.
+
+    Parameters:
+    - network (str): The name of the network (e.g., 'Energex').
+    - effective_from (date): The first day the version applies, in the network's time zone.
+    - tables: Any of tariffs, daily_fees, demand_charges, export_tariffs and block_thresholds, laid out like the network
+      module's own; the rest are taken from the current version.
+    """
+    unknown = set(tables) - set(VERSIONED_TABLES)
+    if unknown:
+        raise ValueError(f"Unknown tariff tables: {', '.join(sorted(unknown))}")
+    name = network.lower()
+    _registered.setdefault(name, {})[effective_from] = tables
+    _indexes.pop(name, None)
+
+@contextmanager
+def isolated_versions():
+    """
+    Register versions for the length of a with block only.
+
+    Inside the block versions are registered on a copy of the registry, with indexes
+    built afresh; when it ends the registry and indexes from before are back in place.
+    """
+    global _registered, _indexes
+    saved = _registered, _indexes
+    _registered = {name: dict(days) for name, days in _registered.items()}
+    _indexes = {}
+    try:
+        yield
+    finally:
+        _registered, _indexes = saved
+
+def version_index(network: str):
+    """
+    Get (building it on first use) the version index for a network.
+
+    Versions come from the module's own tables (the current version), from a
+    tariff_versions dict of {effective_from: tables} in the module, and from
+    register_version().
+
+    Parameters:
+    - network (str): The name of the network.
+
+    Returns:
+    - VersionIndex: The network's versions.
+    """
+    name = network.lower()
+    index = _indexes.get(name)
+    if index is not None:
+        return index
+
+    module = get_network(network)
+    current_from = getattr(module, 'effective_from', CURRENT_EFFECTIVE_FROM)
+    versions = dict(getattr(module, 'tariff_versions', {}))
+    versions.update(_registered.get(name, {}))
+
+    effective_from = sorted(set(versions) | {current_from})
+    modules = []
+    for day in effective_from:
+        if day in versions:
+            version = _load_version(module, versions[day])
+            version.effective_from = day
+            modules.append(version)
+        else:
+            modules.append(module)
+
+    zone = ZoneInfo(module.time_zone())
+    starts = [int(datetime.combine(day, time(0, 0), zone).timestamp()) for day in effective_from[1:]]
+    index = VersionIndex(name, effective_from, starts, modules)
+    _indexes[name] = index
+    return index
+
+def network_at(network: str, when=None):
+    """
+    Get a network's module as it was at a given time.
+
+    Parameters:
+    - network (str): The name of the network.
+    - when: A datetime, a date, epoch seconds, or None for the current version.
+
+    Returns:
+    - module: The network module, or a copy of it holding an earlier or later version's tables.
+    """
+    if when is None:
+        return get_network(network)
+    index = version_index(network)
+    return index.modules[index.position(when)]
@@ -2,46 +2,38 @@
 from datetime import time, datetime
 from zoneinfo import ZoneInfo
 
+from aemo_to_tariff.periods import in_period
+from aemo_to_tariff.tariff_store import approved_prices
+from aemo_to_tariff.versions import CURRENT_EFFECTIVE_FROM
+
 def time_zone():
     # Victoria uses Australia/Melbourne time
     return 'Australia/Melbourne'
 
 ###############################################################################
-# Daily Fees
+# Tariff Schedules
 ###############################################################################
-# These might be daily supply charges ($/day).
-# In some Victorian DNSP areas, there may be multiple "bands"
+# The generic Victorian tariffs price at the AER approved prices (see aer_import.py) of
+# one distributor's equivalent tariff, CitiPower's unless DISTRIBUTOR is changed before
+# the tables are built. Each tariff's periods are listed here as (name, start, end, the
+# workbook price it charges).
 
 
-daily_fees = {
-    'VICR_SINGLE': 1.00,  # Residential single rate
-    'VICR_TOU': 1.20,  # Residential time-of-use
-    'VICS_SINGLE': 2.50,  # Small business single rate
-    'VICS_TOU': {
-        'band1': 2.50,   # Up to 20 MWh/year
-        'band2': 3.00,   # 20–40 MWh/year
-        'band3': 3.50,   # 40–60 MWh/year
-        'band4': 4.00,   # 60–80 MWh/year
-        'band5': 4.50    # >80 MWh/year
-    },
-    'VICR_DEMAND': 1.10,  # Residential demand
-    'VICS_DEMAND': 3.00   # Small business demand
+DISTRIBUTOR = 'citipower'
+
+_tariff_periods = {
+    'VICR_SINGLE': ('C1R', 'Residential Single Rate', [('Anytime', time(0, 0), time(23, 59), 'Anytime')]),
+    'VICS_SINGLE': ('C1G', 'Small Business Single Rate', [('Anytime', time(0, 0), time(23, 59), 'Anytime')]),
+    'VICR_DEMAND': ('CR', 'Residential Demand', [('Anytime', time(0, 0), time(23, 59), 'Anytime')]),
+    'VICS_DEMAND': ('CG', 'Small Business Demand', [('Anytime', time(0, 0), time(23, 59), 'Anytime')]),
 }
 
-###############################################################################
-# Tariff Schedules
-###############################################################################
-# These define how usage charges (c/kWh) vary by time of day.
-# Some Victorian tariffs have Peak/Off-Peak only; others have Peak/Shoulder/Off-Peak.
+# The workbooks don't give the times of the time-of-use periods, so these tariffs aren't
+# priced from the store. Their periods, rates and daily fees are illustrative, not any
+# distributor's prices.
+ILLUSTRATIVE_TARIFFS = ('VICR_TOU', 'VICS_TOU')
 
-tariffs = {
-    'VICR_SINGLE': {
-        'name': 'Residential Single Rate',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 20.0)  # c/kWh
-        ],
-        'rate': 20.0
-    },
+_illustrative_tariffs = {
     'VICR_TOU': {
         'name': 'Residential Time of Use',
         'periods': [
@@ -51,13 +43,6 @@ tariffs = {
         ],
         'rate': {'Peak': 30.0, 'Off-Peak': 15.0}
     },
-    'VICS_SINGLE': {
-        'name': 'Small Business Single Rate',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 22.0)
-        ],
-        'rate': 22.0
-    },
     'VICS_TOU': {
         'name': 'Small Business Time of Use',
         'periods': [
@@ -67,37 +52,77 @@ tariffs = {
         ],
         'rate': {'Peak': 35.0, 'Off-Peak': 18.0}
     },
-    'VICR_DEMAND': {
-        'name': 'Residential Demand',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 15.0)
-        ],
-        'rate': 15.0
+}
+
+_illustrative_daily_fees = {
+    'VICR_TOU': 1.20,  # Residential time-of-use
+    'VICS_TOU': {
+        'band1': 2.50,   # Up to 20 MWh/year
+        'band2': 3.00,   # 20–40 MWh/year
+        'band3': 3.50,   # 40–60 MWh/year
+        'band4': 4.00,   # 60–80 MWh/year
+        'band5': 4.50    # >80 MWh/year
     },
-    'VICS_DEMAND': {
-        'name': 'Small Business Demand',
-        'periods': [
-            ('Anytime', time(0, 0), time(23, 59), 25.0)
-        ],
-        'rate': 25.0
-    }
 }
 
+def _approved_tables(distributor):
+    """
+    Build the tariffs, daily_fees and demand_charges tables from the tariff store, adding
+    the ILLUSTRATIVE_TARIFFS as they are.
+    """
+    tariffs, daily_fees, demand_charges = dict(_illustrative_tariffs), dict(_illustrative_daily_fees), {}
+    for code, (stored_code, name, periods) in _tariff_periods.items():
+        prices = approved_prices(distributor, stored_code, CURRENT_EFFECTIVE_FROM)
+        rates = {period: prices['energy'][label] for period, _, _, label in periods}
+        tariffs[code] = {
+            'name': name,
+            'periods': [(period, start, end, rates[period]) for period, start, end, _ in periods],
+            'rate': rates if len(rates) > 1 else rates[periods[0][0]],
+        }
+        daily_fees[code] = prices['fixed'].get('Fixed', 0.0)
+        demand = prices['demand']
+        if 'Summer Dmd' in demand:
+            demand_charges[code] = {'summer': demand['Summer Dmd'], 'non_summer': demand['Non-sum. Dmd']}
+    return tariffs, daily_fees, demand_charges
+
+
 ###############################################################################
-# Demand Charges
+# Daily Fees and Demand Charges
 ###############################################################################
-# These are the monthly $/kW (or $/kVA) charges for demand-based tariffs.
-# Multiply by the measured maximum demand, then prorate for the billing period.
+# Daily fees are $/day. Demand charges are $/kW/month, at a higher rate in summer
+# (December to March); multiply by the measured maximum demand, then prorate for the
+# billing period.
+
+tariffs, daily_fees, demand_charges = _approved_tables(DISTRIBUTOR)
+
+SUMMER_MONTHS = (12, 1, 2, 3)
 
-demand_charges = {
-    'VICR_DEMAND': 15.00,  # Residential Demand
-    'VICS_DEMAND': 30.00   # Small Business Demand
+# Demand is the largest 30-minute demand between 3pm and 9pm on weekdays (see
+# energex.get_demand_windows()), measured separately in summer: summer_demand_kw is the
+# summer demand and demand_kw the demand in the rest of the year.
+_WEEKDAY_EVENINGS = {'windows': [(time(15, 0), time(21, 0))], 'weekdays': (0, 1, 2, 3, 4), 'method': 'max'}
+_SEASONAL = {
+    'demand_kw': dict(_WEEKDAY_EVENINGS, months=tuple(m for m in range(1, 13) if m not in SUMMER_MONTHS)),
+    'summer_demand_kw': dict(_WEEKDAY_EVENINGS, months=SUMMER_MONTHS),
+}
+demand_windows = {
+    'VICR_DEMAND': _SEASONAL,
+    'VICS_DEMAND': _SEASONAL,
 }
 
-def calculate_demand_fee(tariff_code: str, demand_kw: float, days: int = 30):
+def get_demand_windows(tariff_code: str):
+    """
+    Get the demand windows for a given tariff code, see energex.get_demand_windows().
+    """
+    return demand_windows.get(str(tariff_code))
+
+def calculate_demand_fee(tariff_code: str, demand_kw: float, days: int = 30, *, summer_demand_kw: float = None):
     """
     Calculate the demand fee for a given tariff code, demand amount (kW),
     and number of days in the billing period.
+
+    demand_kw is charged at the non-summer rate and summer_demand_kw, the demand in
+    summer months, at the summer rate.
     """
     # Strip down to the first part of the code if needed, or just use the full code:
     tariff_code = str(tariff_code)
@@ -105,11 +130,14 @@ def calculate_demand_fee(tariff_code: str, demand_kw: float, days: int = 30):
     if tariff_code not in demand_charges:
         return 0.0
 
-    charge_per_kw_per_month = demand_charges[tariff_code]
+    charges = demand_charges[tariff_code]
+    monthly_charge = charges['non_summer'] * demand_kw
+    if summer_demand_kw is not None:
+        monthly_charge = monthly_charge + charges['summer'] * summer_demand_kw
 
     # Convert the charge to a daily rate
-    daily_rate = charge_per_kw_per_month / 30
-    total_charge = demand_kw * daily_rate * days
+    daily_rate = monthly_charge / 30
+    total_charge = daily_rate * days
     return total_charge
 
 def get_daily_fee(tariff_code: str, annual_usage: float = None):
@@ -148,6 +176,21 @@ def get_periods(tariff_code: str):
         raise ValueError(f"Unknown tariff code: {tariff_code}")
     return tariff['periods']
 
+def get_rules(tariff_code: str):
+    """
+    Describe how convert() resolves a tariff, for the vectorized converters.
+    See energex.get_rules for the layout of the returned dict.
+    """
+    tariff = tariffs.get(tariff_code)
+    if not tariff:
+        return {'variants': [], 'wrap': True, 'fallback': (1.0, 5.0)}
+
+    if isinstance(tariff['rate'], dict):
+        rate = list(tariff['rate'].values())[0]
+    else:
+        rate = tariff['rate']
+    return {'variants': [(None, None, tariff['periods'])], 'wrap': True, 'fallback': (1.0, rate)}
+
 def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
     """
     Convert RRP from $/MWh to c/kWh for a Victorian network.
@@ -177,14 +220,9 @@ def convert(interval_datetime: datetime, tariff_code: str, rrp: float):
 
     # Identify which period the local_time falls in
     for period_name, start, end, rate in tariff['periods']:
-        # Handle periods that wrap past midnight (if start > end)
-        if start < end:
-            if start <= local_time < end:
-                return rrp_c_kwh + rate
-        else:
-            # For example, if the period is 22:00 to 07:00
-            if local_time >= start or local_time < end:
-                return rrp_c_kwh + rate
+        # Periods with start > end wrap past midnight, e.g. 22:00 to 07:00
+        if in_period(local_time, start, end):
+            return rrp_c_kwh + rate
 
     # Fallback to the "default" rate if no period matched
     if isinstance(tariff['rate'], dict):
@@ -0,0 +1,40 @@
+# benchmarks/bench_aer_import.py
+"""
+Time a bulk import of every AER workbook, a no-op re-import, and opening the store.
+
+Run with: python -m benchmarks.bench_aer_import
+"""
+import os
+import tempfile
+import time
+import timeit
+
+from aemo_to_tariff.aer_import import import_workbooks, DEFAULT_WORKBOOKS
+from aemo_to_tariff.tariff_store import TariffStore
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'aer_tariffs.bin')
+
+        began = time.perf_counter()
+        read = import_workbooks(DEFAULT_WORKBOOKS, path)
+        print(f"bulk import of {len(read)} workbooks   {(time.perf_counter() - began) * 1e3:8.1f} ms  "
+              f"({os.path.getsize(path)} bytes)")
+
+        began = time.perf_counter()
+        import_workbooks(DEFAULT_WORKBOOKS, path)
+        print(f"unchanged re-import            {(time.perf_counter() - began) * 1e3:8.1f} ms")
+
+        number = 1000
+        seconds = timeit.timeit(lambda: TariffStore(path).close(), number=number)
+        print(f"open store                     {seconds / number * 1e6:8.1f} us")
+
+        store = TariffStore(path)
+        seconds = timeit.timeit(lambda: store.get('energex', '6900'), number=number)
+        print(f"look up one tariff             {seconds / number * 1e6:8.1f} us ({store.tariff_count} tariffs)")
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+# benchmarks/bench_battery.py
+"""
+Time the battery optimiser over a 48 hour, 5-minute horizon for growing fleets.
+
+Run with: python -m benchmarks.bench_battery
+"""
+import time
+
+import numpy as np
+
+from aemo_to_tariff.battery import optimise_battery
+
+TIMES = np.datetime64('2024-07-01T14:00') + np.arange(2 * 288) * 5
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for sites in (1, 100, 1000, 5000):
+        rrps = rng.normal(80, 80, (sites, len(TIMES)))
+        load = rng.gamma(2.0, 0.05, (sites, len(TIMES)))
+        began = time.perf_counter()
+        dispatch = optimise_battery(TIMES, 'Energex', '3700', rrps, 13.5, 5.0, load_kwh=load, export_price=5.0)
+        seconds = time.perf_counter() - began
+        print(f"{sites:5d} sites  {seconds:7.3f} s  ({seconds / sites * 1e3:6.2f} ms per site, "
+              f"mean cost ${dispatch.cost.mean():.2f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_billing.py
+"""
+Time a year of 5-minute data through calculate_bill() and a NEM12 file of many NMIs
+through bill_nem12().
+
+Run with: python -m benchmarks.bench_billing
+"""
+import io
+import time
+
+import numpy as np
+
+from aemo_to_tariff.billing import calculate_bill, bill_nem12
+
+CASES = [('Energex', '3700'), ('SAPN', 'RTOU'), ('tasnetworks', 'TAS94'), ('Endeavour', 'N71')]
+NMIS = 200
+DAYS = 365
+
+
+def make_nem12(nmis, days, interval=30, seed=0):
+    rng = np.random.default_rng(seed)
+    out = io.StringIO()
+    out.write('100,NEM12,202501010000,MDPX,RETAILX\n')
+    first = np.datetime64('2024-01-01')
+    for k in range(nmis):
+        out.write(f'200,QB{k:08d},E1,1,E1,N1,M{k},KWH,{interval},20250101\n')
+        for d in range(days):
+            values = ','.join(f'{v:.3f}' for v in rng.random(1440 // interval))
+            out.write(f"300,{str(first + d).replace('-', '')},{values},A,,,20250101000000,20250101000000\n")
+    out.write('900\n')
+    return io.BytesIO(out.getvalue().encode('ascii'))
+
+
+def main():
+    start = np.datetime64('2024-01-01T00:00')
+    times = start + np.arange(288 * DAYS) * 5
+    kwh = np.random.default_rng(0).random(len(times)) * 0.2
+    rrps = np.random.default_rng(1).random(len(times)) * 300
+
+    for network, tariff in CASES:
+        calculate_bill(network, tariff, times, kwh, rrps)
+        began = time.perf_counter()
+        calculate_bill(network, tariff, times, kwh, rrps)
+        print(f"{network:12s} {tariff:6s} one site-year of 5-minute data {(time.perf_counter() - began) * 1e3:6.1f} ms")
+
+    source = make_nem12(NMIS, DAYS)
+    began = time.perf_counter()
+    count = sum(1 for _ in bill_nem12(source, 'Energex', '3700'))
+    elapsed = time.perf_counter() - began
+    print(f"NEM12 {count} NMIs x {DAYS} days of 30-minute data: {elapsed:.2f} s ({elapsed / count * 1e3:.1f} ms/NMI)")
+
+
+if __name__ == '__main__':
+    main()
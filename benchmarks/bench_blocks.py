@@ -0,0 +1,62 @@
+# benchmarks/bench_blocks.py
+"""
+Time inclining block pricing for a fleet of sites over a year of monthly billing
+periods, against walking each site's usage with a running total in Python.
+
+Run with: python -m benchmarks.bench_blocks
+"""
+import time
+
+import numpy as np
+
+from aemo_to_tariff.blocks import block_prices, get_block_thresholds
+from aemo_to_tariff.endeavour import tariffs
+
+SITES = 1000
+DAYS = 365
+LOOP_SITES = 20
+
+
+def walk(times, kwh):
+    """Price one site interval by interval with a running total, restarted each month."""
+    rates = [rate for _, _, _, rate in tariffs['N90']['periods']]
+    per_day = get_block_thresholds('Endeavour', 'N90')[0]
+    local = (times + np.timedelta64(10, 'h')).astype('datetime64[D]')
+    months = local.astype('datetime64[M]')
+    days = {month: len(np.unique(local[months == month])) for month in np.unique(months)}
+    prices = []
+    used = 0.0
+    month = None
+    for interval_month, energy in zip(months.tolist(), kwh.tolist()):
+        if interval_month != month:
+            month, used = interval_month, 0.0
+            threshold = per_day * days[np.datetime64(month, 'M')]
+        first = min(max(threshold - used, 0.0), energy)
+        used += energy
+        prices.append((first * rates[0] + (energy - first) * rates[1]) / energy if energy else
+                      rates[used > threshold])
+    return prices
+
+
+def main():
+    # Sydney is UTC+10 from April to October; the loop below ignores daylight saving
+    times = np.datetime64('2024-03-31T14:00') + np.arange(48 * DAYS) * 30
+    kwh = np.random.default_rng(0).random((SITES, len(times))) * 1.2
+
+    began = time.perf_counter()
+    block_prices('Endeavour', 'N90', times, kwh)
+    vectorized = time.perf_counter() - began
+
+    began = time.perf_counter()
+    for site in range(LOOP_SITES):
+        walk(times, kwh[site])
+    loop = (time.perf_counter() - began) / LOOP_SITES * SITES
+
+    print(f"N90 {SITES} sites x {DAYS} days of 30-minute data, monthly billing")
+    print(f"  block_prices()      {vectorized * 1e3:8.1f} ms")
+    print(f"  running-total loop  {loop * 1e3:8.1f} ms (extrapolated from {LOOP_SITES} sites)")
+    print(f"  speed-up            {loop / vectorized:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
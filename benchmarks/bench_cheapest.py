@@ -0,0 +1,32 @@
+# benchmarks/bench_cheapest.py
+"""
+Time cheapest-interval and cheapest-window queries over a two-day 5-minute horizon.
+
+Run with: python -m benchmarks.bench_cheapest
+"""
+import timeit
+
+import numpy as np
+
+from aemo_to_tariff.cheapest import delivered_prices, cheapest_intervals, cheapest_window
+
+TIMES = np.datetime64('2024-07-01T14:00') + np.arange(2 * 288) * 5
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for sites in (1, 100, 1000):
+        rrps = rng.normal(80, 60, (sites, len(TIMES)))
+        allowed = np.ones(len(TIMES), dtype=bool)
+        allowed[200:260] = False
+        number = max(10, 2000 // sites)
+        convert = timeit.timeit(lambda: delivered_prices(TIMES, 'Energex', '6900', rrps), number=number) / number
+        prices = delivered_prices(TIMES, 'Energex', '6900', rrps)
+        intervals = timeit.timeit(lambda: cheapest_intervals(prices, 48, allowed), number=number) / number
+        window = timeit.timeit(lambda: cheapest_window(prices, 36, allowed), number=number) / number
+        print(f"{sites:5d} sites  delivered prices {convert * 1e3:7.3f} ms  cheapest 48 intervals "
+              f"{intervals * 1e3:7.3f} ms  cheapest 3 h window {window * 1e3:7.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
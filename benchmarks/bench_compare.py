@@ -0,0 +1,40 @@
+# benchmarks/bench_compare.py
+"""
+Rank every Energex tariff for a book of 10,000 customers with a year of half-hourly data.
+
+Run with: python -m benchmarks.bench_compare [workers]
+"""
+import sys
+import time
+
+import numpy as np
+
+from aemo_to_tariff.compare import compare_customers
+
+CUSTOMERS = 10_000
+CHUNK = 250
+DAYS = 365
+
+
+def loads(times):
+    rng = np.random.default_rng(0)
+    for _ in range(CUSTOMERS // CHUNK):
+        yield rng.random((CHUNK, len(times)), dtype=np.float32) * 0.6
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    times = np.datetime64('2023-12-31T14:00') + np.arange(48 * DAYS) * 30
+    rrps = np.random.default_rng(1).random(len(times)) * 300
+
+    began = time.perf_counter()
+    count = 0
+    for comparison in compare_customers('Energex', times, loads(times), rrps, workers=workers):
+        count += len(comparison.total)
+    elapsed = time.perf_counter() - began
+    print(f"{count} customers x {len(comparison.tariffs)} tariffs x {DAYS} days of 30-minute data: "
+          f"{elapsed:.1f} s ({elapsed / count * 1e3:.2f} ms/customer)")
+
+
+if __name__ == '__main__':
+    main()
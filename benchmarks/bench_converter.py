@@ -0,0 +1,39 @@
+# benchmarks/bench_converter.py
+"""
+Compare per-call cost of spot_to_tariff() against a pre-bound converter.
+
+Run with: python -m benchmarks.bench_converter
+"""
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from aemo_to_tariff import spot_to_tariff, get_converter
+
+CASES = [('Energex', '6900'), ('SAPN', 'RTOU'), ('tasnetworks', 'TAS94'), ('Endeavour', 'N71')]
+N = 288 * 30
+
+
+def main():
+    start = datetime(2024, 7, 1, tzinfo=timezone.utc)
+    times = [start + timedelta(minutes=5 * i) for i in range(N)]
+    rrps = [50.0 + i % 200 for i in range(N)]
+
+    for network, tariff in CASES:
+        convert = get_converter(network, tariff)
+
+        def scalar():
+            for t, rrp in zip(times, rrps):
+                spot_to_tariff(t, network, tariff, rrp)
+
+        def bound():
+            for t, rrp in zip(times, rrps):
+                convert(t, rrp)
+
+        scalar_s = min(timeit.repeat(scalar, number=1, repeat=3))
+        bound_s = min(timeit.repeat(bound, number=1, repeat=3))
+        print(f"{network:12s} {tariff:6s} spot_to_tariff {scalar_s / N * 1e9:7.0f} ns/call  "
+              f"converter {bound_s / N * 1e9:7.0f} ns/call  speedup {scalar_s / bound_s:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+# benchmarks/bench_demand.py
+"""
+Time billed demand and demand fees for a fleet of sites in one calculate_demand() call.
+
+Run with: python -m benchmarks.bench_demand
+"""
+import time
+
+import numpy as np
+
+from aemo_to_tariff.demand import calculate_demand
+
+CASES = [('Energex', '3700'), ('Energex', '8100'), ('SAPN', 'RPRO'), ('tasnetworks', 'TAS87'), ('Victoria', 'VICR_DEMAND')]
+SITES = 1000
+DAYS = 30
+
+
+def main():
+    times = np.datetime64('2024-06-30T14:00') + np.arange(288 * DAYS) * 5
+    kw = np.random.default_rng(0).random((SITES, len(times))) * 5
+
+    for network, tariff in CASES:
+        began = time.perf_counter()
+        calculate_demand(network, tariff, times, kw)
+        elapsed = time.perf_counter() - began
+        print(f"{network:12s} {tariff:12s} {SITES} sites x {DAYS} days of 5-minute data "
+              f"{elapsed * 1e3:7.1f} ms ({elapsed / SITES * 1e6:5.0f} us/site)")
+
+
+if __name__ == '__main__':
+    main()
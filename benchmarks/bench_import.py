@@ -0,0 +1,64 @@
+# benchmarks/bench_import.py
+"""
+Measure start-up cost of a process that prices a single network.
+
+Each scenario runs in a fresh interpreter; the time reported is the cost of the
+import and first conversion, excluding interpreter start-up.
+
+Run with: python -m benchmarks.bench_import
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+CHILD = '''
+import json, resource, sys, time
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'networks_loaded': sorted(m for m in sys.modules if m.startswith('aemo_to_tariff.')),
+    'numpy_loaded': 'numpy' in sys.modules,
+}}))
+'''
+
+PRICE_ONE = '''
+from datetime import datetime, timezone
+from aemo_to_tariff import spot_to_tariff
+spot_to_tariff(datetime(2024, 7, 1, tzinfo=timezone.utc), 'Energex', '6900', 100.0)
+'''
+
+SCENARIOS = {
+    'price one network': PRICE_ONE,
+    'price one network, all networks loaded': PRICE_ONE + '''
+import importlib
+from aemo_to_tariff.registry import NETWORKS
+for module in NETWORKS.values():
+    importlib.import_module(module)
+''',
+    'batch price one network': '''
+import numpy as np
+from aemo_to_tariff import spot_to_tariff_many
+spot_to_tariff_many(np.array(['2024-07-01T00:00'], dtype='datetime64[us]'), 'Energex', '6900', [100.0])
+''',
+}
+
+
+def run(body, repeat=15):
+    results = [json.loads(subprocess.check_output([sys.executable, '-c', CHILD.format(body=body)]))
+               for _ in range(repeat)]
+    return statistics.median(r['seconds'] for r in results), results[-1]
+
+
+def main():
+    for name, body in SCENARIOS.items():
+        seconds, last = run(body)
+        print(f"{name:40s} {seconds * 1000:7.2f} ms  max RSS {last['max_rss_kb'] / 1024:6.1f} MB  "
+              f"numpy {'yes' if last['numpy_loaded'] else 'no ':3s}  modules: {', '.join(last['networks_loaded'])}")
+
+
+if __name__ == '__main__':
+    main()
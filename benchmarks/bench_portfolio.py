@@ -0,0 +1,62 @@
+# benchmarks/bench_portfolio.py
+"""
+Price a day of 5-minute intervals for 10k and 100k sites spread over every tariff of
+three networks, as one matrix and streamed a site at a time, against calling
+spot_to_tariff_many() per site.
+
+Run with: python -m benchmarks.bench_portfolio
+"""
+import time
+
+import numpy as np
+
+from aemo_to_tariff import spot_to_tariff_many
+from aemo_to_tariff.portfolio import portfolio_prices, iter_portfolio_prices
+from aemo_to_tariff.registry import get_network
+
+TIMES = np.datetime64('2024-07-01T14:00') + np.arange(288) * 5
+NETWORKS = ('energex', 'sapn', 'ausgrid')
+PER_SITE_SAMPLE = 1000
+
+
+def site_table(count, rng):
+    tariffs = [(network, tariff) for network in NETWORKS for tariff in get_network(network).tariffs]
+    picks = rng.integers(len(tariffs), size=count)
+    return {
+        'network': [tariffs[i][0] for i in picks],
+        'tariff': [tariffs[i][1] for i in picks],
+        'dlf': rng.uniform(1.0, 1.1, count),
+        'mlf': rng.uniform(0.95, 1.05, count),
+    }
+
+
+def main():
+    rng = np.random.default_rng(0)
+    rrps = rng.normal(80, 60, len(TIMES))
+    for count in (10_000, 100_000):
+        sites = site_table(count, rng)
+
+        start = time.perf_counter()
+        prices = portfolio_prices(sites, TIMES, rrps)
+        matrix_s = time.perf_counter() - start
+        del prices
+
+        start = time.perf_counter()
+        for _ in iter_portfolio_prices(sites, TIMES, rrps):
+            pass
+        stream_s = time.perf_counter() - start
+
+        # Timed on a sample and scaled, it takes minutes at 100k sites
+        start = time.perf_counter()
+        for i in range(PER_SITE_SAMPLE):
+            spot_to_tariff_many(TIMES, sites['network'][i], sites['tariff'][i], rrps, sites['dlf'][i], sites['mlf'][i])
+        per_site_s = (time.perf_counter() - start) * count / PER_SITE_SAMPLE
+
+        values = count * len(TIMES)
+        print(f"{count:7d} sites  matrix {matrix_s:6.2f} s ({values / matrix_s / 1e6:6.1f} M prices/s)  "
+              f"streamed {stream_s:6.2f} s  per-site calls {per_site_s:6.2f} s  "
+              f"speedup {per_site_s / matrix_s:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+# benchmarks/bench_schedule.py
+"""
+Time next_transition() and day_profile() against scanning a day of 5-minute rates.
+
+Run with: python -m benchmarks.bench_schedule
+"""
+import timeit
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from aemo_to_tariff.batch import versioned_rates
+from aemo_to_tariff.schedule import next_transition, day_profile
+
+NUMBER = 2000
+AT = datetime(2024, 7, 2, 3, 7, tzinfo=timezone.utc)
+
+
+def _scan(network, tariff, at):
+    micros = int(at.timestamp()) * 1_000_000 + np.arange(2 * 288, dtype=np.int64) * 300_000_000
+    slope, intercept = versioned_rates(network, tariff, micros)
+    return np.flatnonzero((slope != slope[0]) | (intercept != intercept[0]))[:1]
+
+
+def main():
+    for network, tariff in (('energex', '6900'), ('sapn', 'RTOU'), ('ausgrid', 'EA025'), ('energex', '3700')):
+        found = next_transition(network, tariff, AT)
+        transition = timeit.timeit(lambda: next_transition(network, tariff, AT), number=NUMBER) / NUMBER
+        scan = timeit.timeit(lambda: _scan(network, tariff, AT), number=NUMBER) / NUMBER
+        days = [date(2024, 7, 1) + timedelta(days=i) for i in range(NUMBER)]
+        iterator = iter(days)
+        profile = timeit.timeit(lambda: day_profile(network, tariff, next(iterator)), number=NUMBER) / NUMBER
+        print(f"{network:8s} {tariff:6s} next change {str(found):26s} next_transition {transition * 1e6:6.1f} us  "
+              f"2-day scan {scan * 1e6:6.1f} us  day_profile {profile * 1e6:6.1f} us")
+
+
+if __name__ == '__main__':
+    main()
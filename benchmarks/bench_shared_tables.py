@@ -0,0 +1,65 @@
+# benchmarks/bench_shared_tables.py
+"""
+Compare worker start-up with each worker compiling every tariff against workers
+mapping one shared tables file.
+
+Run with: python -m benchmarks.bench_shared_tables
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from aemo_to_tariff.registry import NETWORKS
+from aemo_to_tariff.shared_tables import write_tables, use_shared_tables
+from aemo_to_tariff.slots import compile_tariff
+from aemo_to_tariff.versions import version_index
+
+WORKERS = 4
+# Fresh workers, so none inherit tariffs this process compiled
+CONTEXT = multiprocessing.get_context('spawn')
+
+
+def _private_kb():
+    """Resident memory not shared with other processes (Linux)."""
+    with open('/proc/self/statm') as handle:
+        _, resident, shared = map(int, handle.read().split()[:3])
+    return (resident - shared) * os.sysconf('SC_PAGE_SIZE') // 1024
+
+def _touch_every_tariff(_):
+    """What a worker does before it can price anything: get every compiled tariff."""
+    before = _private_kb()
+    began = time.perf_counter()
+    for network in NETWORKS:
+        for module in version_index(network).modules:
+            for tariff in module.tariffs:
+                compile_tariff(module, tariff)
+    seconds = time.perf_counter() - began
+    return seconds, _private_kb() - before
+
+def _run(initializer=None, initargs=()):
+    began = time.perf_counter()
+    with ProcessPoolExecutor(WORKERS, mp_context=CONTEXT, initializer=initializer, initargs=initargs) as executor:
+        results = list(executor.map(_touch_every_tariff, range(WORKERS)))
+    total = time.perf_counter() - began
+    return total, max(seconds for seconds, _ in results), max(kb for _, kb in results)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tables.bin')
+        began = time.perf_counter()
+        count = write_tables(path)
+        print(f"write {count} tariffs                {(time.perf_counter() - began) * 1e3:8.1f} ms  "
+              f"({os.path.getsize(path)} bytes)")
+
+        for name, initializer, initargs in (('compile in each worker', None, ()),
+                                            ('map shared tables', use_shared_tables, (path,))):
+            total, per_worker, kb = _run(initializer, initargs)
+            print(f"{name:24s} pool {total * 1e3:8.1f} ms, tariffs ready in {per_worker * 1e3:7.1f} ms, "
+                  f"+{kb} KB private memory per worker")
+
+
+if __name__ == '__main__':
+    main()
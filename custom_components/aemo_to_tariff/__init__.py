@@ -1,26 +1,153 @@
-from homeassistant.core import HomeAssistant
+import numpy as np
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
-from aemo_to_tariff import spot_to_tariff, get_daily_fee, calculate_demand_fee
+from aemo_to_tariff import get_daily_fee, calculate_demand_fee, spot_to_tariff_many
+from aemo_to_tariff.versions import version_index
 
 DOMAIN = "aemo_to_tariff"
 
+# Calls with more intervals (or demands) than this are priced in the executor, so bulk
+# requests from automations don't hold up the event loop. So is the first call for each
+# network and tariff, which loads the network and compiles the tariff's tables.
+EXECUTOR_THRESHOLD = 48
+
+DEFAULT_DLF = 1.05905
+DEFAULT_MLF = 1.0154
+DEFAULT_MARKET = 1.0154
+
+INTERVAL_SCHEMA = vol.Schema({
+    vol.Required("interval_time"): cv.datetime,
+    vol.Required("rrp"): vol.Coerce(float),
+})
+
+CONVERT_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required("network"): cv.string,
+        vol.Required("tariff"): cv.string,
+        vol.Optional("interval_time"): cv.datetime,
+        vol.Optional("rrp"): vol.Coerce(float),
+        vol.Optional("intervals"): [INTERVAL_SCHEMA],
+        vol.Optional("dlf", default=DEFAULT_DLF): vol.Coerce(float),
+        vol.Optional("mlf", default=DEFAULT_MLF): vol.Coerce(float),
+        vol.Optional("market", default=DEFAULT_MARKET): vol.Coerce(float),
+    }),
+    cv.has_at_least_one_key("intervals", "interval_time"),
+    cv.key_dependency("interval_time", "rrp"),
+)
+
+DAILY_FEE_SCHEMA = vol.Schema({
+    vol.Required("network"): cv.string,
+    vol.Required("tariff"): vol.Any(cv.string, [cv.string]),
+    vol.Optional("annual_usage"): vol.Coerce(float),
+})
+
+DEMAND_FEE_SCHEMA = vol.Schema({
+    vol.Required("network"): cv.string,
+    vol.Required("tariff"): cv.string,
+    vol.Required("demand_kw"): vol.Any(vol.Coerce(float), [vol.Coerce(float)]),
+    vol.Optional("days", default=30): vol.Coerce(int),
+})
+
+
+def _convert(network, tariff, intervals, dlf, mlf, market):
+    """Price (interval_time, rrp) pairs; naive times are in Home Assistant's time zone."""
+    times = [dt_util.as_utc(when) for when, _ in intervals]
+    prices = spot_to_tariff_many(times, network, tariff, [rrp for _, rrp in intervals], dlf, mlf, market)
+    return [float(price) for price in prices]
+
+def _daily_fees(network, tariffs, annual_usage):
+    return {tariff: get_daily_fee(network, tariff, annual_usage) for tariff in tariffs}
+
+def _demand_fees(network, tariff, demand_kw, days):
+    fees = calculate_demand_fee(network, tariff, np.asarray(demand_kw, dtype=float), days)
+    return np.broadcast_to(fees, (len(demand_kw),)).astype(float).tolist()
+
+def _prepare(network, tariff=None):
+    """
+    Load a network's modules and tariff versions and, given a tariff, compile its tables
+    for every version along with its time zone's transitions and holiday calendar.
+    """
+    starts = list(version_index(network).starts)
+    if tariff is None:
+        return
+    # An instant in each version: now, the start of each later one, and a day before the first
+    instants = [dt_util.utcnow().timestamp()] + starts
+    if starts:
+        instants.append(starts[0] - 86400)
+    times = np.array(instants, dtype=float).astype("datetime64[s]")
+    spot_to_tariff_many(times, network, tariff, np.zeros(len(times)))
+
+def _prepare_and_call(network, tariff, function, *args):
+    _prepare(network, tariff)
+    return function(*args)
+
+async def _run(hass: HomeAssistant, size: int, network, tariff, function, *args):
+    """
+    Run small requests for prepared tariffs on the event loop, and the rest in the executor.
+
+    Parameters:
+    - size (int): The number of intervals or demands in the request.
+    - network (str): The network the request loads.
+    - tariff (str): The tariff whose tables it looks up, or None if it doesn't use them.
+    - function: Called with args.
+    """
+    prepared = hass.data.setdefault(DOMAIN, {}).setdefault("prepared", set())
+    key = (network, tariff)
+    if size <= EXECUTOR_THRESHOLD and key in prepared:
+        return function(*args)
+    result = await hass.async_add_executor_job(_prepare_and_call, network, tariff, function, *args)
+    prepared.add(key)
+    return result
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the AEMO to Tariff component."""
 
-    def convert_spot_to_tariff(interval_time, network, tariff, rrp, dlf=1.05905, mlf=1.0154, market=1.0154):
-        return spot_to_tariff(interval_time, network, tariff, rrp, dlf, mlf, market)
+    async def convert_spot_to_tariff(call: ServiceCall) -> ServiceResponse:
+        data = call.data
+        if "intervals" in data:
+            intervals = [(interval["interval_time"], interval["rrp"]) for interval in data["intervals"]]
+        else:
+            intervals = [(data["interval_time"], data["rrp"])]
+        prices = await _run(hass, len(intervals), data["network"], data["tariff"], _convert,
+                            data["network"], data["tariff"], intervals, data["dlf"], data["mlf"], data["market"])
+        if "intervals" in data:
+            return {"prices": prices}
+        return {"price": prices[0]}
 
-    def get_tariff_daily_fee(network, tariff, annual_usage=None):
-        return get_daily_fee(network, tariff, annual_usage)
+    async def get_tariff_daily_fee(call: ServiceCall) -> ServiceResponse:
+        data = call.data
+        tariffs = data["tariff"]
+        if isinstance(tariffs, str):
+            fee = await _run(hass, 1, data["network"], None, get_daily_fee, data["network"], tariffs, data.get("annual_usage"))
+            return {"daily_fee": fee}
+        fees = await _run(hass, len(tariffs), data["network"], None, _daily_fees, data["network"], tariffs,
+                          data.get("annual_usage"))
+        return {"daily_fees": fees}
 
-    def get_tariff_demand_fee(network, tariff, demand_kw, days=30):
-        return calculate_demand_fee(network, tariff, demand_kw, days)
+    async def get_tariff_demand_fee(call: ServiceCall) -> ServiceResponse:
+        data = call.data
+        demand_kw = data["demand_kw"]
+        if not isinstance(demand_kw, list):
+            fee = await _run(hass, 1, data["network"], None, calculate_demand_fee, data["network"], data["tariff"],
+                             demand_kw, data["days"])
+            return {"demand_fee": float(fee)}
+        fees = await _run(hass, len(demand_kw), data["network"], None, _demand_fees, data["network"], data["tariff"],
+                          demand_kw, data["days"])
+        return {"demand_fees": fees}
 
-    hass.services.async_register(DOMAIN, "convert_spot_to_tariff", convert_spot_to_tariff)
-    hass.services.async_register(DOMAIN, "get_tariff_daily_fee", get_tariff_daily_fee)
-    hass.services.async_register(DOMAIN, "get_tariff_demand_fee", get_tariff_demand_fee)
+    hass.services.async_register(DOMAIN, "convert_spot_to_tariff", convert_spot_to_tariff,
+                                 schema=CONVERT_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
+    hass.services.async_register(DOMAIN, "get_tariff_daily_fee", get_tariff_daily_fee,
+                                 schema=DAILY_FEE_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
+    hass.services.async_register(DOMAIN, "get_tariff_demand_fee", get_tariff_demand_fee,
+                                 schema=DEMAND_FEE_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
 
     return True
 
@@ -0,0 +1,193 @@
+import logging
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant, callback, Event
+from homeassistant.helpers.event import async_track_state_change_event, async_track_point_in_utc_time
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+from aemo_to_tariff import spot_to_tariff_many
+from aemo_to_tariff.schedule import next_transition
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RRP_SENSOR = 'sensor.current_rrp'
+# Forecasts are read from a list of {time key: start time, price key: RRP in $/MWh}
+# dicts in this attribute of the forecast sensor, e.g. predispatch intervals
+DEFAULT_FORECAST_ATTRIBUTE = 'forecasts'
+FORECAST_TIME_KEYS = ('start_time', 'period_start', 'time')
+FORECAST_PRICE_KEYS = ('rrp', 'price')
+
+# How far ahead to look for the next rate change; tariffs with none by then are
+# checked again at the end of the horizon
+BOUNDARY_HORIZON = timedelta(days=2)
+
+# The current price of one tariff and its prices over the forecast intervals, in c/kWh
+TariffPrices = namedtuple('TariffPrices', ['price', 'rrp', 'forecast_times', 'forecast'])
+
+
+def next_boundary(network, tariff, now):
+    """
+    Find the next time a tariff's rate changes, see aemo_to_tariff.schedule.next_transition().
+
+    Parameters:
+    - network (str): The name of the network.
+    - tariff (str): The tariff code.
+    - now (datetime): An aware datetime.
+
+    Returns:
+    - datetime: When the rate changes, or the end of the horizon if it doesn't change before then.
+    """
+    found = next_transition(network, tariff, dt_util.as_utc(now), BOUNDARY_HORIZON)
+    return found if found is not None else now + BOUNDARY_HORIZON
+
+def _first(entry, keys):
+    for key in keys:
+        if key in entry:
+            return entry[key]
+    return None
+
+def _read_forecast(entries):
+    """The forecast intervals as (UTC datetime64[us] array, RRP array), skipping bad entries."""
+    times, rrps = [], []
+    for entry in entries or ():
+        if not isinstance(entry, dict):
+            continue
+        when, rrp = _first(entry, FORECAST_TIME_KEYS), _first(entry, FORECAST_PRICE_KEYS)
+        if isinstance(when, str):
+            when = dt_util.parse_datetime(when)
+        try:
+            rrp = float(rrp)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(when, datetime):
+            times.append(dt_util.as_utc(when).replace(tzinfo=None))
+            rrps.append(rrp)
+    return np.array(times, dtype='datetime64[us]'), np.array(rrps, dtype=float)
+
+
+class TariffCoordinator(DataUpdateCoordinator):
+    """
+    Prices every tariff the sensors of one RRP source need, in one executor job.
+
+    Each (network, tariff) is priced once for the current interval and every forecast
+    interval with a vectorized spot_to_tariff_many() call, however many sensors show
+    it. Refreshes happen when the RRP or forecast changes and at the next rate change
+    of any tracked tariff; data maps (network, tariff) to TariffPrices.
+    """
+
+    def __init__(self, hass: HomeAssistant, rrp_sensor=DEFAULT_RRP_SENSOR, forecast_sensor=None,
+                 forecast_attribute=DEFAULT_FORECAST_ATTRIBUTE):
+        super().__init__(hass, _LOGGER, name=f"AEMO to Tariff ({rrp_sensor})")
+        self.rrp_sensor = rrp_sensor
+        self.forecast_sensor = forecast_sensor
+        self.forecast_attribute = forecast_attribute
+        self.priced_at = None
+        self._tracked = {}
+        self._cancel_boundary = None
+        self._cancel_state = None
+
+    @callback
+    def track(self, network: str, tariff: str):
+        """
+        Start pricing a tariff for a sensor.
+
+        Returns:
+        - callable: Stops tracking it for that sensor.
+        """
+        key = (network, tariff)
+        self._tracked[key] = self._tracked.get(key, 0) + 1
+        if self._cancel_state is None:
+            sources = [self.rrp_sensor] + ([self.forecast_sensor] if self.forecast_sensor else [])
+            self._cancel_state = async_track_state_change_event(self.hass, sources, self._async_source_changed)
+        if self.data is None or key not in self.data:
+            self.hass.async_create_task(self.async_request_refresh())
+
+        @callback
+        def untrack():
+            self._tracked[key] -= 1
+            if not self._tracked[key]:
+                del self._tracked[key]
+            if not self._tracked:
+                self._async_stop()
+        return untrack
+
+    @callback
+    def _async_stop(self):
+        for cancel in (self._cancel_state, self._cancel_boundary):
+            if cancel is not None:
+                cancel()
+        self._cancel_state = self._cancel_boundary = None
+
+    @callback
+    def _async_source_changed(self, event: Event):
+        old_state, new_state = event.data.get('old_state'), event.data.get('new_state')
+        if new_state is None:
+            return
+        if event.data.get('entity_id') == self.rrp_sensor and old_state is not None and old_state.state == new_state.state:
+            return  # Only the RRP sensor's attributes changed
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_boundary(self, now):
+        self._cancel_boundary = None
+        self.hass.async_create_task(self.async_request_refresh())
+
+    async def _async_update_data(self):
+        # Only references are taken on the event loop; parsing and pricing run in the executor
+        state = self.hass.states.get(self.rrp_sensor)
+        try:
+            rrp = float(state.state)
+        except (AttributeError, TypeError, ValueError):
+            rrp = None
+        forecast = None
+        if self.forecast_sensor:
+            forecast_state = self.hass.states.get(self.forecast_sensor)
+            if forecast_state is not None:
+                forecast = forecast_state.attributes.get(self.forecast_attribute)
+
+        now = dt_util.utcnow()
+        data, boundary = await self.hass.async_add_executor_job(
+            self._price, tuple(self._tracked), now, rrp, forecast, self.data or {})
+        self.priced_at = now
+
+        if self._cancel_boundary is not None:
+            self._cancel_boundary()
+        self._cancel_boundary = None
+        if self._tracked:
+            self._cancel_boundary = async_track_point_in_utc_time(self.hass, self._async_boundary, boundary)
+        return data
+
+    def _price(self, tariffs, now, rrp, forecast, previous):
+        forecast_times, forecast_rrps = _read_forecast(forecast)
+        times = np.concatenate(([np.datetime64(now.replace(tzinfo=None), 'us')], forecast_times))
+        rrps = np.concatenate(([np.nan if rrp is None else rrp], forecast_rrps))
+        iso_times = tuple(t.replace(tzinfo=timezone.utc).isoformat() for t in forecast_times.astype(datetime))
+
+        data = {}
+        boundary = now + BOUNDARY_HORIZON
+        for network, tariff in tariffs:
+            prices = spot_to_tariff_many(times, network, tariff, rrps)
+            found = TariffPrices(None if rrp is None else float(prices[0]), rrp, iso_times, prices[1:].tolist())
+            # Unchanged results keep their identity, so sensors can skip writing state
+            data[(network, tariff)] = previous[(network, tariff)] if previous.get((network, tariff)) == found else found
+            boundary = min(boundary, next_boundary(network, tariff, now))
+        return data, boundary
+
+
+@callback
+def get_coordinator(hass: HomeAssistant, domain: str, rrp_sensor=DEFAULT_RRP_SENSOR, forecast_sensor=None,
+                    forecast_attribute=DEFAULT_FORECAST_ATTRIBUTE):
+    """
+    Get the coordinator shared by every sensor with the same RRP and forecast sources.
+
+    Returns:
+    - TariffCoordinator: The coordinator, created on first use.
+    """
+    coordinators = hass.data.setdefault(domain, {}).setdefault('coordinators', {})
+    key = (rrp_sensor, forecast_sensor, forecast_attribute)
+    if key not in coordinators:
+        coordinators[key] = TariffCoordinator(hass, rrp_sensor, forecast_sensor, forecast_attribute)
+    return coordinators[key]
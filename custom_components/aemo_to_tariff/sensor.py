@@ -1,17 +1,28 @@
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
-from aemo_to_tariff import spot_to_tariff
-from datetime import datetime
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-class AEMOToTariffSensor(SensorEntity):
-    def __init__(self, hass, network, tariff):
-        self._hass = hass
+from . import DOMAIN
+from .coordinator import DEFAULT_RRP_SENSOR, DEFAULT_FORECAST_ATTRIBUTE, get_coordinator
+
+
+class AEMOToTariffSensor(CoordinatorEntity, SensorEntity):
+    """
+    A network tariff price that follows an RRP sensor.
+
+    Prices come from the TariffCoordinator shared by every sensor on the same RRP
+    source, which recomputes them when the RRP or forecast changes and when a tariff
+    moves into another period; the sensor itself only reads its entry.
+    """
+    _attr_should_poll = False
+
+    def __init__(self, coordinator, network, tariff):
+        super().__init__(coordinator)
         self._network = network
         self._tariff = tariff
-        self._state = None
-        self._attributes = {}
+        self._prices = None
 
     @property
     def name(self):
@@ -19,27 +30,33 @@ class AEMOToTariffSensor(SensorEntity):
 
     @property
     def state(self):
-        return self._state
+        return None if self._prices is None else self._prices.price
 
     @property
     def extra_state_attributes(self):
-        return self._attributes
-
-    def update(self):
-        # Get the current RRP from another sensor or integration
-        rrp = self._hass.states.get('sensor.current_rrp').state
-
-        # Get the current time
-        now = datetime.now()
+        if self._prices is None:
+            return {'network': self._network, 'tariff': self._tariff}
+        return {
+            'interval_time': self.coordinator.priced_at,
+            'network': self._network,
+            'tariff': self._tariff,
+            'rrp': self._prices.rrp,
+            'forecast_times': self._prices.forecast_times,
+            'forecast': self._prices.forecast,
+        }
 
-        # Convert RRP to tariff price
-        tariff_price = spot_to_tariff(now, self._network, self._tariff, float(rrp))
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.track(self._network, self._tariff))
+        self._prices = (self.coordinator.data or {}).get((self._network, self._tariff))
 
-        self._state = tariff_price
-        self._attributes['interval_time'] = now
-        self._attributes['network'] = self._network
-        self._attributes['tariff'] = self._tariff
-        self._attributes['rrp'] = rrp
+    @callback
+    def _handle_coordinator_update(self):
+        prices = (self.coordinator.data or {}).get((self._network, self._tariff))
+        if prices is self._prices:
+            return  # The coordinator keeps unchanged prices, so there is nothing to write
+        self._prices = prices
+        self.async_write_ha_state()
 
 async def async_setup_platform(
     hass: HomeAssistant,
@@ -49,4 +66,7 @@ async def async_setup_platform(
 ) -> None:
     network = config.get('network')
     tariff = config.get('tariff')
-    async_add_entities([AEMOToTariffSensor(hass, network, tariff)])
+    coordinator = get_coordinator(hass, DOMAIN, config.get('rrp_sensor', DEFAULT_RRP_SENSOR),
+                                  config.get('forecast_sensor'),
+                                  config.get('forecast_attribute', DEFAULT_FORECAST_ATTRIBUTE))
+    async_add_entities([AEMOToTariffSensor(coordinator, network, tariff)])
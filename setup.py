@@ -12,7 +12,13 @@ setup(
     packages=find_packages(exclude=["custom_components", "custom_components.*"]),
     install_requires=[
         'pytz',
+        'numpy',
     ],
+    extras_require={
+        # Only needed to rebuild the tariff store from the AER workbooks
+        'aer': ['openpyxl'],
+    },
+    package_data={'aemo_to_tariff': ['data/*.bin']},
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
@@ -0,0 +1,94 @@
+import itertools
+import unittest
+import numpy as np
+from aemo_to_tariff.battery import optimise_battery, demand_penalties
+from aemo_to_tariff.cheapest import delivered_prices
+from aemo_to_tariff.convert import calculate_demand_fee
+
+START = np.datetime64('2024-07-01T14:00')  # Brisbane midnight
+
+def path_cost(levels, step, one_way, load, price, export, penalty, baseline_kw, hours):
+    stored = np.diff(levels, axis=-1) * step
+    grid = load + np.where(stored > 0, stored / one_way, stored * one_way)
+    cost = np.where(grid > 0, grid * price, grid * export).sum(axis=-1)
+    # Demand is charged once, on each rise of the running peak
+    window_kw = np.where(np.asarray(penalty) > 0, grid / hours, -np.inf)
+    peak_kw = np.maximum.accumulate(np.concatenate((np.full(window_kw.shape[:-1] + (1,), baseline_kw), window_kw),
+                                                   axis=-1), axis=-1)
+    return cost + (penalty * np.maximum(window_kw - peak_kw[..., :-1], 0.0)).sum(axis=-1), grid
+
+class TestBattery(unittest.TestCase):
+    def test_matches_exhaustive_search(self):
+        times = START + np.arange(7) * 5
+        rrps = np.array([300.0, -50.0, 20.0, 500.0, 10.0, 900.0, 0.0])
+        load = np.array([0.1, 0.0, 0.3, 0.2, 0.0, 0.4, 0.1])
+        levels, capacity, power, efficiency = 5, 1.0, 6.0, 0.81
+        found = optimise_battery(times, 'Energex', '6900', rrps, capacity, power, efficiency, load_kwh=load,
+                                 export_price=4.0, initial_soc=0.5, levels=levels)
+
+        price = delivered_prices(times, 'Energex', '6900', rrps) / 100
+        step, one_way = capacity / (levels - 1), 0.9
+        reach_up, reach_down = int(power / 12 * one_way / step), int(power / 12 / one_way / step)
+        best = None
+        for path in itertools.product(range(levels), repeat=len(times)):
+            path = (2,) + path
+            moves = np.diff(path)
+            if (moves > reach_up).any() or (moves < -reach_down).any():
+                continue
+            cost, _ = path_cost(np.array(path), step, one_way, load, price, 0.04, 0.0, 0.0, 1 / 12)
+            best = cost if best is None else min(best, cost)
+        self.assertAlmostEqual(found.cost, best)
+        np.testing.assert_allclose(found.grid, load + found.charge - found.discharge)
+        self.assertAlmostEqual(found.soc[0], 0.5)
+
+    def test_demand_window_penalty(self):
+        times = START + np.arange(288) * 5
+        penalty = demand_penalties('Energex', '3700', times)
+        # 16:00 to 21:00 Brisbane time
+        self.assertEqual(np.flatnonzero(penalty).tolist(), list(range(192, 252)))
+        self.assertAlmostEqual(penalty[200], calculate_demand_fee('Energex', '3700', 1.0))
+
+        # Spot prices are lowest inside the window, but charging there would raise billed demand
+        rrps = np.full(288, 200.0)
+        rrps[192:252] = -100.0
+        load = np.full(288, 0.05)
+        dispatch = optimise_battery(times, 'Energex', '3700', rrps, 5.0, 5.0, load_kwh=load, levels=21)
+        self.assertTrue((dispatch.grid[192:252] <= 0.05 + 1e-9).all())
+        # A flat tariff without a demand charge does charge there
+        unpenalised = optimise_battery(times, 'Energex', '8400', rrps, 5.0, 5.0, load_kwh=load, levels=21)
+        self.assertGreater(unpenalised.charge[192:252].sum(), 0)
+
+    def test_demand_charged_once_on_the_peak(self):
+        # 20:25 to 21:20 Brisbane time: seven intervals in the 16:00-21:00 window at the price
+        # floor, then five at the cap; charging through the window raises the peak only once
+        times = np.datetime64('2024-07-01T10:25') + np.arange(12) * 5
+        rrps = np.array([-1000.0] * 7 + [15000.0] * 5)
+        load = np.full(12, 0.05)
+        levels, capacity, power, efficiency = 9, 2.0, 3.4, 0.81
+        found = optimise_battery(times, 'Energex', '3700', rrps, capacity, power, efficiency, load_kwh=load,
+                                 export_price=5000.0, levels=levels)
+
+        # Every path of single-level moves, which is as far as this battery reaches in an interval
+        moves = np.array(list(itertools.product((-1, 0, 1), repeat=len(times))))
+        paths = np.cumsum(moves, axis=1)
+        paths = paths[((paths >= 0) & (paths < levels)).all(axis=1)]
+        paths = np.concatenate((np.zeros((len(paths), 1), dtype=int), paths), axis=1)
+        price = delivered_prices(times, 'Energex', '3700', rrps) / 100
+        penalty = demand_penalties('Energex', '3700', times)
+        costs, _ = path_cost(paths, capacity / (levels - 1), 0.9, load, price, 50.0, penalty, 0.6, 1 / 12)
+        self.assertAlmostEqual(found.cost, costs.min())
+        # Several intervals above the load's own peak, paid for once
+        self.assertGreater((found.grid[:7] * 12 > 0.6 + 1e-9).sum(), 1)
+
+    def test_many_sites_and_limits(self):
+        times = START + np.arange(2 * 288) * 5
+        rrps = np.random.default_rng(5).normal(80, 80, (50, len(times)))
+        dispatch = optimise_battery(times, 'SAPN', 'RTOU', rrps, [10.0] * 25 + [5.0] * 25, 5.0,
+                                    export_price=6.0, final_soc=0.5)
+        self.assertEqual(dispatch.soc.shape, (50, len(times) + 1))
+        self.assertTrue((dispatch.soc >= -1e-9).all())
+        self.assertTrue((dispatch.soc[:25] <= 10 + 1e-9).all() and (dispatch.soc[25:] <= 5 + 1e-9).all())
+        self.assertTrue((dispatch.soc[:25, -1] >= 5 - 1e-9).all() and (dispatch.soc[25:, -1] >= 2.5 - 1e-9).all())
+        self.assertTrue((dispatch.charge <= 5.0 / 12 + 1e-9).all() and (dispatch.discharge <= 5.0 / 12 + 1e-9).all())
+        single = optimise_battery(times, 'SAPN', 'RTOU', rrps[3], 10.0, 5.0, export_price=6.0, final_soc=0.5)
+        self.assertAlmostEqual(single.cost, dispatch.cost[3])
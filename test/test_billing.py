@@ -0,0 +1,69 @@
+import os
+import unittest
+import numpy as np
+from aemo_to_tariff.billing import calculate_bill, bill_nem12
+from aemo_to_tariff.nem12 import read_series
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'fixtures', 'NEM12_sample.csv')
+
+class TestBilling(unittest.TestCase):
+    def test_energy_and_daily_fee(self):
+        nmi, suffix, bill = next(bill_nem12(SAMPLE, 'Energex', '6900'))
+        self.assertEqual((nmi, suffix, bill.days), ('3120000001', 'E1', 2))
+        self.assertAlmostEqual(bill.kwh, 90.0)
+        self.assertAlmostEqual(bill.energy, 7.96110, 5)
+        self.assertAlmostEqual(bill.daily, 0.556 * 2, 6)
+        self.assertEqual(bill.demand, 0.0)
+        self.assertAlmostEqual(bill.total, bill.energy + bill.daily)
+
+    def test_demand_fee(self):
+        series = next(read_series(SAMPLE))
+        bill = calculate_bill('Energex', '3700', series.start, series.kwh)
+        self.assertAlmostEqual(bill.demand_kw, 5.0)
+        self.assertAlmostEqual(bill.demand, 5.0 * 8.998 / 30 * 2, 6)
+
+    def test_spot_pass_through(self):
+        series = next(read_series(SAMPLE))
+        rrps = np.full(len(series.kwh), 100.0)
+        network = calculate_bill('SAPN', 'RSR', series.start, series.kwh)
+        retail = calculate_bill('SAPN', 'RSR', series.start, series.kwh, rrps, 1.0, 1.0, 1.0)
+        self.assertAlmostEqual(retail.energy - network.energy, 90.0 * 10.0 / 100)
+
+    def test_endeavour_has_no_demand_component(self):
+        series = next(read_series(SAMPLE))
+        self.assertEqual(calculate_bill('Endeavour', 'N70', series.start, series.kwh).demand, 0.0)
+
+    def test_sapn_fees_in_cents(self):
+        # SAPN's daily fees and demand charges are c/day and c/kW/day
+        series = next(read_series(SAMPLE))
+        bill = calculate_bill('SAPN', 'RPRO', series.start, series.kwh, utc_offset_minutes=600)
+        self.assertAlmostEqual(bill.daily, 57.53 / 100 * 2, 6)
+        self.assertAlmostEqual(bill.demand_kw, 5.0)
+        self.assertAlmostEqual(bill.demand, 83.39 / 100 * 5.0 * 2, 6)
+
+    def test_tasnetworks_daily_fee_in_cents(self):
+        nmi, suffix, bill = next(bill_nem12(SAMPLE, 'tasnetworks', 'TAS94'))
+        self.assertEqual(bill.days, 2)
+        self.assertAlmostEqual(bill.daily, 83.78 / 100 * 2, 6)
+
+    def test_powercor_daily_fee_in_dollars(self):
+        times = np.datetime64('2025-01-01T00:00') + np.arange(31 * 48) * 30
+        bill = calculate_bill('Powercor', 'PRTOU', times, np.full(len(times), 0.5), utc_offset_minutes=0)
+        self.assertEqual(bill.days, 31)
+        self.assertAlmostEqual(bill.daily, 0.3973 * 31, 6)
+
+    def test_nem12_days_in_adelaide(self):
+        # Two NEM12 days in market time (UTC+10) start at 23:30 the day before in Adelaide
+        nmi, suffix, bill = next(bill_nem12(SAMPLE, 'SAPN', 'RSR'))
+        self.assertEqual(bill.days, 2)
+        self.assertAlmostEqual(bill.daily, 57.53 / 100 * 2, 6)
+
+        series = next(read_series(SAMPLE))
+        self.assertEqual(calculate_bill('SAPN', 'RSR', series.start, series.kwh).days, 3)
+
+    def test_nem12_days_in_daylight_saving(self):
+        # Two market-time days in January touch three Sydney (UTC+11) dates
+        times = np.datetime64('2025-01-05T14:00') + np.arange(96) * 30
+        kwh = np.ones(96)
+        self.assertEqual(calculate_bill('Endeavour', 'N70', times, kwh).days, 3)
+        self.assertEqual(calculate_bill('Endeavour', 'N70', times, kwh, utc_offset_minutes=600).days, 2)
@@ -0,0 +1,88 @@
+import unittest
+from datetime import date
+
+import numpy as np
+
+import aemo_to_tariff.versions as versions
+from aemo_to_tariff.billing import calculate_bill
+from aemo_to_tariff.blocks import block_prices, get_block_thresholds
+from aemo_to_tariff.convert import spot_to_tariff_many
+
+BLOCK_1, BLOCK_2 = 8.8705, 10.3335
+PER_DAY = 1750 / 91.25
+
+# July 2024 in Sydney (UTC+10) in half hours
+JULY = np.datetime64('2024-06-30T14:00') + np.arange(48 * 62) * 30
+
+
+class TestBlocks(unittest.TestCase):
+
+    def test_thresholds(self):
+        self.assertEqual(get_block_thresholds('Endeavour', 'N90'), (PER_DAY,))
+        self.assertEqual(get_block_thresholds('Endeavour', 'N70'), ())
+
+    def test_switches_block_each_period(self):
+        kwh = np.full(len(JULY), 1.0)  # 48 kWh a day
+        result = block_prices('Endeavour', 'N90', JULY, kwh)
+        self.assertEqual(result.periods.tolist(), [date(2024, 7, 1), date(2024, 8, 1)])
+        self.assertEqual(result.days.tolist(), [31, 31])
+        np.testing.assert_allclose(result.block_kwh, [[PER_DAY * 31, 48 * 31 - PER_DAY * 31]] * 2)
+
+        # Usage restarts in block 1 on the first of August
+        threshold = PER_DAY * 31
+        crossing = int(threshold)
+        self.assertEqual(result.block[[0, crossing, crossing + 1, 48 * 31]].tolist(), [0, 0, 1, 0])
+        self.assertEqual(result.prices[0], BLOCK_1)
+        self.assertEqual(result.prices[crossing + 1], BLOCK_2)
+        self.assertAlmostEqual(result.prices[crossing], BLOCK_1 * (threshold - crossing) + BLOCK_2 * (crossing + 1 - threshold))
+        self.assertAlmostEqual(float(kwh @ result.prices), float((result.block_kwh * [BLOCK_1, BLOCK_2]).sum()))
+
+    def test_many_sites_and_read_dates(self):
+        kwh = np.random.default_rng(0).random((50, len(JULY))) * 2
+        reads = [date(2024, 7, 15), date(2024, 8, 20)]
+        fleet = block_prices('Endeavour', 'N90', JULY, kwh, billing_period=reads)
+        self.assertEqual(fleet.periods.tolist(), [date(2024, 7, 1), date(2024, 7, 15), date(2024, 8, 20)])
+        self.assertEqual(fleet.days.tolist(), [14, 36, 12])
+        self.assertEqual(fleet.block_kwh.shape, (50, 3, 2))
+        for site in (0, 17, 49):
+            single = block_prices('Endeavour', 'N90', JULY, kwh[site], billing_period=reads)
+            np.testing.assert_array_equal(single.prices, fleet.prices[site])
+            np.testing.assert_allclose(kwh[site] @ single.prices, (single.block_kwh * [BLOCK_1, BLOCK_2]).sum())
+
+    def test_quarters_and_spot_prices(self):
+        kwh = np.full((2, len(JULY)), 0.2)
+        rrps = np.full(len(JULY), 100.0)
+        result = block_prices('Endeavour', 'N90', JULY, kwh, rrps, 1.0, 1.0, 1.0, billing_period='quarter')
+        self.assertEqual(result.periods.tolist(), [date(2024, 7, 1)])
+        self.assertTrue((result.block == 0).all())  # 9.6 kWh a day stays in block 1
+        np.testing.assert_allclose(result.prices, BLOCK_1 + 10.0)
+
+    def test_tariffs_without_blocks(self):
+        kwh = np.full(len(JULY), 3.0)
+        rrps = np.linspace(-50, 300, len(JULY))
+        result = block_prices('Energex', '6900', JULY, kwh, rrps)
+        np.testing.assert_array_equal(result.prices, spot_to_tariff_many(JULY, 'Energex', '6900', rrps))
+        self.assertEqual(result.block_kwh.shape, (2, 1))
+
+    def test_versioned_thresholds(self):
+        versions.register_version('Endeavour', date(2024, 8, 1), block_thresholds={'N90': (10.0,)})
+        try:
+            result = block_prices('Endeavour', 'N90', JULY, np.full(len(JULY), 1.0))
+            np.testing.assert_allclose(result.block_kwh[:, 0], [PER_DAY * 31, 10.0 * 31])
+        finally:
+            versions._registered.pop('endeavour', None)
+            versions._indexes.pop('endeavour', None)
+
+    def test_bills_blocks(self):
+        kwh = np.full(len(JULY), 1.0)
+        bill = calculate_bill('Endeavour', 'N90', JULY, kwh)
+        expected = block_prices('Endeavour', 'N90', JULY, kwh).block_kwh * [BLOCK_1, BLOCK_2]
+        self.assertAlmostEqual(bill.energy, expected.sum() / 100)
+
+    def test_rejects_exports(self):
+        with self.assertRaises(ValueError):
+            block_prices('Endeavour', 'N90', JULY[:2], [1.0, -1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
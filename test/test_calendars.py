@@ -0,0 +1,67 @@
+import unittest
+from datetime import date, time
+import numpy as np
+from aemo_to_tariff import calendars
+from aemo_to_tariff.calendars import (
+    public_holidays, is_public_holiday, register_holidays, day_calendar, day_code, HOLIDAY, EPOCH_ORDINAL,
+)
+from aemo_to_tariff.slots import compile_rules
+
+class TestCalendars(unittest.TestCase):
+    def test_queensland_2024(self):
+        self.assertEqual(public_holidays('QLD', 2024), [
+            date(2024, 1, 1), date(2024, 1, 26), date(2024, 3, 29), date(2024, 3, 30), date(2024, 3, 31),
+            date(2024, 4, 1), date(2024, 4, 25), date(2024, 5, 6), date(2024, 10, 7), date(2024, 12, 25),
+            date(2024, 12, 26),
+        ])
+
+    def test_state_holidays(self):
+        self.assertTrue(is_public_holiday('ACT', date(2024, 5, 27)))   # Reconciliation Day
+        self.assertTrue(is_public_holiday('ACT', date(2024, 3, 11)))   # Canberra Day
+        self.assertTrue(is_public_holiday('VIC', date(2024, 11, 5)))   # Melbourne Cup
+        self.assertTrue(is_public_holiday('SA', date(2024, 3, 11)))    # Adelaide Cup
+        self.assertTrue(is_public_holiday('NSW', date(2024, 6, 10)))   # King's Birthday
+        self.assertFalse(is_public_holiday('QLD', date(2024, 6, 10)))  # October in Queensland
+        self.assertFalse(is_public_holiday('TAS', date(2024, 3, 30)))  # No Easter Saturday
+        self.assertFalse(is_public_holiday(None, date(2024, 12, 25)))
+
+    def test_weekend_substitutes(self):
+        # Christmas 2022 fell on a Sunday; 2021 on a Saturday
+        self.assertEqual([d for d in public_holidays('NSW', 2022) if d.month == 12], [date(2022, 12, d) for d in (25, 26, 27)])
+        self.assertEqual([d for d in public_holidays('NSW', 2021) if d.month == 12], [date(2021, 12, d) for d in (25, 26, 27, 28)])
+        self.assertTrue(is_public_holiday('QLD', date(2023, 1, 2)))
+
+    def test_day_codes(self):
+        days = np.arange(date(2023, 12, 20).toordinal(), date(2024, 1, 10).toordinal()) - EPOCH_ORDINAL
+        codes = day_calendar('SA').day_codes(days)
+        expected = [day_code(date.fromordinal(EPOCH_ORDINAL + d), 'SA') for d in days.tolist()]
+        self.assertEqual(codes.tolist(), expected)
+        self.assertEqual(codes[days.tolist().index(date(2023, 12, 25).toordinal() - EPOCH_ORDINAL)] % 2, 1)
+        # Outside the covered years, weekdays and months without holidays
+        far = np.array([date(2100, 12, 25).toordinal() - EPOCH_ORDINAL])
+        self.assertEqual(day_calendar('SA').day_codes(far).tolist(), [day_code(date(2100, 12, 25))])
+
+    def test_register_holidays(self):
+        try:
+            register_holidays('QLD', [date(2022, 9, 22)])
+            self.assertTrue(is_public_holiday('QLD', date(2022, 9, 22)))
+            self.assertEqual(day_calendar('QLD').code_of(date(2022, 9, 22).toordinal() - EPOCH_ORDINAL) % 2, 1)
+        finally:
+            calendars._extra_holidays.pop('QLD', None)
+            calendars._holiday_set.cache_clear()
+            calendars.day_calendar.cache_clear()
+
+    def test_holiday_variants(self):
+        periods = [('Peak', time(7, 0), time(22, 0), 20.0)]
+        rules = {'variants': [(None, (5, 6, HOLIDAY), []), (None, None, periods)], 'wrap': True, 'fallback': (1.0, 5.0)}
+        compiled = compile_rules('TEST', 'Australia/Hobart', rules)
+        monday, holiday_monday = date(2024, 3, 4), date(2024, 3, 11)
+        slope, intercept = compiled.lookup(np.array([day_code(monday), day_code(holiday_monday, 'VIC')]), np.array([120, 120]))
+        self.assertEqual(intercept.tolist(), [20.0, 5.0])
+        # Without a holiday variant, holidays keep their weekday's rates
+        compiled = compile_rules('TEST', 'Australia/Hobart', {'variants': [(None, None, periods)], 'wrap': True, 'fallback': (1.0, 5.0)})
+        self.assertTrue((compiled.day_types[:, :, 0] == compiled.day_types[:, :, 1]).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from aemo_to_tariff import spot_to_tariff_many
+from aemo_to_tariff.cheapest import delivered_prices, cheapest_intervals, cheapest_window
+
+TIMES = np.datetime64('2024-07-01T14:00') + np.arange(2 * 288) * 5
+
+class TestCheapest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.rrps = rng.normal(80, 60, (20, len(TIMES)))
+        self.prices = delivered_prices(TIMES, 'Energex', '6900', self.rrps)
+
+    def test_delivered_prices(self):
+        np.testing.assert_allclose(self.prices[4], spot_to_tariff_many(TIMES, 'Energex', '6900', self.rrps[4]))
+
+    def test_intervals_against_sorting(self):
+        allowed = np.arange(len(TIMES)) % 7 != 0
+        found = cheapest_intervals(self.prices, 30, allowed)
+        for site in range(len(self.prices)):
+            candidates = np.flatnonzero(allowed)
+            expected = np.sort(candidates[np.argsort(self.prices[site, candidates], kind='stable')[:30]])
+            np.testing.assert_array_equal(found.indices[site], expected)
+            np.testing.assert_array_equal(found.prices[site], self.prices[site, expected])
+
+    def test_not_enough_allowed(self):
+        found = cheapest_intervals([3.0, 1.0, 2.0, 0.5], 3, allowed=[True, False, True, False])
+        self.assertEqual(found.indices.tolist(), [0, 2, -1])
+        self.assertEqual(found.prices.tolist(), [3.0, 2.0, np.inf])
+
+    def test_window_against_brute_force(self):
+        allowed = np.ones(len(TIMES), dtype=bool)
+        allowed[100:130] = False
+        found = cheapest_window(self.prices, 24, allowed)
+        for site in range(len(self.prices)):
+            sums = [self.prices[site, start:start + 24].sum() if allowed[start:start + 24].all() else np.inf
+                    for start in range(len(TIMES) - 23)]
+            self.assertEqual(found.start[site], int(np.argmin(sums)))
+            self.assertAlmostEqual(found.average[site], min(sums) / 24)
+
+    def test_window_edges(self):
+        self.assertEqual(cheapest_window([4.0, 1.0, 1.0, 5.0], 2), (1, 1.0))
+        self.assertEqual(cheapest_window([4.0, 1.0], 3), (-1, np.inf))
+        self.assertEqual(cheapest_window([4.0, 1.0, 2.0], 2, allowed=[True, True, False]), (0, 2.5))
+        with self.assertRaises(ValueError):
+            cheapest_window([1.0], 0)
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from aemo_to_tariff.billing import calculate_bill
+from aemo_to_tariff.compare import compare_tariffs, compare_customers, ranked
+
+START = np.datetime64('2024-06-30T14:00')
+
+def book(customers, days=60, seed=0):
+    times = START + np.arange(days * 48) * 30
+    rng = np.random.default_rng(seed)
+    return times, rng.random((customers, len(times))), rng.random(len(times)) * 300
+
+class TestCompare(unittest.TestCase):
+    def test_matches_bills(self):
+        # Endeavour's N90 is an inclining block tariff
+        for network in ('Energex', 'SAPN', 'tasnetworks', 'Victoria', 'Ausgrid', 'Endeavour'):
+            times, kwh, rrps = book(2)
+            comparison = compare_tariffs(network, times, kwh, rrps)
+            for column, tariff in enumerate(comparison.tariffs):
+                for customer in range(2):
+                    bill = calculate_bill(network, tariff, times, kwh[customer], rrps)
+                    with self.subTest(network=network, tariff=tariff, customer=customer):
+                        self.assertAlmostEqual(comparison.energy[customer, column], bill.energy, places=6)
+                        self.assertAlmostEqual(comparison.daily[customer, column], bill.daily, places=6)
+                        self.assertAlmostEqual(comparison.demand[customer, column], bill.demand, places=6)
+
+    def test_sapn_fees_in_dollars(self):
+        times, kwh, rrps = book(1)
+        # 60 days in market time (UTC+10), 61 local dates in Adelaide
+        comparison = compare_tariffs('SAPN', times, kwh, rrps, tariffs=['RSR', 'RPRO'], utc_offset_minutes=600)
+        np.testing.assert_allclose(comparison.daily, [[0.5753 * 60, 0.5753 * 60]])
+        # Under 1 kWh a half hour is under 2 kW, at 83.39 c/kW/day
+        self.assertGreater(comparison.demand[0, 1], 0.0)
+        self.assertLess(comparison.demand[0, 1], 2 * 0.8339 * 61)
+
+    def test_ranking(self):
+        times, kwh, rrps = book(3)
+        comparison = compare_tariffs('Energex', times, kwh, rrps, tariffs=['6900', '8400', '3700'])
+        for customer in range(3):
+            totals = [total for _, total in ranked(comparison, customer)]
+            self.assertEqual(totals, sorted(totals))
+            self.assertEqual({tariff for tariff, _ in ranked(comparison, customer)}, {'6900', '8400', '3700'})
+
+    def test_customer_book_in_processes(self):
+        times, kwh, rrps = book(6)
+        chunks = [kwh[:2], kwh[2:4], kwh[4:]]
+        serial = list(compare_customers('SAPN', times, chunks, rrps, workers=1))
+        parallel = list(compare_customers('SAPN', times, iter(chunks), rrps, workers=2))
+        self.assertEqual(len(parallel), 3)
+        for expected, found in zip(serial, parallel):
+            np.testing.assert_allclose(found.total, expected.total)
+        np.testing.assert_allclose(np.vstack([c.total for c in serial]), compare_tariffs('SAPN', times, kwh, rrps).total)
@@ -1,7 +1,13 @@
 # test/test_convert.py
 import unittest
-from datetime import datetime
-from aemo_to_tariff import spot_to_tariff, get_daily_fee, calculate_demand_fee
+from datetime import date, datetime, time, timedelta, timezone
+import numpy as np
+from aemo_to_tariff import (
+    spot_to_tariff, spot_to_tariff_many, spot_to_tariff_import_export, tariff_to_spot_threshold,
+    get_daily_fee, calculate_demand_fee,
+)
+from aemo_to_tariff import versions
+from aemo_to_tariff.registry import NETWORKS, get_network
 
 class TestTariffConversions(unittest.TestCase):
 
@@ -104,5 +110,89 @@ class TestTariffConversions(unittest.TestCase):
         self.assertAlmostEqual(spot_to_tariff(interval_time, 'tasnetworks', 'TAS93', 100), 14.537, 2)
 
 
+class TestSpotToTariffMany(unittest.TestCase):
+
+    def setUp(self):
+        # Two days either side of the April 2024 DST change, plus some off-grid instants
+        start = datetime(2024, 4, 6, tzinfo=timezone.utc)
+        self.times = [start + timedelta(minutes=5 * i) for i in range(288 * 2)]
+        off_grid = [start + timedelta(seconds=7919 * i, microseconds=997 * i) for i in range(40)]
+        # and the local 23:59 minute, where periods written as ending at 23:59 run to midnight.
+        # NEM time zones are whole half hours from UTC, so that minute is :29 or :59 past a UTC hour.
+        self.times += off_grid + [start + timedelta(minutes=30 * i + 29, seconds=30) for i in range(48)]
+        self.rrps = [(i * 37) % 600 - 100.5 for i in range(len(self.times))]
+
+    def test_matches_scalar_for_every_tariff(self):
+        for network in NETWORKS:
+            module = get_network(network)
+            for tariff in list(module.tariffs) + ['UNKNOWN']:
+                try:
+                    module.get_rules(tariff)
+                except KeyError:
+                    continue
+                prices = spot_to_tariff_many(self.times, network, tariff, self.rrps, 1.02, 1.01, 1.0)
+                for interval_time, rrp, price in zip(self.times, self.rrps, prices):
+                    expected = spot_to_tariff(interval_time, network, tariff, rrp, 1.02, 1.01, 1.0)
+                    self.assertEqual(price, expected, (network, tariff, interval_time))
+
+    def test_datetime64_input(self):
+        utc = np.array([t.replace(tzinfo=None) for t in self.times], dtype='datetime64[us]')
+        expected = spot_to_tariff_many(self.times, 'SAPN', 'RTOU', self.rrps)
+        np.testing.assert_array_equal(spot_to_tariff_many(utc, 'SAPN', 'RTOU', self.rrps), expected)
+
+    def test_unknown_network(self):
+        with self.assertRaises(ValueError):
+            spot_to_tariff_many(self.times, 'Nowhere', '8400', self.rrps)
+
+    def test_threshold_inverts_every_tariff(self):
+        for network in NETWORKS:
+            module = get_network(network)
+            for tariff in list(module.tariffs) + ['UNKNOWN']:
+                try:
+                    module.get_rules(tariff)
+                except KeyError:
+                    continue
+                thresholds = tariff_to_spot_threshold(self.times, network, tariff, 25.0, 1.02, 1.01, 1.0)
+                prices = spot_to_tariff_many(self.times, network, tariff, thresholds, 1.02, 1.01, 1.0)
+                np.testing.assert_allclose(prices, 25.0, err_msg=f"{network} {tariff}")
+                for i in (0, 100, 400):
+                    below = spot_to_tariff(self.times[i], network, tariff, thresholds[i] - 1, 1.02, 1.01, 1.0)
+                    self.assertLess(below, 25.0, (network, tariff))
+
+    def test_threshold_targets_per_interval(self):
+        targets = np.linspace(5, 40, len(self.times))
+        thresholds = tariff_to_spot_threshold(self.times, 'SAPN', 'RTOU', targets)
+        np.testing.assert_allclose(spot_to_tariff_many(self.times, 'SAPN', 'RTOU', thresholds), targets)
+
+    def test_import_export_for_every_tariff(self):
+        for network in NETWORKS:
+            module = get_network(network)
+            for tariff in list(module.tariffs) + ['UNKNOWN']:
+                try:
+                    module.get_rules(tariff)
+                except KeyError:
+                    continue
+                imports, exports = spot_to_tariff_import_export(self.times, network, tariff, self.rrps, 1.02, 1.01, 1.0)
+                np.testing.assert_array_equal(imports, spot_to_tariff_many(self.times, network, tariff, self.rrps, 1.02, 1.01, 1.0))
+                # The built-in export rates are all 0.0, so exports earn the spot price
+                np.testing.assert_allclose(exports, np.asarray(self.rrps) * 1.02 * 1.01 / 10, err_msg=f"{network} {tariff}")
+
+    def test_versioned_export_rates(self):
+        versions.register_version('SAPN', date(2024, 1, 1), export_tariffs={})
+        versions.register_version('SAPN', date(2024, 4, 7), export_tariffs={
+            'RTOU': {'name': 'Residential Time of Use', 'periods': [('Solar Sponge', time(10, 0), time(16, 0), -1.0)]},
+        })
+        try:
+            imports, exports = spot_to_tariff_import_export(self.times, 'SAPN', 'RTOU', self.rrps, 1, 1, 1)
+        finally:
+            versions._registered.pop('sapn', None)
+            versions._indexes.pop('sapn', None)
+        spot = np.asarray(self.rrps) / 10
+        # The version starts at midnight on 7 April in Adelaide; the Solar Sponge window is then 00:30-06:30 UTC
+        expected = [-1.0 if t.day >= 7 and time(0, 30) <= t.time() < time(6, 30) else 0.0 for t in self.times]
+        np.testing.assert_array_equal(imports, spot_to_tariff_many(self.times, 'SAPN', 'RTOU', self.rrps, 1, 1, 1))
+        np.testing.assert_allclose(exports - spot, expected, atol=1e-12)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
+from aemo_to_tariff import spot_to_tariff, get_converter
+
+class TestConverter(unittest.TestCase):
+    def setUp(self):
+        # A day either side of the October 2024 DST change
+        start = datetime(2024, 10, 5, tzinfo=timezone.utc)
+        self.times = [start + timedelta(minutes=5 * i) for i in range(288 * 2)]
+
+    def assertMatchesScalar(self, network, tariff, times):
+        convert = get_converter(network, tariff, 1.02, 1.01, 1.0)
+        for i, interval_time in enumerate(times):
+            rrp = i % 300 - 50.0 + i / 7
+            expected = spot_to_tariff(interval_time, network, tariff, rrp, 1.02, 1.01, 1.0)
+            self.assertEqual(convert(interval_time, rrp), expected, msg=(network, tariff, interval_time))
+
+    def test_utc_times(self):
+        for network, tariff in [('Energex', '6900'), ('SAPN', 'RTOU'), ('tasnetworks', 'TAS94'),
+                                ('Evoenergy', '017'), ('Endeavour', 'N71'), ('Energex', '9999')]:
+            self.assertMatchesScalar(network, tariff, self.times)
+
+    def test_fixed_offset_and_zone_times(self):
+        adelaide = timezone(timedelta(hours=9, minutes=30))
+        self.assertMatchesScalar('SAPN', 'RTOU', [t.astimezone(adelaide) for t in self.times])
+        self.assertMatchesScalar('Ausgrid', 'EA025', [t.astimezone(ZoneInfo('Australia/Sydney')) for t in self.times])
+        self.assertMatchesScalar('Ausgrid', 'EA025', [t.astimezone(ZoneInfo('Australia/Sydney')).replace(tzinfo=None) for t in self.times])
+
+    def test_convert_many(self):
+        convert = get_converter('Energex', '6900')
+        rrps = np.linspace(-50, 300, len(self.times))
+        expected = [convert(t, rrp) for t, rrp in zip(self.times, rrps)]
+        np.testing.assert_allclose(convert.convert_many(self.times, rrps), expected, rtol=0, atol=1e-12)
+
+    def test_unknown_network(self):
+        with self.assertRaises(ValueError):
+            get_converter('Nowhere', '8400')
+
+    def test_star_import(self):
+        namespace = {}
+        exec('from aemo_to_tariff import *', namespace)
+        self.assertIs(namespace['get_converter'], get_converter)
+        self.assertIn('spot_to_tariff', namespace)
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+from aemo_to_tariff.convert import calculate_demand_fee
+from aemo_to_tariff.demand import calculate_demand, get_demand_windows
+
+# July 2024 starts on a Monday; Brisbane and Hobart are both UTC+10 in July
+JULY = np.datetime64('2024-06-30T14:00')
+
+def series(minutes, days=31):
+    times = JULY + np.arange(days * 1440 // minutes) * minutes
+    return times, np.zeros(len(times))
+
+def at(times, day, hour, minute=0):
+    return int(np.flatnonzero(times == JULY + np.timedelta64((day * 24 + hour) * 60 + minute, 'm'))[0])
+
+class TestDemand(unittest.TestCase):
+    def test_evening_window_maximum(self):
+        times, kw = series(5)
+        kw[at(times, 3, 17):at(times, 3, 17, 30)] = 3.0
+        kw[at(times, 4, 12):at(times, 4, 13)] = 10.0  # outside the 4pm-9pm window
+        monthly = calculate_demand('Energex', '3700', times, kw)
+        self.assertEqual(list(monthly.months), [np.datetime64('2024-07')])
+        self.assertEqual(list(monthly.days), [31])
+        self.assertAlmostEqual(monthly.demand['demand_kw'][0], 3.0)
+        self.assertAlmostEqual(monthly.fee[0], 3.0 * 8.998 / 30 * 31)
+
+    def test_half_hour_average(self):
+        times, kw = series(5)
+        kw[at(times, 3, 17, 5)] = 6.0
+        monthly = calculate_demand('Energex', '3700', times, kw)
+        self.assertAlmostEqual(monthly.demand['demand_kw'][0], 1.0)
+
+    def test_rolling(self):
+        times, kw = series(5)
+        kw[at(times, 3, 17, 10):at(times, 3, 17, 40)] = 6.0
+        self.assertAlmostEqual(calculate_demand('Energex', '8100', times, kw).demand['demand_kw'][0], 6.0)
+        self.assertAlmostEqual(calculate_demand('Energex', '8300', times, kw).demand['demand_kw'][0], 4.0)
+
+    def test_top_days_with_peak(self):
+        times, kw = series(30)
+        for day, peak in enumerate([5.0, 4.0, 3.0, 2.0, 1.0]):
+            kw[at(times, day, 8)] = peak
+        kw[at(times, 5, 12)] = 10.0  # Saturday, off-peak only
+        monthly = calculate_demand('tasnetworks', 'TAS87', times, kw)
+        self.assertAlmostEqual(monthly.demand['peak_demand_kw'][0], 3.5)
+        self.assertAlmostEqual(monthly.demand['demand_kw'][0], 5.5)
+        expected = (30.133 * 3.5 + 10.034 * 2.0) * 31 / 30
+        self.assertAlmostEqual(monthly.fee[0], expected)
+        self.assertAlmostEqual(calculate_demand_fee('tasnetworks', 'TAS87', 5.5, 31, peak_demand_kw=3.5), expected)
+
+    def test_fleet_matches_single_sites(self):
+        times, kw = series(30, days=62)
+        fleet = np.random.default_rng(0).random((4, len(times))) * 5
+        monthly = calculate_demand('SAPN', 'RPRO', times, fleet)
+        # Adelaide is half an hour behind, so the series starts on 30 June
+        self.assertEqual(monthly.fee.shape, (4, 3))
+        for site in range(4):
+            single = calculate_demand('SAPN', 'RPRO', times, fleet[site])
+            np.testing.assert_allclose(monthly.demand['demand_kw'][site], single.demand['demand_kw'])
+            np.testing.assert_allclose(monthly.fee[site], single.fee)
+
+    def test_victorian_weekdays(self):
+        times, kw = series(30)
+        kw[at(times, 6, 16)] = 9.0  # Sunday
+        kw[at(times, 7, 16)] = 2.0  # Monday
+        self.assertAlmostEqual(calculate_demand('Victoria', 'VICR_DEMAND', times, kw).demand['demand_kw'][0], 2.0)
+
+    def test_victorian_summer_demand(self):
+        # Melbourne is UTC+11 in November and December; summer starts in December
+        times = np.datetime64('2024-11-01T00:00') + np.arange(60 * 48) * 30
+        kw = np.zeros(len(times))
+        kw[times == np.datetime64('2024-11-13T06:00')] = 2.0  # Wednesday 5pm
+        kw[times == np.datetime64('2024-12-11T06:00')] = 5.0  # Wednesday 5pm
+        monthly = calculate_demand('Victoria', 'VICR_DEMAND', times, kw)
+        np.testing.assert_allclose(monthly.demand['demand_kw'], [2.0, 0.0])
+        np.testing.assert_allclose(monthly.demand['summer_demand_kw'], [0.0, 5.0])
+        # CitiPower CR: 3.21 $/kW non-summer, 10.84 $/kW summer, per 30 days
+        np.testing.assert_allclose(monthly.fee, [3.21 * 2.0, 10.84 * 5.0 * 31 / 30])
+
+    def test_no_demand_charge(self):
+        times, kw = series(30)
+        self.assertEqual(get_demand_windows('Ausgrid', 'EA025'), {})
+        self.assertEqual(get_demand_windows('Energex', '6900'), {})
+        monthly = calculate_demand('Ausgrid', 'EA025', times, kw + 1)
+        self.assertEqual(monthly.demand, {})
+        self.assertEqual(list(monthly.fee), [0.0])
@@ -18,3 +18,10 @@ class TestEnergex(unittest.TestCase):
         expected_fee = 0.556
         fee = energex.get_daily_fee(tariff_code, annual_usage)
         self.assertEqual(fee, expected_fee)
+
+    def test_daily_fee_bands(self):
+        bands = energex.daily_fees['6800']
+        self.assertEqual(energex.get_daily_fee('6800', 30000), bands['band2'])
+        self.assertEqual(energex.get_daily_fee('6800', 80000), bands['band4'])
+        with self.assertRaises(ValueError):
+            energex.get_daily_fee('6800', 80001)
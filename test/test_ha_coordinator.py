@@ -0,0 +1,97 @@
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+import numpy as np
+
+from aemo_to_tariff import spot_to_tariff_many
+from aemo_to_tariff.schedule import next_transition
+
+try:
+    import homeassistant  # noqa: F401
+    from homeassistant.core import HomeAssistant
+    from custom_components.aemo_to_tariff import coordinator
+except ImportError:
+    homeassistant = None
+
+NOW = datetime(2024, 7, 1, 6, 2, tzinfo=timezone.utc)
+FORECAST = [
+    {'start_time': '2024-07-01T06:30:00+00:00', 'rrp': 80.0},
+    {'period_start': datetime(2024, 7, 1, 17, 0, tzinfo=timezone.utc), 'price': '120.5'},
+    {'time': '2024-07-01T07:30:00+00:00', 'rrp': 'n/a'},   # no price
+    {'rrp': 50.0},                                         # no time
+    {'start_time': 'not a time', 'rrp': 50.0},
+    'not an entry',
+]
+
+
+@unittest.skipIf(homeassistant is None, 'Home Assistant is not installed')
+class TestCoordinator(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.hass = HomeAssistant(self.directory)
+
+    async def asyncTearDown(self):
+        await self.hass.async_stop(force=True)
+        shutil.rmtree(self.directory)
+
+    def test_next_boundary(self):
+        self.assertEqual(coordinator.next_boundary('energex', '6900', NOW),
+                         next_transition('energex', '6900', NOW, coordinator.BOUNDARY_HORIZON))
+        self.assertGreater(coordinator.next_boundary('energex', '6900', NOW), NOW)
+
+        # A flat tariff doesn't change, so it is checked again at the end of the horizon
+        self.assertEqual(coordinator.next_boundary('energex', '8400', NOW), NOW + coordinator.BOUNDARY_HORIZON)
+
+    def test_read_forecast(self):
+        times, rrps = coordinator._read_forecast(FORECAST)
+        self.assertEqual(times.tolist(), [datetime(2024, 7, 1, 6, 30), datetime(2024, 7, 1, 17, 0)])
+        self.assertEqual(rrps.tolist(), [80.0, 120.5])
+        self.assertEqual(len(coordinator._read_forecast(None)[0]), 0)
+
+    def test_prices(self):
+        tracker = coordinator.TariffCoordinator(self.hass, forecast_sensor='sensor.forecast')
+        tariffs = (('energex', '6900'), ('sapn', 'RTOU'))
+        data, boundary = tracker._price(tariffs, NOW, 100.0, FORECAST, {})
+
+        times = np.array(['2024-07-01T06:02', '2024-07-01T06:30', '2024-07-01T17:00'], dtype='datetime64[us]')
+        for network, tariff in tariffs:
+            prices = data[(network, tariff)]
+            expected = spot_to_tariff_many(times, network, tariff, [100.0, 80.0, 120.5])
+            self.assertAlmostEqual(prices.price, expected[0])
+            self.assertEqual(prices.rrp, 100.0)
+            self.assertEqual(prices.forecast_times, ('2024-07-01T06:30:00+00:00', '2024-07-01T17:00:00+00:00'))
+            np.testing.assert_allclose(prices.forecast, expected[1:])
+        self.assertEqual(boundary, min(coordinator.next_boundary(network, tariff, NOW) for network, tariff in tariffs))
+
+        # Unchanged prices are the same objects; changed ones are new
+        again, _ = tracker._price(tariffs, NOW, 100.0, FORECAST, data)
+        self.assertIs(again[('energex', '6900')], data[('energex', '6900')])
+        changed, _ = tracker._price(tariffs, NOW, 90.0, FORECAST, data)
+        self.assertIsNot(changed[('energex', '6900')], data[('energex', '6900')])
+
+        # Without an RRP there is no current price, but the forecast is still priced
+        missing, _ = tracker._price(tariffs, NOW, None, FORECAST, {})
+        self.assertIsNone(missing[('energex', '6900')].price)
+        self.assertEqual(missing[('energex', '6900')].forecast, data[('energex', '6900')].forecast)
+
+    async def test_refreshes_on_rrp_changes(self):
+        tracker = coordinator.get_coordinator(self.hass, 'aemo_to_tariff')
+        self.assertIs(coordinator.get_coordinator(self.hass, 'aemo_to_tariff'), tracker)
+        tracker._debounced_refresh.cooldown = 0  # Refresh on every change rather than at most every 10 seconds
+        self.hass.states.async_set('sensor.current_rrp', '100.0')
+        untrack = tracker.track('energex', '6900')
+        await self.hass.async_block_till_done()
+        self.assertEqual(tracker.data[('energex', '6900')].rrp, 100.0)
+
+        self.hass.states.async_set('sensor.current_rrp', '250.0')
+        await self.hass.async_block_till_done()
+        self.assertEqual(tracker.data[('energex', '6900')].rrp, 250.0)
+        untrack()
+        self.assertIsNone(tracker._cancel_state)
+        self.assertIsNone(tracker._cancel_boundary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock
+
+import numpy as np
+
+from aemo_to_tariff import spot_to_tariff, spot_to_tariff_many, versions
+
+try:
+    import homeassistant  # noqa: F401
+    from homeassistant.core import HomeAssistant
+    import custom_components.aemo_to_tariff as integration
+except ImportError:
+    homeassistant = None
+
+START = datetime(2024, 7, 1, 6, 0, tzinfo=timezone.utc)
+
+
+@unittest.skipIf(homeassistant is None, 'Home Assistant is not installed')
+class TestServices(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.hass = HomeAssistant(self.directory)
+        self.assertTrue(await integration.async_setup(self.hass, {}))
+        self.executor_jobs = []
+        run_in_executor = self.hass.async_add_executor_job
+
+        def counted(function, *args):
+            self.executor_jobs.append(args[:2])
+            return run_in_executor(function, *args)
+        self.hass.async_add_executor_job = counted
+
+    async def asyncTearDown(self):
+        await self.hass.async_stop(force=True)
+        shutil.rmtree(self.directory)
+
+    async def call(self, service, **data):
+        return await self.hass.services.async_call(integration.DOMAIN, service, data, blocking=True, return_response=True)
+
+    async def test_convert_one_interval(self):
+        response = await self.call('convert_spot_to_tariff', network='energex', tariff='6900', interval_time=START, rrp=100)
+        self.assertAlmostEqual(response['price'], spot_to_tariff(START, 'energex', '6900', 100), places=9)
+
+    async def test_convert_intervals(self):
+        times = [START + timedelta(minutes=30 * i) for i in range(4)]
+        intervals = [{'interval_time': when, 'rrp': 50.0 * i} for i, when in enumerate(times)]
+        response = await self.call('convert_spot_to_tariff', network='sapn', tariff='RTOU', intervals=intervals,
+                                   dlf=1.0, mlf=1.0, market=1.0)
+        expected = spot_to_tariff_many(times, 'sapn', 'RTOU', [0.0, 50.0, 100.0, 150.0], 1.0, 1.0, 1.0)
+        np.testing.assert_allclose(response['prices'], expected)
+
+    async def test_call_without_response(self):
+        # Automations written before the services returned responses don't ask for one
+        self.assertIsNone(await self.hass.services.async_call(
+            integration.DOMAIN, 'convert_spot_to_tariff',
+            {'network': 'energex', 'tariff': '6900', 'interval_time': START, 'rrp': 100}, blocking=True))
+
+    async def test_first_call_runs_in_executor(self):
+        # The first call loads the network and compiles the tariff off the event loop
+        await self.call('convert_spot_to_tariff', network='energex', tariff='6900', interval_time=START, rrp=100)
+        self.assertEqual(self.executor_jobs, [('energex', '6900')])
+
+        # Small calls for a prepared tariff are cheap enough for the event loop
+        await self.call('convert_spot_to_tariff', network='energex', tariff='6900', interval_time=START, rrp=120)
+        self.assertEqual(len(self.executor_jobs), 1)
+
+        # A different tariff, and large calls, go to the executor
+        await self.call('convert_spot_to_tariff', network='energex', tariff='8400', interval_time=START, rrp=100)
+        intervals = [{'interval_time': START + timedelta(minutes=5 * i), 'rrp': 80.0}
+                     for i in range(integration.EXECUTOR_THRESHOLD + 1)]
+        await self.call('convert_spot_to_tariff', network='energex', tariff='6900', intervals=intervals)
+        self.assertEqual(self.executor_jobs, [('energex', '6900'), ('energex', '8400'), ('energex', '6900')])
+
+    async def test_prepare_compiles_every_version(self):
+        versions.register_version('Energex', date(2024, 1, 1), daily_fees={'6900': 0.469})
+        try:
+            await self.hass.async_add_executor_job(integration._prepare, 'energex', '6900')
+            times = np.array(['2023-07-01T00:00', '2024-07-01T00:00'], dtype='datetime64[us]')
+            with mock.patch('aemo_to_tariff.slots.compile_declared', side_effect=AssertionError('compiled again')):
+                spot_to_tariff_many(times, 'energex', '6900', [100.0, 100.0])
+        finally:
+            versions._registered.pop('energex', None)
+            versions._indexes.pop('energex', None)
+
+    async def test_daily_fees(self):
+        # In each network's units, as get_daily_fee() returns them: SAPN's are c/day
+        response = await self.call('get_tariff_daily_fee', network='sapn', tariff='RTOU')
+        self.assertAlmostEqual(response['daily_fee'], 57.53)
+        response = await self.call('get_tariff_daily_fee', network='energex', tariff=['6900', '3900'])
+        self.assertAlmostEqual(response['daily_fees']['6900'], 0.556, 3)
+        self.assertIn('3900', response['daily_fees'])
+
+    async def test_demand_fees(self):
+        response = await self.call('get_tariff_demand_fee', network='energex', tariff='3700', demand_kw=5.5, days=31)
+        self.assertAlmostEqual(response['demand_fee'], 51.1386, 2)
+        response = await self.call('get_tariff_demand_fee', network='energex', tariff='3700', demand_kw=[5.5, 0.0], days=31)
+        np.testing.assert_allclose(response['demand_fees'], [51.1386, 0.0], atol=1e-2)
+
+
+if __name__ == '__main__':
+    unittest.main()
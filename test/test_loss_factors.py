@@ -0,0 +1,71 @@
+import io
+import os
+import unittest
+import numpy as np
+from aemo_to_tariff import spot_to_tariff_many
+from aemo_to_tariff.loss_factors import LossFactors, load_loss_factors, financial_years
+from aemo_to_tariff.portfolio import portfolio_prices
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+DLF = os.path.join(FIXTURES, 'DLF_sample.csv')
+MLF = os.path.join(FIXTURES, 'MLF_sample.csv')
+
+# The last day of 2023-24 and the first of 2024-25 in market time (UTC+10)
+TIMES = np.datetime64('2024-06-29T14:00') + np.arange(2 * 288) * 5
+
+class TestLossFactors(unittest.TestCase):
+    def setUp(self):
+        self.factors = load_loss_factors(DLF, MLF)
+
+    def test_financial_years(self):
+        years = financial_years(np.array(['2024-06-30T13:55', '2024-06-30T14:00'], dtype='datetime64[us]'))
+        self.assertEqual(years.tolist(), [2023, 2024])
+
+    def test_year_columns(self):
+        self.assertEqual(self.factors.dlf('Energex', 'BL01', 2024), 1.0583)
+        self.assertEqual(self.factors.dlf('sapn', 'lvs', 2023), 1.1060)
+        self.assertEqual(self.factors.mlf('SNFD', 2024), 0.9987)
+        np.testing.assert_array_equal(self.factors.mlf(['QBMH', 'QLGH', 'QBMH'], [2023, 2024, 2024]),
+                                      [1.0082, 1.0105, 1.0066])
+
+    def test_unknown_factors(self):
+        with self.assertRaises(ValueError):
+            self.factors.dlf('Energex', 'XX99', 2024)
+        with self.assertRaises(ValueError):
+            self.factors.dlf('SA Power Networks', 'HVS', 2024)  # Not published for 2024-25
+        with self.assertRaises(ValueError):
+            self.factors.mlf('QBMH', 2019)
+
+    def test_mms_layout(self):
+        mms = io.BytesIO(b'C,NEMP.WORLD,LOSSFACTORS\n'
+                         b'I,PARTICIPANT_REGISTRATION,TRANSMISSIONLOSSFACTOR,2,TRANSMISSIONLOSSFACTOR,EFFECTIVEDATE,'
+                         b'VERSIONNO,CONNECTIONPOINTID,REGIONID\n'
+                         b'D,PARTICIPANT_REGISTRATION,TRANSMISSIONLOSSFACTOR,2,0.9912,"2024/07/01 00:00:00",1,QBMH,QLD1\n'
+                         b'C,"END OF REPORT",4\n')
+        factors = LossFactors()
+        self.assertEqual(factors.load_csv(mms), 1)
+        self.assertEqual(factors.mlf('QBMH', 2024), 0.9912)
+
+    def test_per_interval_factors_for_batch(self):
+        years = financial_years(TIMES)
+        dlf = self.factors.dlf('Energex', 'BL01', years)
+        mlf = self.factors.mlf('QBMH', years)
+        rrps = np.full(len(TIMES), 100.0)
+        prices = spot_to_tariff_many(TIMES, 'Energex', '6900', rrps, dlf, mlf, 1.0)
+        np.testing.assert_allclose(prices[0], spot_to_tariff_many(TIMES[:1], 'Energex', '6900', [100.0], 1.0550, 1.0082, 1.0))
+        np.testing.assert_allclose(prices[-1], spot_to_tariff_many(TIMES[-1:], 'Energex', '6900', [100.0], 1.0583, 1.0066, 1.0))
+
+    def test_portfolio_sites_by_code(self):
+        sites = {'network': ['Energex', 'SAPN'], 'tariff': ['6900', 'RTOU'], 'dlf_code': ['BL01', 'LVS'], 'tni': ['QBMH', 'SNFD']}
+        rrps = np.random.default_rng(2).normal(90, 50, len(TIMES))
+        prices = portfolio_prices(sites, TIMES, rrps, market=1.0, loss_factors=self.factors)
+        years = financial_years(TIMES)
+        for site, (network, tariff, code, tni) in enumerate(zip(*sites.values())):
+            dlf, mlf = self.factors.dlf(network, code, years), self.factors.mlf(tni, years)
+            np.testing.assert_allclose(prices[site], spot_to_tariff_many(TIMES, network, tariff, rrps, dlf, mlf, 1.0))
+        with self.assertRaises(ValueError):
+            portfolio_prices(sites, TIMES, rrps)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import os
+import unittest
+import numpy as np
+from aemo_to_tariff.nem12 import read_nem12, read_series
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'fixtures', 'NEM12_sample.csv')
+
+class TestNem12(unittest.TestCase):
+    def test_read_days(self):
+        days = list(read_nem12(SAMPLE))
+        self.assertEqual(len(days), 6)
+        self.assertEqual((days[1].nmi, days[1].suffix, days[1].date, days[1].quality), ('3120000001', 'E1', '20240702', 'V'))
+        self.assertEqual(days[1].events, [(1, 36, 'A'), (37, 48, 'E52')])
+        self.assertEqual(len(days[0].values), 48)
+
+    def test_read_series(self):
+        series = list(read_series(SAMPLE))
+        self.assertEqual([(s.nmi, s.suffix) for s in series], [('3120000001', 'E1'), ('3120000002', 'E1')])
+        self.assertEqual(series[0].start[0], np.datetime64('2024-06-30T14:00'))
+        self.assertEqual(len(series[0].kwh), 96)
+        self.assertAlmostEqual(series[0].kwh.sum(), 90.0)
+        # Wh are converted to kWh
+        self.assertAlmostEqual(series[1].kwh.sum(), 24.0)
+
+    def test_export_channel(self):
+        series = list(read_series(SAMPLE, suffixes='B'))
+        self.assertEqual([(s.nmi, s.suffix) for s in series], [('3120000001', 'B1')])
+        self.assertAlmostEqual(series[0].kwh.sum(), 6.0)
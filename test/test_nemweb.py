@@ -0,0 +1,76 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from datetime import datetime, timezone
+import numpy as np
+from aemo_to_tariff import spot_to_tariff
+from aemo_to_tariff.nemweb import read_prices, iter_price_chunks, iter_prices, TRADING_PRICE
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+DISPATCH = os.path.join(FIXTURES, 'PUBLIC_DISPATCHIS_202407011615_0000000422419510.CSV')
+PRICES = os.path.join(FIXTURES, 'PUBLIC_PRICES_202407010000_20240702040510.CSV')
+
+class TestNemweb(unittest.TestCase):
+    def setUp(self):
+        # A daily archive holding a zipped dispatch file, like the NEMweb Archive folders
+        self.tmp = tempfile.TemporaryDirectory()
+        inner = io.BytesIO()
+        with zipfile.ZipFile(inner, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.write(DISPATCH, os.path.basename(DISPATCH))
+        self.archive = os.path.join(self.tmp.name, 'PUBLIC_DISPATCHIS_20240701.zip')
+        with zipfile.ZipFile(self.archive, 'w') as archive:
+            archive.writestr('PUBLIC_DISPATCHIS_202407011615_0000000422419510.zip', inner.getvalue())
+            archive.write(PRICES, os.path.basename(PRICES))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_read_dispatch_prices(self):
+        rows = list(read_prices(DISPATCH, regions=['QLD1']))
+        # The intervention rerun is skipped
+        self.assertEqual(rows, [('2024/07/01 16:05:00', 'QLD1', 88.1), ('2024/07/01 16:10:00', 'QLD1', 150.7),
+                                ('2024/07/01 16:15:00', 'QLD1', -12.5)])
+
+    def test_reports(self):
+        self.assertEqual(len(list(read_prices(PRICES))), 6)
+        self.assertEqual(list(read_prices(PRICES, reports=[TRADING_PRICE])), [])
+
+    def test_nested_zip(self):
+        rows = list(read_prices(self.archive, regions={'SA1'}))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0], ('2024/07/01 16:05:00', 'SA1', 40.0))
+        self.assertEqual(rows[3], ('2024/07/01 00:05:00', 'SA1', 55.0))
+
+    def test_chunks_match_spot_to_tariff(self):
+        regions = {'QLD1': [('energex', '6900'), ('energex', '8400', 1.0, 1.0, 1.0)], 'SA1': [('sapn', 'RTOU')]}
+        chunks = list(iter_price_chunks(self.archive, regions, chunk_size=2))
+        self.assertTrue(all(len(chunk.price) <= 2 for chunk in chunks))
+        self.assertEqual(sum(len(chunk.price) for chunk in chunks), 18)
+
+        for chunk in chunks:
+            dlf, mlf, market = (1.0, 1.0, 1.0) if chunk.tariff == '8400' else (1.05905, 1.0154, 1.0154)
+            for interval_time, rrp, price in zip(chunk.interval_time, chunk.rrp, chunk.price):
+                interval_time = interval_time.astype(datetime).replace(tzinfo=timezone.utc)
+                expected = spot_to_tariff(interval_time, chunk.network, chunk.tariff, rrp, dlf, mlf, market)
+                self.assertAlmostEqual(price, expected, places=9)
+
+    def test_rows_are_utc(self):
+        rows = list(iter_prices([DISPATCH], {'TAS1': [('tasnetworks', 'TAS93')]}))
+        # SETTLEMENTDATE 16:05 market time ends the interval starting 06:00 UTC
+        self.assertEqual(rows[0].interval_time, datetime(2024, 7, 1, 6, 0))
+        self.assertEqual([row.rrp for row in rows], [70.2, 71.5, 72.0])
+        np.testing.assert_allclose([row.price for row in rows], [rrp * 1.05905 * 1.0154 * 1.0154 / 10 + 17.229 for rrp in [70.2, 71.5, 72.0]])
+
+    def test_prices_apply_from_interval_start(self):
+        # SAPN RTOU Peak ends at 20:00 in Adelaide (20:30 market time in July): the
+        # interval settled at 20:30 is the last Peak interval, the one settled at 20:35 is Off-peak
+        csv = (
+            "I,DISPATCH,PRICE,5,SETTLEMENTDATE,RUNNO,REGIONID,DISPATCHINTERVAL,INTERVENTION,RRP\n"
+            "D,DISPATCH,PRICE,5,\"2024/07/01 20:30:00\",1,SA1,20240701247,0,100\n"
+            "D,DISPATCH,PRICE,5,\"2024/07/01 20:35:00\",1,SA1,20240701248,0,100\n"
+        )
+        rows = list(iter_prices(io.BytesIO(csv.encode('ascii')), {'SA1': [('sapn', 'RTOU', 1.0, 1.0, 1.0)]}))
+        self.assertEqual([row.interval_time for row in rows], [datetime(2024, 7, 1, 10, 25), datetime(2024, 7, 1, 10, 30)])
+        self.assertEqual([round(row.price - 10.0, 6) for row in rows], [18.79, 7.56])
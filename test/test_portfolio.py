@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from aemo_to_tariff import spot_to_tariff_many
+from aemo_to_tariff.portfolio import Portfolio, portfolio_prices, iter_portfolio_prices
+
+# Spans the start of the 2024-25 financial year
+TIMES = np.datetime64('2024-06-30T00:00') + np.arange(2 * 288) * 5
+SITES = [
+    ('Energex', '6900', 1.02, 1.01),
+    ('SAPN', 'RTOU', 1.05, 0.99),
+    ('energex', '6900', 1.10, 1.00),
+    ('Ausgrid', 'EA025', 1.04, 1.02),
+    ('Energex', '6970', 1.02, 1.01),
+]
+
+class TestPortfolio(unittest.TestCase):
+    def setUp(self):
+        self.rrps = np.random.default_rng(5).normal(90, 70, len(TIMES))
+
+    def test_matches_spot_to_tariff_many(self):
+        prices = portfolio_prices(SITES, TIMES, self.rrps, market=1.0)
+        self.assertEqual(prices.shape, (len(SITES), len(TIMES)))
+        for site, (network, tariff, dlf, mlf) in enumerate(SITES):
+            expected = spot_to_tariff_many(TIMES, network, tariff, self.rrps, dlf, mlf, 1.0)
+            np.testing.assert_allclose(prices[site], expected, err_msg=f"{network} {tariff}")
+
+    def test_groups_sites(self):
+        portfolio = Portfolio(SITES, TIMES, self.rrps)
+        self.assertEqual(len(portfolio.groups), 4)
+        self.assertEqual(portfolio.group_of_site[0], portfolio.group_of_site[2])
+
+    def test_columns_and_regions(self):
+        sites = {
+            'network': ['Energex', 'SAPN', 'Energex'],
+            'tariff': ['6900', 'RTOU', '6900'],
+            'region': ['QLD1', 'SA1', 'QLD1'],
+            'mlf': [0.98, 1.0, 1.03],
+        }
+        regional = {'QLD1': self.rrps, 'SA1': self.rrps * 2}
+        prices = portfolio_prices(sites, TIMES, regional)
+        np.testing.assert_allclose(prices[1], spot_to_tariff_many(TIMES, 'SAPN', 'RTOU', self.rrps * 2, mlf=1.0))
+        np.testing.assert_allclose(prices[2], spot_to_tariff_many(TIMES, 'Energex', '6900', self.rrps, mlf=1.03))
+        with self.assertRaises(ValueError):
+            portfolio_prices(SITES, TIMES, regional)
+
+    def test_streaming_matches_matrix(self):
+        prices = portfolio_prices(SITES, TIMES, self.rrps)
+        streamed = list(iter_portfolio_prices(SITES, TIMES, self.rrps, chunk_size=2))
+        self.assertEqual([site for site, _ in streamed], list(range(len(SITES))))
+        np.testing.assert_array_equal(np.array([row for _, row in streamed]), prices)
+
+    def test_no_sites(self):
+        self.assertEqual(portfolio_prices([], TIMES, self.rrps).shape, (0, len(TIMES)))
+
+
+if __name__ == '__main__':
+    unittest.main()
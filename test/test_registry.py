@@ -0,0 +1,59 @@
+import sys
+import types
+import unittest
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+import aemo_to_tariff.registry as registry
+import aemo_to_tariff.powercor as powercor
+import aemo_to_tariff.victoria as victoria
+from aemo_to_tariff import spot_to_tariff, get_daily_fee, calculate_demand_fee, get_periods
+
+class TestRegistry(unittest.TestCase):
+    def tearDown(self):
+        registry._providers.pop('testnet', None)
+        registry.NETWORKS.pop('testnet', None)
+        registry.NETWORKS.pop('entrynet', None)
+        registry._providers.pop('entrynet', None)
+
+    def test_get_network_is_case_insensitive(self):
+        self.assertIs(registry.get_network('SAPN'), registry.get_network('sapn'))
+        with self.assertRaises(ValueError):
+            registry.get_network('Nowhere')
+
+    def test_victoria_uses_victorian_tariffs(self):
+        interval_time = datetime(2023, 7, 15, 10, 0, tzinfo=ZoneInfo(victoria.time_zone()))
+        self.assertAlmostEqual(spot_to_tariff(interval_time, 'Victoria', 'VICR_TOU', 100, 1, 1, 1), 40.0, 4)
+        self.assertEqual(get_periods('Victoria', 'VICR_TOU'), victoria.tariffs['VICR_TOU']['periods'])
+        self.assertEqual(get_daily_fee('Victoria', 'VICS_TOU', annual_usage=30000), 3.0)
+
+    def test_fees_for_every_network(self):
+        self.assertEqual(get_daily_fee('Endeavour', 'N70'), 0.0)
+        self.assertEqual(get_daily_fee('SAPN', 'RTOU', annual_usage=5000), 57.53)
+        self.assertEqual(calculate_demand_fee('Powercor', 'D1', 5.5, 31), 0.0)
+
+    def test_powercor_daily_fee_in_dollars(self):
+        # Before the approved prices, powercor.get_daily_fee returned 39.73 (c/day)
+        self.assertEqual(powercor.get_daily_fee('PRTOU'), 0.3973)
+        self.assertEqual(get_daily_fee('Powercor', 'PRTOU'), 0.3973)
+
+    def test_days_reach_tasnetworks(self):
+        # days used to land in peak_demand_kw
+        self.assertAlmostEqual(calculate_demand_fee('tasnetworks', 'TAS97', 5.0, 15), 25.613 * 5.0 * 15 / 30, 6)
+
+    def test_register_network(self):
+        registry.register_network('TestNet', 'aemo_to_tariff.energex')
+        self.assertIs(registry.get_network('testnet'), sys.modules['aemo_to_tariff.energex'])
+        self.assertIn('testnet', registry.network_names())
+
+    def test_entry_points(self):
+        provider = types.ModuleType('entrynet')
+        entry_point = mock.Mock()
+        entry_point.name = 'EntryNet'
+        entry_point.load.return_value = provider
+        found = mock.Mock()
+        found.select.return_value = [entry_point]
+        with mock.patch.object(registry, 'entry_points', return_value=found), \
+                mock.patch.object(registry, '_entry_points_loaded', False):
+            self.assertIs(registry.get_network('entrynet'), provider)
+        found.select.assert_called_once_with(group=registry.ENTRY_POINT_GROUP)
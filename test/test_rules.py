@@ -0,0 +1,79 @@
+import unittest
+from datetime import date, time
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+import aemo_to_tariff.endeavour as endeavour
+import aemo_to_tariff.energex as energex
+import aemo_to_tariff.tasnetworks as tasnetworks
+from aemo_to_tariff.calendars import HOLIDAY, day_code
+from aemo_to_tariff.registry import get_network
+from aemo_to_tariff.rules import Rule, TariffRules, blocks, declare, differential_check
+from aemo_to_tariff.slots import compile_declared, compile_tariff
+
+
+class TestRules(unittest.TestCase):
+
+    def test_translates_seasons(self):
+        rules = declare(endeavour, 'N71').rules
+        self.assertEqual([(r.period, r.months) for r in rules if 'Peak' in r.period and 'Off' not in r.period],
+                         [('High-season Peak', (1, 2, 3, 11, 12)), ('Low-season Peak', (4, 5, 6, 7, 8, 9, 10))])
+        self.assertTrue(all(r.days is None and r.block is None for r in rules))
+
+    def test_translates_weekend_override(self):
+        rules = declare(tasnetworks, 'TAS94').rules
+        self.assertEqual(rules[0].days, (5, 6, HOLIDAY))
+        self.assertEqual({r.days for r in rules[1:]}, {(0, 1, 2, 3, 4)})
+
+    def test_translates_blocks_and_fallback(self):
+        self.assertEqual(blocks(declare(endeavour, 'N90')), [1, 2])
+        self.assertEqual(blocks(declare(energex, '6900')), [None])
+        self.assertEqual(declare(energex, '8400').fallback, (1.0, 9.648))
+
+    def test_compiles_each_block(self):
+        declared = declare(endeavour, 'N90')
+        self.assertTrue((compile_declared('N90', 'Australia/Sydney', declared).intercept == 8.8705).all())
+        self.assertTrue((compile_declared('N90', 'Australia/Sydney', declared, block=2).intercept == 10.3335).all())
+        self.assertFalse([i for i in compile_tariff(endeavour, 'N90').issues if i.kind == 'shadowed'])
+
+    def test_declared_rules(self):
+        declared = TariffRules((
+            Rule('Holiday', time(0, 0), time(0, 0), 1.0, days=(HOLIDAY,)),
+            Rule('Winter peak', time(17, 0), time(20, 0), 30.0, months=(6, 7, 8), days=(0, 1, 2, 3, 4)),
+            Rule('Peak', time(17, 0), time(20, 0), 20.0, days=(0, 1, 2, 3, 4)),
+            Rule('Off-peak', time(0, 0), time(0, 0), 5.0),
+        ), True, (1.0, 0.0))
+        compiled = compile_declared('TEST', 'Australia/Sydney', declared)
+        days = [date(2024, 7, 1), date(2024, 1, 2), date(2024, 1, 6), date(2024, 1, 26)]
+        codes = np.array([day_code(day, 'NSW') for day in days])
+        _, intercept = compiled.lookup(codes, np.full(len(days), 18 * 12))
+        self.assertEqual(intercept.tolist(), [30.0, 20.0, 5.0, 1.0])
+        self.assertEqual(len(compiled.labels), 4)
+
+    def test_every_slot_matches_convert(self):
+        tariffs = [('endeavour', 'N71'), ('endeavour', 'N90'), ('tasnetworks', 'TAS94'), ('tasnetworks', 'TAS97'),
+                   ('energex', '6900'), ('sapn', 'RTOU'), ('evoenergy', '017'), ('ausgrid', 'EA116'),
+                   ('victoria', 'VICR_TOU'), ('powercor', 'PRTOU')]
+        for network, tariff in tariffs:
+            module = get_network(network)
+            with self.subTest(network=network, tariff=tariff):
+                self.assertEqual(differential_check(module, tariff, date(2023, 1, 1), date(2026, 12, 31)), [])
+
+    def test_reports_mismatches(self):
+        convert = tasnetworks.convert
+
+        def christmas_surcharge(interval_datetime, tariff_code, rrp):
+            price = convert(interval_datetime, tariff_code, rrp)
+            local = interval_datetime.astimezone(ZoneInfo(tasnetworks.time_zone()))
+            return price + 1 if (local.month, local.day) == (12, 25) else price
+
+        with mock.patch.object(tasnetworks, 'convert', christmas_surcharge):
+            mismatches = differential_check(tasnetworks, 'TAS93', date(2024, 12, 20), date(2024, 12, 31))
+        self.assertTrue(mismatches)
+        self.assertEqual({m.local_time.date() for m in mismatches}, {date(2024, 12, 25)})
+
+
+if __name__ == '__main__':
+    unittest.main()
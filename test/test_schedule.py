@@ -0,0 +1,81 @@
+import copy
+import unittest
+from datetime import date, datetime, timedelta, timezone
+import numpy as np
+import aemo_to_tariff.energex as energex
+import aemo_to_tariff.versions as versions
+from aemo_to_tariff.registry import get_network
+from aemo_to_tariff.schedule import next_transition, day_profile, DEFAULT_HORIZON
+from aemo_to_tariff.slots import compile_tariff, slot_of_day
+from aemo_to_tariff.calendars import public_holidays, state_of
+from aemo_to_tariff.timezones import local_calendar, MICROS_PER_DAY
+
+def local_rates(network, tariff, utc_micros):
+    """Rates by the local date's day type, one interval at a time."""
+    compiled = compile_tariff(get_network(network), tariff)
+    time_of_day, weekdays, months = local_calendar(utc_micros, compiled.time_zone)
+    state = state_of(compiled.time_zone)
+    holidays = np.array([day for year in range(2023, 2027) for day in public_holidays(state, year)], dtype='datetime64[D]')
+    holiday = np.isin((utc_micros - time_of_day + 12 * 3600 * 1_000_000) // MICROS_PER_DAY, holidays.astype(np.int64))
+    day_types = compiled.day_types[months - 1, weekdays, holiday.astype(int)]
+    slots = slot_of_day(time_of_day)
+    return compiled.slope[day_types, slots], compiled.intercept[day_types, slots]
+
+def brute_force(network, tariff, at, days=10):
+    first = (int(at.timestamp()) // 300 + 1) * 300
+    micros = np.concatenate(([int(at.timestamp() * 1e6)], (first + np.arange(days * 288) * 300) * 1_000_000))
+    slope, intercept = local_rates(network, tariff, micros)
+    changed = np.flatnonzero((slope[1:] != slope[0]) | (intercept[1:] != intercept[0]))
+    if not len(changed):
+        return None
+    return datetime.fromtimestamp(int(micros[changed[0] + 1]) / 1e6, timezone.utc)
+
+class TestNextTransition(unittest.TestCase):
+    def test_matches_a_scan(self):
+        rng = np.random.default_rng(1)
+        starts = [datetime(2024, 10, 5, 15, 17, 3, tzinfo=timezone.utc),  # Sydney clocks go forward that night
+                  datetime(2025, 4, 5, 14, 0, tzinfo=timezone.utc)]       # and back
+        starts += [datetime(2024, 7, 1, tzinfo=timezone.utc) + timedelta(seconds=int(s)) for s in rng.integers(0, 300 * 86400, 6)]
+        for network in ('energex', 'ausgrid', 'evoenergy', 'sapn', 'tasnetworks', 'endeavour', 'victoria'):
+            for tariff in get_network(network).tariffs:
+                for at in starts:
+                    with self.subTest(network=network, tariff=tariff, at=at):
+                        expected = brute_force(network, tariff, at)
+                        found = next_transition(network, tariff, at)
+                        if expected is None:
+                            self.assertTrue(found is None or found > at + timedelta(days=10))
+                        else:
+                            self.assertEqual(found, expected)
+
+    def test_flat_tariff_and_versions(self):
+        at = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        self.assertIsNone(next_transition('energex', '3700', at))
+        old = copy.deepcopy(energex.tariffs)
+        old['3700']['periods'] = [('Anytime', energex.time(0, 0), energex.time(23, 59), 3.0)]
+        versions.register_version('Energex', date(2023, 7, 1), tariffs=old)
+        try:
+            # The 2024 version starts at Brisbane midnight
+            self.assertEqual(next_transition('energex', '3700', at), datetime(2024, 6, 30, 14, tzinfo=timezone.utc))
+            self.assertIsNone(next_transition('energex', '3700', at, horizon=timedelta(days=30)))
+        finally:
+            versions._registered.pop('energex', None)
+            versions._indexes.pop('energex', None)
+        self.assertGreater(DEFAULT_HORIZON, timedelta(days=366))
+
+class TestDayProfile(unittest.TestCase):
+    def test_days(self):
+        for day, length in ((date(2024, 7, 2), 288), (date(2024, 10, 6), 276), (date(2025, 4, 6), 300)):
+            for tariff in get_network('ausgrid').tariffs:
+                profile = day_profile('ausgrid', tariff, day)
+                with self.subTest(day=day, tariff=tariff):
+                    self.assertEqual(len(profile.starts), length)
+                    slope, intercept = local_rates('ausgrid', tariff, profile.starts.astype(np.int64))
+                    np.testing.assert_array_equal(profile.slope, slope)
+                    np.testing.assert_array_equal(profile.intercept, intercept)
+                    self.assertFalse(profile.intercept.flags.writeable)
+
+    def test_cached_by_day_type(self):
+        # Two Tuesdays in the same season share the cached rows
+        first, second = day_profile('energex', '6900', date(2024, 7, 2)), day_profile('energex', '6900', date(2024, 7, 9))
+        self.assertIs(first.intercept, second.intercept)
+        self.assertEqual(first.starts[0], np.datetime64('2024-07-01T14:00'))
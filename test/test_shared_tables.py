@@ -0,0 +1,83 @@
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+import aemo_to_tariff.energex as energex
+import aemo_to_tariff.sapower as sapower
+from aemo_to_tariff import slots
+from aemo_to_tariff.convert import spot_to_tariff
+from aemo_to_tariff.shared_tables import SharedTables, write_tables, use_shared_tables
+from aemo_to_tariff.slots import compile_rules, compile_tariff
+
+def _shared_in_worker(tariff):
+    compiled = compile_tariff(sapower, tariff)
+    return compiled.slope.flags.writeable, float(compiled.slope.sum())
+
+class TestSharedTables(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'tables.bin')
+
+    def tearDown(self):
+        use_shared_tables(None)
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        count = write_tables(self.path, ['SAPN', 'Energex'])
+        self.assertEqual(count, len(sapower.tariffs) + len(energex.tariffs))
+        tables = SharedTables(self.path)
+        self.assertEqual(len(tables), count)
+        for tariff in sapower.tariffs:
+            expected = compile_rules(tariff, sapower.time_zone(), sapower.get_rules(tariff))
+            found = tables.get(sapower, tariff)
+            with self.subTest(tariff=tariff):
+                for name in ('period', 'slope', 'intercept', 'day_types'):
+                    np.testing.assert_array_equal(getattr(found, name), getattr(expected, name))
+                    self.assertEqual(getattr(found, name).dtype, getattr(expected, name).dtype)
+                self.assertEqual((found.labels, found.period_names, found.issues),
+                                 (expected.labels, expected.period_names, expected.issues))
+        self.assertIsNone(tables.get(sapower, 'NOPE'))
+
+    def test_views_share_the_mapping(self):
+        write_tables(self.path, ['SAPN'])
+        use_shared_tables(self.path)
+        compiled = compile_tariff(sapower, 'RTOU')
+        self.assertFalse(compiled.slope.flags.writeable)
+        base = compiled.slope
+        while isinstance(base, np.ndarray):
+            base = base.base
+        self.assertIsInstance(base.obj if isinstance(base, memoryview) else base, mmap.mmap)
+        when = datetime(2024, 7, 2, 18, 0, tzinfo=ZoneInfo('Australia/Adelaide'))
+        shared = spot_to_tariff(when, 'SAPN', 'RTOU', 100.0)
+        use_shared_tables(None)
+        self.assertEqual(spot_to_tariff(when, 'SAPN', 'RTOU', 100.0), shared)
+
+    def test_bad_file(self):
+        with open(self.path, 'wb') as handle:
+            handle.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            SharedTables(self.path)
+
+    def test_old_day_types(self):
+        # Tables from before public holidays had (month, weekday) day types
+        write_tables(self.path, ['SAPN'])
+        with open(self.path, 'rb') as handle:
+            data = handle.read()
+        self.assertIn(b'[12, 7, 2]', data)
+        with open(self.path, 'wb') as handle:
+            handle.write(data.replace(b'[12, 7, 2]', b'[12, 7]   '))
+        with self.assertRaises(ValueError):
+            SharedTables(self.path)
+
+    def test_pool_initializer(self):
+        write_tables(self.path, ['SAPN'])
+        with ProcessPoolExecutor(1, initializer=use_shared_tables, initargs=(self.path,)) as executor:
+            writeable, total = executor.submit(_shared_in_worker, 'RTOU').result()
+        self.assertFalse(writeable)
+        self.assertIsNone(slots._shared_tables)
+        self.assertAlmostEqual(total, float(compile_tariff(sapower, 'RTOU').slope.sum()))
@@ -0,0 +1,94 @@
+import unittest
+from datetime import date, time
+import numpy as np
+import aemo_to_tariff.energex as energex
+import aemo_to_tariff.sapower as sapower
+import aemo_to_tariff.tasnetworks as tasnetworks
+import aemo_to_tariff.endeavour as endeavour
+import aemo_to_tariff.evoenergy as evoenergy
+from aemo_to_tariff.calendars import day_code
+from aemo_to_tariff.slots import compile_tariff, compile_rules, export_rules, SLOTS_PER_DAY
+
+class TestSlots(unittest.TestCase):
+    def issues(self, module, tariff_code, kind):
+        return [issue for issue in compile_tariff(module, tariff_code).issues if issue.kind == kind]
+
+    def test_wrapping_periods(self):
+        compiled = compile_tariff(energex, '6900')
+        self.assertEqual(compiled.slope.shape, (1, SLOTS_PER_DAY))
+        self.assertEqual(compiled.intercept[0, 0], 6.268)      # 00:00 Overnight
+        self.assertEqual(compiled.intercept[0, 9 * 12], 4.066)  # 09:00 Day
+        self.assertEqual(compiled.intercept[0, 16 * 12], 17.861)  # 16:00 Evening
+        self.assertEqual(compiled.period_name(0, 23 * 12), 'Overnight')
+
+    def test_end_of_day_hole_is_closed(self):
+        compiled = compile_tariff(energex, '8400')
+        self.assertTrue((compiled.intercept == 9.648).all())
+        self.assertTrue((compiled.slope == 1.0).all())
+        self.assertEqual([(i.start, i.end) for i in self.issues(energex, '8400', 'hole')], [('23:59', '24:00')])
+
+    def test_reports_overlaps(self):
+        overlaps = self.issues(sapower, 'RTOU', 'overlap')
+        self.assertEqual([(i.start, i.end) for i in overlaps], [('10:00', '14:00'), ('14:00', '15:00')])
+        self.assertIn('Off-peak wins', overlaps[0].detail)
+        shadowed = self.issues(tasnetworks, 'TAS97', 'shadowed')
+        self.assertEqual(len(shadowed), 1)
+        self.assertIn('Super off-peak', shadowed[0].detail)
+
+    def test_reports_gaps(self):
+        rules = {
+            'variants': [(None, None, [('Peak', time(7, 0), time(21, 0), 20.0)])],
+            'wrap': True,
+            'fallback': (2.0, 1.0),
+        }
+        compiled = compile_rules('TEST', 'Australia/Brisbane', rules)
+        gaps = [(i.start, i.end) for i in compiled.issues if i.kind == 'gap']
+        self.assertEqual(gaps, [('00:00', '07:00'), ('21:00', '24:00')])
+        self.assertEqual(compiled.slope[0, 0], 2.0)
+        self.assertIsNone(compiled.period_name(0, 0))
+
+    def test_seasonal_day_types(self):
+        compiled = compile_tariff(endeavour, 'N71')
+        slope, intercept = compiled.lookup(np.array([day_code(date(2025, 1, 8)), day_code(date(2024, 7, 3))]),
+                                           np.array([17 * 12, 17 * 12]))
+        np.testing.assert_array_equal(intercept, [20.0116, 10.8094])
+        np.testing.assert_array_equal(slope, [1.0, 1.0])
+
+    def test_unknown_tariff_uses_fallback(self):
+        compiled = compile_tariff(energex, '9999')
+        self.assertTrue((compiled.slope == 1.037869032618134).all())
+        self.assertTrue((compiled.intercept == 5.586606750833143).all())
+
+    def test_shipped_export_periods(self):
+        for module, tariff_code, period in ((sapower, 'RTOU', 'Solar Sponge'), (sapower, 'RELE', 'Solar Sponge'),
+                                            (evoenergy, '018', 'Solar Soak'), (tasnetworks, 'TAS97', 'Super off-peak')):
+            with self.subTest(tariff=tariff_code):
+                (_, _, periods), = export_rules(module, tariff_code)['variants']
+                self.assertEqual([p[0] for p in periods], [period])
+                # The same window as the import side's period of that name
+                window = next(p[1:3] for p in module.tariffs[tariff_code]['periods'] if p[0] == period)
+                self.assertEqual(periods[0][1:3], window)
+        self.assertIsNone(export_rules(energex, '6900'))
+
+    def test_export_rates(self):
+        compiled = compile_tariff(sapower, 'RTOU')
+        np.testing.assert_array_equal(compiled.export_slope, 1.0)
+        np.testing.assert_array_equal(compiled.export_intercept, 0.0)
+        self.assertFalse([i for i in compiled.issues if i.day_type.startswith('export')])
+
+        rules = {'variants': [(None, None, [('Anytime', time(0, 0), time(0, 0), 10.0)])], 'wrap': True, 'fallback': (1.0, 10.0)}
+        export = {
+            'variants': [(None, (5, 6), []),
+                         (None, None, [('Charge', time(10, 0), time(16, 0), -1.5), ('Reward', time(17, 0), time(21, 0), 12.0)])],
+            'wrap': True,
+            'fallback': (1.0, 0.0),
+        }
+        compiled = compile_rules('TEST', 'Australia/Adelaide', rules, export)
+        self.assertEqual(len(compiled.labels), 2)
+        self.assertFalse([i for i in compiled.issues if i.kind == 'gap'])
+        day_codes = np.array([day_code(date(2024, 3, 6))] * 3 + [day_code(date(2024, 3, 10))])
+        slots = np.array([11 * 12, 18 * 12, 22 * 12, 11 * 12])
+        slope, intercept, export_slope, export_intercept = compiled.lookup_import_export(day_codes, slots)
+        np.testing.assert_array_equal(intercept, 10.0)
+        np.testing.assert_array_equal(export_intercept, [-1.5, 12.0, 0.0, 0.0])
+        np.testing.assert_array_equal(export_slope, 1.0)
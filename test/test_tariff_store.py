@@ -0,0 +1,122 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+import aemo_to_tariff.energex as energex
+import aemo_to_tariff.powercor as powercor
+import aemo_to_tariff.victoria as victoria
+from aemo_to_tariff.tariff_store import TariffStore, Source, Charge, StoredTariff, open_store, write_store
+
+try:
+    import openpyxl  # noqa: F401
+    from aemo_to_tariff.aer_import import import_workbooks, DEFAULT_WORKBOOKS, IMPORTER_VERSION
+except ImportError:
+    openpyxl = None
+
+def tariff(code, year, rate, source=0):
+    return StoredTariff('testnet', code, f"Tariff {code}", 'Residential', date(year, 7, 1), 0.5,
+                        (Charge('Fixed', 'fixed', '$/day', 0.5), Charge('Anytime', 'energy', 'c/kWh', rate)), source)
+
+class TestTariffStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'tariffs.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip_and_versions(self):
+        sources = [Source('a.xlsx', 10, 20, b'\1' * 32)]
+        write_store(self.path, sources, [tariff('B', 2024, 3.0), tariff('A', 2024, 2.0), tariff('A', 2023, 1.0)])
+        store = TariffStore(self.path)
+        self.assertEqual(store.sources(), sources)
+        self.assertEqual([(t.code, t.effective_from.year) for t in store.tariffs()], [('A', 2023), ('A', 2024), ('B', 2024)])
+        self.assertEqual(store.get('TestNet', 'A').charges[1].value, 2.0)
+        self.assertEqual(store.get('testnet', 'A', date(2024, 6, 30)).charges[1].value, 1.0)
+        self.assertEqual(store.get('testnet', 'A', date(2024, 7, 1)).charges[1].value, 2.0)
+        self.assertIsNone(store.get('testnet', 'A', date(2020, 1, 1)))
+        self.assertIsNone(store.get('testnet', 'C'))
+        self.assertEqual(list(store.tariffs('other')), [])
+        store.close()
+
+    def test_shipped_store_matches_energex(self):
+        for code, tariff in energex.tariffs.items():
+            with self.subTest(code=code):
+                stored = open_store().get('energex', code)
+                charges = {kind: {c.label: c.value for c in stored.charges if c.kind == kind}
+                           for kind in ('fixed', 'energy', 'demand')}
+                rates = tariff['rate'] if isinstance(tariff['rate'], dict) else {'Volume': tariff['rate']}
+                self.assertEqual(rates, charges['energy'])
+                self.assertEqual(sorted(rate for *_, rate in tariff['periods']), sorted(charges['energy'].values()))
+
+                fee = energex.daily_fees[code]
+                if isinstance(fee, dict):
+                    self.assertEqual({f"Band{band}": fee[f"band{band}"] for band in range(1, 5)}, charges['fixed'])
+                else:
+                    self.assertEqual(fee, charges['fixed']['Fixed'])
+                    self.assertEqual(fee, stored.daily_fee)
+
+                if charges['demand']:
+                    self.assertEqual(energex.demand_charges[code], next(iter(charges['demand'].values())))
+                else:
+                    self.assertNotIn(code, energex.demand_charges)
+
+    def test_shipped_store_matches_victoria(self):
+        for module, network, codes in ((powercor, 'powercor', {'D1': 'D1', 'PRTOU': 'PRTOU'}),
+                                       (victoria, 'citipower', {'VICR_SINGLE': 'C1R', 'VICS_DEMAND': 'CG'})):
+            for code, stored_code in codes.items():
+                with self.subTest(code=code):
+                    stored = open_store().get(network, stored_code)
+                    energy = {c.value for c in stored.charges if c.kind == 'energy'}
+                    self.assertEqual({rate for *_, rate in module.tariffs[code]['periods']}, energy)
+                    self.assertEqual(module.get_daily_fee(code), stored.daily_fee)
+        demand = {c.label: c.value for c in open_store().get('citipower', 'CG').charges if c.kind == 'demand'}
+        self.assertEqual(victoria.demand_charges['VICS_DEMAND'],
+                         {'summer': demand['Summer Dmd'], 'non_summer': demand['Non-sum. Dmd']})
+
+    @unittest.skipIf(openpyxl is None, 'openpyxl is not installed')
+    def test_import_rebuilds_other_importer_versions(self):
+        workbook = shutil.copy(glob.glob(os.path.join(DEFAULT_WORKBOOKS, '*Jemena*.xlsx'))[0], self.directory)
+        import_workbooks(self.directory, self.path)
+        store = TariffStore(self.path)
+        self.assertEqual(store.importer_version, IMPORTER_VERSION)
+        sources, tariffs = store.sources(), list(store.tariffs())
+        store.close()
+
+        # Same workbook, but read by an older importer
+        write_store(self.path, sources, tariffs, IMPORTER_VERSION - 1)
+        self.assertEqual(import_workbooks(self.directory, self.path), [os.path.basename(workbook)])
+        store = TariffStore(self.path)
+        self.assertEqual(store.importer_version, IMPORTER_VERSION)
+        store.close()
+
+    @unittest.skipIf(openpyxl is None, 'openpyxl is not installed')
+    def test_import_is_incremental(self):
+        workbook = shutil.copy(glob.glob(os.path.join(DEFAULT_WORKBOOKS, '*Jemena*.xlsx'))[0], self.directory)
+        self.assertEqual(len(import_workbooks(self.directory, self.path)), 1)
+        written = os.stat(self.path).st_mtime_ns
+        self.assertEqual(import_workbooks(self.directory, self.path), [])
+        self.assertEqual(os.stat(self.path).st_mtime_ns, written)
+
+        # Touched but unchanged: nothing is re-read or rewritten
+        os.utime(workbook, ns=(written, written + 10**9))
+        self.assertEqual(import_workbooks(self.directory, self.path), [])
+        self.assertEqual(os.stat(self.path).st_mtime_ns, written)
+        store = TariffStore(self.path)
+        self.assertEqual(store.get('jemena', 'A100/F100').charges[1], Charge('Unit rate', 'energy', 'c/kWh', 10.345))
+        store.close()
+
+    @unittest.skipIf(openpyxl is None, 'openpyxl is not installed')
+    def test_fresh_checkout_keeps_shipped_store(self):
+        # A clone gives every workbook a new modification time but the same contents
+        shipped = shutil.copy(open_store().path, self.path)
+        with open(shipped, 'rb') as handle:
+            contents = handle.read()
+        workbooks = [shutil.copy(path, self.directory) for path in glob.glob(os.path.join(DEFAULT_WORKBOOKS, '*.xlsx'))]
+        for path in workbooks:
+            os.utime(path, ns=(1, 1))
+        self.assertEqual(import_workbooks(workbooks, shipped), [])
+        with open(shipped, 'rb') as handle:
+            self.assertEqual(handle.read(), contents)
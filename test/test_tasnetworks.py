@@ -1,5 +1,23 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
+from aemo_to_tariff import spot_to_tariff_many
 from aemo_to_tariff.tasnetworks import convert
 
+HOBART = ZoneInfo('Australia/Hobart')
+
 def test_convert_tasnetworks():
-    # Add test cases for the convert() function
-    pass
+    # Monday 1 July 2024 08:00 in Hobart is still Sunday in UTC; the local weekday sets the rate
+    monday = datetime(2024, 7, 1, 8, 0, tzinfo=HOBART)
+    assert abs(convert(monday.astimezone(timezone.utc), 'TAS94', 100.0) - (10.0 + 16.784)) < 1e-9
+    # Saturday and Easter Monday are off-peak all day
+    assert abs(convert(datetime(2024, 7, 6, 8, 0, tzinfo=HOBART), 'TAS94', 100.0) - (10.0 + 2.426)) < 1e-9
+    assert abs(convert(datetime(2024, 4, 1, 12, 0, tzinfo=HOBART), 'TAS94', 100.0) - (10.0 + 2.426)) < 1e-9
+
+def test_batch_matches_convert_on_holidays():
+    # Good Friday to the Tuesday after Easter 2024, in UTC
+    times = np.datetime64('2024-03-28T13:00') + np.arange(5 * 288) * 5
+    rrps = np.linspace(-20, 300, len(times))
+    prices = spot_to_tariff_many(times, 'tasnetworks', 'TAS94', rrps, 1, 1, 1)
+    for t, rrp, price in zip(times.astype(datetime), rrps, prices):
+        assert price == convert(t.replace(tzinfo=timezone.utc), 'TAS94', rrp)
@@ -0,0 +1,48 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
+from aemo_to_tariff import spot_to_tariff_many
+from aemo_to_tariff.timezones import transition_index, parse_iso, local_calendar, NETWORK_TIME_ZONES
+
+class TestTimezones(unittest.TestCase):
+    def test_offsets_match_zoneinfo_around_transitions(self):
+        for time_zone in NETWORK_TIME_ZONES:
+            index = transition_index(time_zone)
+            seconds = np.concatenate([index.transitions[:40] - 1, index.transitions[:40], [0, 4102444800 + 86400 * 400]])
+            expected = [datetime.fromtimestamp(int(s), ZoneInfo(time_zone)).utcoffset().total_seconds() for s in seconds]
+            np.testing.assert_array_equal(index.offsets_at(seconds * 1_000_000) // 1_000_000, expected)
+
+    def test_offset_window(self):
+        # Sydney moved to daylight time at 2024-10-05 16:00 UTC
+        change = datetime(2024, 10, 5, 16, tzinfo=timezone.utc).timestamp()
+        index = transition_index('Australia/Sydney')
+        self.assertEqual(index.offset_window(change - 1)[::2], (36000, change))
+        self.assertEqual(index.offset_window(change)[:2], (39600, change))
+
+    def test_dst_days(self):
+        # 2024-10-06 has 23 local hours in Adelaide, 2024-04-07 has 25
+        for day, hours in [(datetime(2024, 10, 5, 12, tzinfo=timezone.utc), 23), (datetime(2024, 4, 6, 12, tzinfo=timezone.utc), 25)]:
+            micros = np.array([int((day + timedelta(minutes=5 * i)).timestamp()) * 1_000_000 for i in range(288 * 2)])
+            time_of_day, weekdays, months = local_calendar(micros, 'Australia/Adelaide')
+            local_days = (micros + transition_index('Australia/Adelaide').offsets_at(micros)) // 86_400_000_000
+            on_dst_day = local_days == local_days[0] + 1
+            self.assertEqual(on_dst_day.sum(), hours * 12)
+            self.assertTrue((weekdays[on_dst_day] == 6).all())
+            self.assertTrue((months[on_dst_day] == day.month).all())
+
+    def test_parse_iso(self):
+        parsed = parse_iso(['2024-07-01T10:05:00+10:00', '2024-07-01T00:05:00Z', '2024-07-01 00:05',
+                            '2024-07-01T05:35:00+05:30', '2024-06-30T20:05:00-04:00'])
+        expected = int(datetime(2024, 7, 1, 0, 5, tzinfo=timezone.utc).timestamp()) * 1_000_000
+        np.testing.assert_array_equal(parsed, [expected] * 5)
+
+    def test_batch_accepts_epochs_and_strings(self):
+        start = datetime(2024, 4, 6, tzinfo=timezone.utc)
+        times = [start + timedelta(minutes=5 * i) for i in range(288 * 2)]
+        rrps = np.linspace(-20, 300, len(times))
+        expected = spot_to_tariff_many(times, 'tasnetworks', 'TAS93', rrps)
+        epochs = np.array([int(t.timestamp()) for t in times], dtype=np.int64)
+        np.testing.assert_array_equal(spot_to_tariff_many(epochs, 'tasnetworks', 'TAS93', rrps), expected)
+        strings = [t.astimezone(ZoneInfo('Australia/Hobart')).isoformat() for t in times]
+        np.testing.assert_array_equal(spot_to_tariff_many(strings, 'tasnetworks', 'TAS93', rrps), expected)
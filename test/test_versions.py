@@ -0,0 +1,73 @@
+import copy
+import unittest
+from datetime import date, datetime, timedelta, timezone
+import numpy as np
+import aemo_to_tariff.energex as energex
+import aemo_to_tariff.versions as versions
+from aemo_to_tariff import spot_to_tariff, spot_to_tariff_many, get_daily_fee, get_converter
+from aemo_to_tariff.billing import calculate_bill
+
+# Energex 6900 as it might have been a year earlier
+OLD_TARIFFS = copy.deepcopy(energex.tariffs)
+OLD_TARIFFS['6900']['periods'] = [
+    ('Evening', energex.time(16, 0), energex.time(21, 0), 15.287),
+    ('Overnight', energex.time(21, 0), energex.time(9, 0), 3.694),
+    ('Day', energex.time(9, 0), energex.time(16, 0), 2.100),
+]
+OLD_DAILY_FEES = dict(energex.daily_fees, **{'6900': 0.469})
+
+class TestVersions(unittest.TestCase):
+    def setUp(self):
+        versions.register_version('Energex', date(2023, 7, 1), tariffs=OLD_TARIFFS, daily_fees=OLD_DAILY_FEES)
+
+    def tearDown(self):
+        versions._registered.pop('energex', None)
+        versions._indexes.pop('energex', None)
+
+    def test_index(self):
+        index = versions.version_index('Energex')
+        self.assertEqual(index.effective_from, [date(2023, 7, 1), date(2024, 7, 1)])
+        self.assertIs(index.modules[1], energex)
+        # Brisbane midnight is 14:00 UTC the day before
+        self.assertEqual(index.starts, [int(datetime(2024, 6, 30, 14, tzinfo=timezone.utc).timestamp())])
+        self.assertIs(versions.network_at('Energex', date(2024, 6, 30)), index.modules[0])
+        self.assertIs(versions.network_at('Energex', date(2020, 1, 1)), index.modules[0])
+        self.assertIs(versions.network_at('Energex'), energex)
+        self.assertIs(versions.version_index('SAPN').modules[0], versions.network_at('SAPN', date(2020, 1, 1)))
+
+    def test_isolated_versions(self):
+        before = versions.version_index('Energex')
+        with versions.isolated_versions():
+            versions.register_version('Energex', date(2022, 7, 1), tariffs=OLD_TARIFFS)
+            self.assertEqual(len(versions.version_index('Energex').modules), 3)
+        self.assertIs(versions.version_index('Energex'), before)
+        self.assertEqual(list(versions._registered['energex']), [date(2023, 7, 1)])
+
+    def test_scalar_and_fees(self):
+        before = datetime(2024, 6, 30, 13, 55, tzinfo=timezone.utc)
+        after = before + timedelta(minutes=5)
+        self.assertAlmostEqual(spot_to_tariff(before, 'Energex', '6900', 0), 3.694)
+        self.assertAlmostEqual(spot_to_tariff(after, 'Energex', '6900', 0), 6.268)
+        self.assertEqual(get_daily_fee('Energex', '6900', when=date(2024, 1, 1)), 0.469)
+        self.assertEqual(get_daily_fee('Energex', '6900'), 0.556)
+
+    def test_batch_splits_at_boundaries(self):
+        start = datetime(2022, 7, 1, tzinfo=timezone.utc)
+        times = [start + timedelta(minutes=35 * i) for i in range(3 * 365 * 41)]
+        rrps = np.arange(len(times)) % 300
+        expected = [spot_to_tariff(t, 'Energex', '6900', rrp) for t, rrp in zip(times, rrps.tolist())]
+        np.testing.assert_allclose(spot_to_tariff_many(times, 'Energex', '6900', rrps), expected)
+        # Out of order too
+        np.testing.assert_allclose(spot_to_tariff_many(times[::-1], 'Energex', '6900', rrps[::-1]), expected[::-1])
+
+        convert = get_converter('Energex', '6900')
+        np.testing.assert_allclose([convert(t, rrp) for t, rrp in zip(times, rrps.tolist())], expected)
+        np.testing.assert_allclose(convert.convert_many(times, rrps), expected)
+
+    def test_bill_across_versions(self):
+        times = np.datetime64('2024-06-29T14:00') + np.arange(96) * 30
+        bill = calculate_bill('Energex', '6900', times, np.ones(96))
+        self.assertEqual(bill.days, 2)
+        self.assertAlmostEqual(bill.daily, 0.469 + 0.556)
+        overnight = calculate_bill('Energex', '6900', times[:18], np.ones(18)).energy
+        self.assertAlmostEqual(overnight, 18 * 3.694 / 100)
@@ -1,7 +1,7 @@
 import unittest
 from zoneinfo import ZoneInfo
 from datetime import datetime
-from aemo_to_tariff.victoria import time_zone, convert, get_daily_fee
+from aemo_to_tariff.victoria import time_zone, convert, get_daily_fee, calculate_demand_fee
 
 class TestVictoria(unittest.TestCase):
     def test_convert(self):
@@ -18,3 +18,10 @@ class TestVictoria(unittest.TestCase):
         expected_fee = 1.2
         fee = get_daily_fee(tariff_code, annual_usage)
         self.assertEqual(fee, expected_fee)
+
+    def test_seasonal_demand_fee(self):
+        # CitiPower CR: 3.21 $/kW non-summer, 10.84 $/kW summer, per 30 days
+        self.assertAlmostEqual(calculate_demand_fee('VICR_DEMAND', 2.0, days=30), 6.42)
+        self.assertAlmostEqual(calculate_demand_fee('VICR_DEMAND', 2.0, 60), 12.84)
+        self.assertAlmostEqual(calculate_demand_fee('VICR_DEMAND', 0.0, 15, summer_demand_kw=3.0), 16.26)
+        self.assertEqual(calculate_demand_fee('VICR_TOU', 2.0, days=30), 0.0)